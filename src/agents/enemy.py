@@ -3,7 +3,9 @@
 Provides enemy agent using A* pathfinding to hunt the player.
 """
 
-from algorithm.astar.astar import AStar
+from algorithm.astar.incremental import IncrementalPlanner
+from algorithm.astar.pathcache import PATH_CACHE
+from algorithm.astar.pursuit import Pursuit
 from environment.environment import TacticalEnvironment
 
 
@@ -11,23 +13,49 @@ class EnemyAgent:
     """Enemy AI agent using A* pathfinding algorithm.
 
     The enemy agent uses A* pathfinding to find the shortest path to the player
-    and moves towards it with a configurable move range per turn.
+    and moves towards it with a configurable move range per turn. Moves are
+    computed by Pursuit from the player's cached distance field, which gives
+    the same tile as a fresh A* search without running one every turn.
+
+    With planner="incremental" the moves come from an IncrementalPlanner
+    that continues its previous search tree each turn instead. Its paths are
+    as short as A*'s, so the enemy ends every turn as close to the player,
+    but where several shortest paths exist it may follow a different one.
 
     Attributes:
         env: TacticalEnvironment instance
         move_range: Number of tiles the enemy can move per turn
-        last_path: Last computed path for visualization purposes
+        last_path: Last computed path. With Pursuit it is a shortest path
+            through the chosen tile but not always A*'s path, which
+            peek_path() returns
+        planner: Name of the move engine ("pursuit" or "incremental")
+        pursuit: Engine computing the moves (Pursuit or IncrementalPlanner)
+        path_cache: PathCache answering peek_path() (shared with PlayerAgent)
     """
 
-    def __init__(self, env: TacticalEnvironment):
+    PLANNERS = ("pursuit", "incremental")
+
+    def __init__(self, env: TacticalEnvironment, planner: str = "pursuit"):
         """Initialize enemy agent.
 
         Args:
             env: TacticalEnvironment instance containing game state
+            planner: "pursuit" plays A*'s exact moves from the player's
+                distance field; "incremental" replans by reusing the last
+                turn's search tree
         """
+        if planner not in self.PLANNERS:
+            raise ValueError(f"Unknown enemy planner: {planner!r}")
+
         self.env = env
         self.move_range = 2
         self.last_path = []
+        self.planner = planner
+        if planner == "incremental":
+            self.pursuit = IncrementalPlanner(self.move_range)
+        else:
+            self.pursuit = Pursuit(self.move_range)
+        self.path_cache = PATH_CACHE
 
     def action(self) -> tuple:
         """Calculate and return the next enemy action using A* pathfinding.
@@ -38,13 +66,12 @@ class EnemyAgent:
         Returns:
             Tuple of (x, y) coordinates for the next tile to move to
         """
-        a_star = AStar(env=self.env)
-
         start = tuple(self.env.enemy_pos)
         goal = tuple(self.env.player_pos)
 
-        # Find path to player
-        path = a_star.search(start, goal)
+        # Find path to player and move up to move_range tiles along it
+        self.pursuit.move_range = self.move_range
+        next_tile, path = self.pursuit.chase_move(self.env.static_map, start, goal)
 
         # Store path for visualization
         self.last_path = [] if path is None else list(path)
@@ -53,17 +80,6 @@ class EnemyAgent:
         except Exception:
             pass
 
-        # No path found or at goal
-        if path is None or len(path) <= 1:
-            return start
-
-        # Remove starting position from path
-        path = path[1:]
-
-        # Move up to move_range tiles towards player
-        index = min(self.move_range - 1, len(path) - 1)
-        next_tile = path[index]
-
         return next_tile
 
     def peek_path(self) -> list:
@@ -71,14 +87,11 @@ class EnemyAgent:
 
         This method allows visualization of the enemy's intended path without
         consuming or modifying any game state. Can be called by the UI to
-        display enemy pathfinding for debugging.
+        display enemy pathfinding for debugging. Paths come from the shared
+        path cache, so repeated calls between moves do not search again.
 
         Returns:
             List of (x, y) tuples representing the path from enemy to player,
             or empty list if no path exists
         """
-        a_star = AStar(env=self.env)
-        start = tuple(self.env.enemy_pos)
-        goal = tuple(self.env.player_pos)
-        path = a_star.search(start, goal)
-        return [] if path is None else list(path)
+        return self.path_cache.path(self.env, self.env.enemy_pos, self.env.player_pos)
@@ -7,7 +7,7 @@ Can operate in benchmark mode (minimal overhead) or interactive mode (with metad
 import random
 import time
 
-from algorithm.astar.astar import AStar
+from algorithm.astar.pathcache import PATH_CACHE
 from algorithm.alphabeta.alphabeta import AlphaBetaSearch
 from algorithm.mcts.mcts import MCTS
 from algorithm.minimax.minimax import MinimaxSearch
@@ -26,6 +26,21 @@ class PlayerAgent:
         mcts_sim_depth: MCTS simulation depth
         alphabeta_max_depth: AlphaBeta search depth
         minimax_max_depth: Minimax search depth
+        in_place_search: Whether AlphaBeta/Minimax search without cloning
+        alphabeta_time_budget_ms: Per-move AlphaBeta budget (None = fixed depth)
+        mcts_workers: Processes for root-parallel MCTS (1 = sequential)
+        mcts_pool: Caller-owned process pool for root-parallel MCTS (None =
+            MCTS starts its own, shut down by close())
+        mcts_time_budget_ms: Per-move MCTS budget (None = fixed iterations)
+        mcts_tree_store: MCTS tree representation ("nodes" or "array")
+        mcts_rollouts_per_leaf: Batched rollouts per MCTS leaf (1 = scalar)
+        mcts_root_policy: MCTS root move selection ("ucb" or "halving")
+        mcts_max_nodes: MCTS tree node budget (None = unbounded)
+        search_enemy_model: Enemy model of AlphaBeta/Minimax ("adversarial"
+            or "astar")
+        minimax_alpha_beta: Whether Minimax prunes with alpha-beta
+        path_cache: PathCache answering peek_path_to_goal() (shared with
+            EnemyAgent)
     """
 
     # Default parameters for benchmark mode
@@ -49,6 +64,17 @@ class PlayerAgent:
         mcts_sim_depth: int = None,
         alphabeta_depth: int = None,
         minimax_depth: int = None,
+        in_place_search: bool = True,
+        alphabeta_time_budget_ms: float = None,
+        mcts_workers: int = 1,
+        mcts_time_budget_ms: float = None,
+        mcts_tree_store: str = "nodes",
+        mcts_rollouts_per_leaf: int = 1,
+        mcts_root_policy: str = "ucb",
+        mcts_max_nodes: int = None,
+        search_enemy_model: str = "adversarial",
+        minimax_alpha_beta: bool = False,
+        mcts_pool=None,
     ):
         """Initialize player agent with selected algorithm.
 
@@ -60,10 +86,44 @@ class PlayerAgent:
             mcts_sim_depth: MCTS simulation depth (overrides default)
             alphabeta_depth: AlphaBeta depth (overrides default)
             minimax_depth: Minimax depth (overrides default)
+            in_place_search: Let AlphaBeta/Minimax search with apply()/undo()
+                instead of cloning the state for every node
+            alphabeta_time_budget_ms: Run AlphaBeta as iterative deepening up
+                to its depth within this many milliseconds per move
+            mcts_workers: Run MCTS root-parallel over this many worker
+                processes, each growing its own tree
+            mcts_time_budget_ms: Run MCTS until this many milliseconds have
+                passed instead of for a fixed number of iterations
+            mcts_tree_store: "array" keeps the MCTS tree in NumPy arrays
+                (about 10x less memory per node) instead of MCTSNode objects
+            mcts_rollouts_per_leaf: Evaluate each MCTS leaf with this many
+                NumPy rollouts played in lockstep
+            mcts_root_policy: "halving" spreads the MCTS iterations over the
+                root moves by Sequential Halving instead of UCB1
+            mcts_max_nodes: Prune the least-visited MCTS subtrees whenever the
+                tree grows past this many nodes
+            search_enemy_model: "astar" lets AlphaBeta/Minimax assume the enemy
+                follows its A* chase, searching a single enemy move per ply
+            minimax_alpha_beta: Let Minimax prune with an alpha-beta window on
+                top of its position memo
+            mcts_pool: multiprocessing Pool for root-parallel MCTS to run its
+                workers on; the caller keeps ownership of it
         """
         self.env = env
         self.algorithm_choice = (algorithm or "MCTS").upper()
         self.benchmark_mode = benchmark_mode
+        self.in_place_search = in_place_search
+        self.alphabeta_time_budget_ms = alphabeta_time_budget_ms
+        self.mcts_workers = mcts_workers
+        self.mcts_pool = mcts_pool
+        self.mcts_time_budget_ms = mcts_time_budget_ms
+        self.mcts_tree_store = mcts_tree_store
+        self.mcts_rollouts_per_leaf = mcts_rollouts_per_leaf
+        self.mcts_root_policy = mcts_root_policy
+        self.mcts_max_nodes = mcts_max_nodes
+        self.search_enemy_model = search_enemy_model
+        self.minimax_alpha_beta = minimax_alpha_beta
+        self.path_cache = PATH_CACHE
         self.log = Logger("PlayerAgent")
 
         # Initialize algorithm parameters
@@ -159,24 +219,21 @@ class PlayerAgent:
                 f"Initializing MCTS (iterations={self.mcts_iterations}, "
                 f"depth={self.mcts_sim_depth})..."
             )
-            self.mcts_search = MCTS(
-                iterations=self.mcts_iterations,
-                max_sim_depth=self.mcts_sim_depth,
-            )
+            self.mcts_search = self._make_mcts()
             self.log.info("--- PlayerAgent using: MCTS ---")
 
         elif self.algorithm_choice in ["ALPHABETA", "ALPHA-BETA"]:
             self.log.info(
                 f"Initializing AlphaBetaSearch (depth={self.alphabeta_max_depth})..."
             )
-            self.alphabeta_search = AlphaBetaSearch(max_depth=self.alphabeta_max_depth)
+            self.alphabeta_search = self._make_alphabeta()
             self.log.info("--- PlayerAgent using: AlphaBeta ---")
 
         elif self.algorithm_choice == "MINIMAX":
             self.log.info(
                 f"Initializing MinimaxSearch (depth={self.minimax_max_depth})..."
             )
-            self.minimax_search = MinimaxSearch(max_depth=self.minimax_max_depth)
+            self.minimax_search = self._make_minimax()
             self.log.info("--- PlayerAgent using: Minimax ---")
 
         else:
@@ -184,10 +241,54 @@ class PlayerAgent:
                 f"Unknown algorithm '{self.algorithm_choice}'. Defaulting to MCTS."
             )
             self.algorithm_choice = "MCTS"
-            self.mcts_search = MCTS(
-                iterations=self.mcts_iterations,
-                max_sim_depth=self.mcts_sim_depth,
-            )
+            self.mcts_search = self._make_mcts()
+
+    def _make_mcts(self) -> MCTS:
+        """Build an MCTS search from the agent's MCTS options."""
+        return MCTS(
+            iterations=self.mcts_iterations,
+            max_sim_depth=self.mcts_sim_depth,
+            workers=self.mcts_workers,
+            time_budget_ms=self.mcts_time_budget_ms,
+            tree_store=self.mcts_tree_store,
+            rollouts_per_leaf=self.mcts_rollouts_per_leaf,
+            root_policy=self.mcts_root_policy,
+            max_nodes=self.mcts_max_nodes,
+            pool=self.mcts_pool,
+        )
+
+    def _make_alphabeta(self) -> AlphaBetaSearch:
+        """Build an AlphaBeta search from the agent's AlphaBeta options."""
+        return AlphaBetaSearch(
+            max_depth=self.alphabeta_max_depth,
+            in_place=self.in_place_search,
+            time_budget_ms=self.alphabeta_time_budget_ms,
+            enemy_model=self.search_enemy_model,
+        )
+
+    def _make_minimax(self) -> MinimaxSearch:
+        """Build a Minimax search from the agent's Minimax options."""
+        return MinimaxSearch(
+            max_depth=self.minimax_max_depth,
+            in_place=self.in_place_search,
+            enemy_model=self.search_enemy_model,
+            alpha_beta=self.minimax_alpha_beta,
+        )
+
+    def close(self) -> None:
+        """Shut down the worker processes the MCTS search started, if any.
+
+        Call when the agent is done or before discarding its searches; the
+        agent can also be used as a context manager.
+        """
+        if self.mcts_search is not None:
+            self.mcts_search.close()
+
+    def __enter__(self) -> "PlayerAgent":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def action(self) -> tuple:
         """Execute player action based on selected algorithm.
@@ -247,10 +348,7 @@ class PlayerAgent:
                 f"Lazy-initializing MCTS (iterations={self.mcts_iterations}, "
                 f"depth={self.mcts_sim_depth})..."
             )
-            self.mcts_search = MCTS(
-                iterations=self.mcts_iterations,
-                max_sim_depth=self.mcts_sim_depth,
-            )
+            self.mcts_search = self._make_mcts()
 
         self.log.info("MCTS is thinking...")
         result = self.mcts_search.search(state)
@@ -273,7 +371,7 @@ class PlayerAgent:
                 f"Lazy-initializing AlphaBetaSearch "
                 f"(depth={self.alphabeta_max_depth})..."
             )
-            self.alphabeta_search = AlphaBetaSearch(max_depth=self.alphabeta_max_depth)
+            self.alphabeta_search = self._make_alphabeta()
 
         self.log.info("AlphaBeta is thinking...")
         result = self.alphabeta_search.search(state)
@@ -295,7 +393,7 @@ class PlayerAgent:
             self.log.info(
                 f"Lazy-initializing MinimaxSearch (depth={self.minimax_max_depth})..."
             )
-            self.minimax_search = MinimaxSearch(max_depth=self.minimax_max_depth)
+            self.minimax_search = self._make_minimax()
 
         self.log.info("Minimax is thinking...")
         result = self.minimax_search.search(state)
@@ -338,12 +436,10 @@ class PlayerAgent:
     def peek_path_to_goal(self) -> list:
         """Calculate path from player to goal using A* (for visualization).
 
+        Served from the shared path cache until the player moves or the map
+        changes.
+
         Returns:
             List of (x, y) tuples representing path, or empty list if no path exists
         """
-        a_star = AStar(env=self.env)
-        start = tuple(self.env.player_pos)
-        goal = tuple(self.env.goal)
-
-        path = a_star.search(start, goal)
-        return [] if path is None else list(path)
+        return self.path_cache.path(self.env, self.env.player_pos, self.env.goal)
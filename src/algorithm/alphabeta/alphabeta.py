@@ -1,7 +1,20 @@
+import time
+
 from algorithm.alphabeta.alphabetanode import AlphaBetaNode
+from algorithm.alphabeta.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+from algorithm.astar.chase import ChaseModel
 from utils.logger import Logger
 
 
+class _SearchTimeout(Exception):
+    """Raised inside the recursion when the per-move time budget runs out."""
+
+
 class AlphaBetaSearch:
     """
     Alpha-Beta Pruning search algorithm.
@@ -10,18 +23,74 @@ class AlphaBetaSearch:
     - Uses depth-limited minimax with alpha-beta pruning
     - Returns scores normalized to [0.0, 1.0] to match MCTS semantics
     - Tracks number of visited nodes for analysis/debugging
+    - Optionally searches in place with apply()/undo() instead of cloning
+    - Caches results in a transposition table keyed by the state's Zobrist
+      hash, shared across searches by the same instance
+    - Optionally runs iterative deepening under a per-move time budget
+    - Orders moves by TT move, killer moves, history score and distance
+      (player towards the goal, enemy towards the player)
+    - Optionally models the enemy as the deterministic A* pursuer it is
+      (enemy_model="astar"): MIN nodes then search only the predicted move,
+      until the enemy is seen to deviate and the search turns adversarial
     """
 
-    def __init__(self, max_depth: int = 3):
+    ENEMY_MODELS = ("adversarial", "astar")
+
+    # Nodes between two wall-clock checks when a time budget is set
+    TIME_CHECK_INTERVAL = 256
+
+    # Killer moves remembered per ply
+    KILLER_SLOTS = 2
+
+    def __init__(
+        self,
+        max_depth: int = 3,
+        in_place: bool = False,
+        tt_size: int = 1 << 16,
+        time_budget_ms: float = None,
+        move_ordering: bool = True,
+        enemy_model: str = "adversarial",
+    ):
         """
         Initialize Alpha-Beta search.
 
         Args:
-            max_depth (int): Maximum search depth for the minimax tree.
+            max_depth (int): Maximum search depth for the minimax tree. With a
+                time budget this caps the iterative deepening.
+            in_place (bool): Walk the tree with apply()/undo() on the given
+                state instead of cloning it for every child.
+            tt_size (int): Transposition table slots; 0 disables the table.
+            time_budget_ms (float): Per-move wall-clock budget. When set, the
+                search deepens one ply at a time and returns the best move of
+                the last completed depth. None searches exactly max_depth.
+            move_ordering (bool): Order moves with killer/history tables and
+                distance heuristics. When False only the TT move is promoted.
+            enemy_model (str): "adversarial" searches every enemy move;
+                "astar" searches only the move EnemyAgent's A* chase would
+                make, and falls back to "adversarial" for the rest of the map
+                once the real enemy plays a move the model did not predict.
         """
+        if enemy_model not in self.ENEMY_MODELS:
+            raise ValueError(f"Unknown enemy model: {enemy_model!r}")
+
         self.max_depth = max_depth
+        self.in_place = in_place
+        self.time_budget_ms = time_budget_ms
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        self._tt_map = None
         self.log = Logger("AlphaBeta")
         self._nodes_visited = 0
+        self._depth_limit = max_depth
+        self._deadline = None
+        self.move_ordering = move_ordering
+        self._killers = {}
+        self._history = {}
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self.enemy_model = enemy_model
+        self._chase = ChaseModel() if enemy_model == "astar" else None
+        self._model_active = self._chase is not None
+        self._model_map = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -41,27 +110,108 @@ class AlphaBetaSearch:
                 - meta (dict):
                     * nodes_visited (int): Number of expanded nodes
                     * win_probability (float): Normalized score in [0.0, 1.0]
+                    * search_depth (int): Depth of the returned result
+                    * first_move_cutoff_rate (float): Share of cutoffs caused
+                      by the first move searched
+                    * tt_hit_rate (float): Share of table probes that hit
+                      (only when the transposition table is enabled)
+                    * enemy_model (str): Enemy model the search used
+        """
+        self._nodes_visited = 0
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._new_ordering_generation()
+
+        if self.tt is not None:
+            # Hashes only cover dynamic state, so entries die with the map
+            if state.static_map is not self._tt_map:
+                self.tt.clear()
+                self._tt_map = state.static_map
+            self.tt.new_search()
+
+        if self._chase is not None:
+            self._check_enemy_model(state)
+
+        if not state.get_valid_actions(unit="current"):
+            return None, self._meta(0.0, 0)
+
+        if self.time_budget_ms is None:
+            depths = [self.max_depth]
+            deadline = None
+        else:
+            depths = range(1, self.max_depth + 1)
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+
+        best_action = None
+        best_value = -float("inf")
+        completed_depth = 0
+
+        for depth in depths:
+            # Depth 1 always completes so there is a move to return
+            self._deadline = deadline if depth > 1 else None
+            try:
+                action, value = self._search_root(state, depth, best_action)
+            except _SearchTimeout:
+                self.log.info(f"Time budget exhausted during depth {depth}")
+                break
+            finally:
+                self._deadline = None
+
+            best_action, best_value, completed_depth = action, value, depth
+
+            # Stop deepening once out of time or the outcome is decided
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if abs(value) >= 1.0:
+                break
+
+        if self._model_active and best_action is not None:
+            self._chase.expect(state, best_action)
+
+        win_probability = self._normalize_score(best_value)
+
+        self.log.info(
+            f"Best action: {best_action}, raw score: {best_value:.3f}, "
+            f"win_prob: {win_probability:.2f}, depth: {completed_depth}"
+        )
+
+        return best_action, self._meta(win_probability, completed_depth)
+
+    def _search_root(self, state, depth, first_move=None):
         """
+        Search the root (MAX node) to a fixed depth.
+
+        Args:
+            state: Current game state
+            depth (int): Depth limit for this pass
+            first_move: Action to search first, e.g. the best move of the
+                previous iterative-deepening pass
+
+        Returns:
+            tuple: (best_action, best_value)
+        """
+        self._depth_limit = depth
         alpha = -float("inf")
         beta = float("inf")
 
         best_value = -float("inf")
         best_action = None
-        self._nodes_visited = 0
 
-        legal_actions = list(state.get_valid_actions(unit="current"))
-        if not legal_actions:
-            return None, {
-                "nodes_visited": 0,
-                "win_probability": 0.0,
-            }
+        if first_move is None and self.tt is not None:
+            entry = self.tt.probe(state.zobrist_key)
+            if entry is not None:
+                first_move = entry.best_move
+
+        legal_actions = self._ordered_actions(state, 0, first_move)
 
         # Root-level expansion (MAX player)
         for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action)
+            next_state, record = self._child(state, action)
 
-            value = self._min_value(next_state, alpha, beta, depth=1)
+            try:
+                value = self._min_value(next_state, alpha, beta, depth=1)
+            finally:
+                self._restore(state, record)
 
             self.log.info(f"Action {action} -> raw score: {value:.3f}")
 
@@ -71,18 +221,28 @@ class AlphaBetaSearch:
 
             alpha = max(alpha, best_value)
 
-        win_probability = self._normalize_score(best_value)
+        if self.tt is not None:
+            self.tt.store(state.zobrist_key, depth, best_value, EXACT, best_action)
 
-        self.log.info(
-            f"Best action: {best_action}, raw score: {best_value:.3f}, win_prob: {win_probability:.2f}"
-        )
+        return best_action, best_value
 
+    def _meta(self, win_probability: float, search_depth: int) -> dict:
+        """Build the metadata dict returned by search()."""
         meta = {
             "nodes_visited": self._nodes_visited,
             "win_probability": win_probability,
+            "search_depth": search_depth,
+            "cutoffs": self._cutoffs,
+            "first_move_cutoff_rate": (
+                self._first_move_cutoffs / self._cutoffs if self._cutoffs else 0.0
+            ),
+            "enemy_model": "astar" if self._model_active else "adversarial",
         }
-
-        return best_action, meta
+        if self.tt is not None:
+            meta["tt_hit_rate"] = self.tt.hit_rate()
+            meta["tt_hits"] = self.tt.hits
+            meta["tt_probes"] = self.tt.probes
+        return meta
 
     # ------------------------------------------------------------------
     # Alpha-Beta Core (Minimax)
@@ -101,29 +261,49 @@ class AlphaBetaSearch:
             float: Best achievable value from this state
         """
         node = AlphaBetaNode(state)
-        self._nodes_visited += 1
+        self._visit()
 
-        if depth == self.max_depth or node.is_terminal():
+        if depth == self._depth_limit or node.is_terminal():
             return node.evaluate()
 
+        key = None
+        tt_move = None
+        alpha_orig, beta_orig = alpha, beta
+        if self.tt is not None:
+            key = state.zobrist_key
+            cached, alpha, beta, tt_move = self._tt_lookup(
+                key, self._depth_limit - depth, alpha, beta
+            )
+            if cached is not None:
+                return cached
+
         value = -float("inf")
-        legal_actions = list(state.get_valid_actions(unit="current"))
+        best_move = None
+        legal_actions = self._ordered_actions(state, depth, tt_move)
 
-        for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action)
+        for index, action in enumerate(legal_actions):
+            next_state, record = self._child(state, action)
 
-            value = max(
-                value,
-                self._min_value(next_state, alpha, beta, depth + 1),
-            )
+            try:
+                child_value = self._min_value(next_state, alpha, beta, depth + 1)
+            finally:
+                self._restore(state, record)
+
+            if child_value > value:
+                value = child_value
+                best_move = action
 
             if value >= beta:
                 # Beta cutoff
-                return value
+                self._record_cutoff(state.turn, action, depth, index)
+                break
 
             alpha = max(alpha, value)
 
+        if key is not None:
+            self._tt_store(
+                key, self._depth_limit - depth, value, alpha_orig, beta_orig, best_move
+            )
         return value
 
     def _min_value(self, state, alpha, beta, depth):
@@ -140,31 +320,254 @@ class AlphaBetaSearch:
             float: Worst-case value assuming optimal opponent play
         """
         node = AlphaBetaNode(state)
-        self._nodes_visited += 1
+        self._visit()
 
-        if depth == self.max_depth or node.is_terminal():
+        if depth == self._depth_limit or node.is_terminal():
             return node.evaluate()
 
+        key = None
+        tt_move = None
+        alpha_orig, beta_orig = alpha, beta
+        if self.tt is not None:
+            key = state.zobrist_key
+            cached, alpha, beta, tt_move = self._tt_lookup(
+                key, self._depth_limit - depth, alpha, beta
+            )
+            if cached is not None:
+                return cached
+
         value = float("inf")
-        legal_actions = list(state.get_valid_actions(unit="current"))
+        best_move = None
+        legal_actions = self._ordered_actions(state, depth, tt_move)
 
-        for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action)
+        for index, action in enumerate(legal_actions):
+            next_state, record = self._child(state, action)
 
-            value = min(
-                value,
-                self._max_value(next_state, alpha, beta, depth + 1),
-            )
+            try:
+                child_value = self._max_value(next_state, alpha, beta, depth + 1)
+            finally:
+                self._restore(state, record)
+
+            if child_value < value:
+                value = child_value
+                best_move = action
 
             if value <= alpha:
                 # Alpha cutoff
-                return value
+                self._record_cutoff(state.turn, action, depth, index)
+                break
 
             beta = min(beta, value)
 
+        if key is not None:
+            self._tt_store(
+                key, self._depth_limit - depth, value, alpha_orig, beta_orig, best_move
+            )
         return value
 
+    def _visit(self):
+        """Count a node and abort the pass if the time budget has run out."""
+        self._nodes_visited += 1
+        if (
+            self._deadline is not None
+            and self._nodes_visited % self.TIME_CHECK_INTERVAL == 0
+            and time.perf_counter() > self._deadline
+        ):
+            raise _SearchTimeout()
+
+    # ------------------------------------------------------------------
+    # Enemy Model
+    # ------------------------------------------------------------------
+    def _check_enemy_model(self, state):
+        """
+        Re-enable the A* enemy model on a new map, and drop it for good once
+        the enemy's last move contradicts the prediction.
+
+        Values searched under the model assume the enemy's cooperation, so
+        the transposition table is cleared when falling back.
+        """
+        if state.static_map is not self._model_map:
+            self._model_map = state.static_map
+            self._model_active = True
+
+        if not self._chase.confirm(state) and self._model_active:
+            self.log.warning(
+                "Enemy deviated from the A* model; searching adversarially"
+            )
+            self._model_active = False
+            if self.tt is not None:
+                self.tt.clear()
+
+    # ------------------------------------------------------------------
+    # Transposition Table
+    # ------------------------------------------------------------------
+    def _tt_lookup(self, key, remaining, alpha, beta):
+        """
+        Probe the transposition table for a node.
+
+        Args:
+            key (int): Zobrist hash of the node
+            remaining (int): Depth still to be searched below the node
+            alpha (float): Current alpha
+            beta (float): Current beta
+
+        Returns:
+            tuple: (cached_value or None, alpha, beta, tt_move). A cached value
+            means the node can return immediately; otherwise alpha/beta may
+            have been tightened by a stored bound and tt_move (possibly None)
+            should be searched first.
+        """
+        entry = self.tt.probe(key)
+        if entry is None:
+            return None, alpha, beta, None
+
+        if entry.depth >= remaining:
+            if entry.bound == EXACT:
+                return entry.value, alpha, beta, entry.best_move
+            if entry.bound == LOWER_BOUND:
+                alpha = max(alpha, entry.value)
+            else:
+                beta = min(beta, entry.value)
+            if alpha >= beta:
+                return entry.value, alpha, beta, entry.best_move
+
+        return None, alpha, beta, entry.best_move
+
+    def _tt_store(self, key, remaining, value, alpha_orig, beta_orig, best_move):
+        """Store a node result with the bound type implied by its window."""
+        if value <= alpha_orig:
+            bound = UPPER_BOUND
+        elif value >= beta_orig:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.tt.store(key, remaining, value, bound, best_move)
+
+    # ------------------------------------------------------------------
+    # Move Ordering
+    # ------------------------------------------------------------------
+    def _new_ordering_generation(self):
+        """
+        Prepare the ordering tables for a new search() call.
+
+        Killer moves are indexed by ply, so they only carry over between the
+        iterations of one search. History scores carry over between calls but
+        are halved so older searches fade out.
+        """
+        self._killers = {}
+        self._history = {
+            key: score // 2 for key, score in self._history.items() if score > 1
+        }
+
+    def _record_cutoff(self, turn, action, depth, index):
+        """
+        Update cutoff statistics, killer moves and history for a cutoff.
+
+        Args:
+            turn (str): Side to move at the node that was cut off
+            action: Move that caused the cutoff
+            depth (int): Ply of the node
+            index (int): Position of action in the searched order
+        """
+        self._cutoffs += 1
+        if index == 0:
+            self._first_move_cutoffs += 1
+
+        if not self.move_ordering:
+            return
+
+        killers = self._killers.setdefault(depth, [])
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[self.KILLER_SLOTS :]
+
+        remaining = self._depth_limit - depth
+        key = (turn, action)
+        self._history[key] = self._history.get(key, 0) + remaining * remaining
+
+    def _ordered_actions(self, state, depth, first_move=None):
+        """
+        Return the legal actions in search order.
+
+        first_move (if legal) goes first, then killer moves for this ply, then
+        the rest by history score and finally by distance: the player prefers
+        tiles closer to the goal, the enemy tiles closer to the player. With
+        the A* enemy model active, an enemy node has only the predicted move.
+
+        Args:
+            state: Current game state
+            depth (int): Ply of the node
+            first_move: Action to try first, e.g. from the transposition table
+
+        Returns:
+            list: Legal actions
+        """
+        if state.turn == "enemy" and self._model_active:
+            # The modelled enemy has exactly one move
+            return [self._chase.move(state)]
+
+        legal_actions = state.get_valid_actions(unit="current")
+
+        if not self.move_ordering:
+            legal_actions = list(legal_actions)
+            if first_move is not None and first_move in legal_actions:
+                legal_actions.remove(first_move)
+                legal_actions.insert(0, first_move)
+            return legal_actions
+
+        turn = state.turn
+        if turn == "player":
+            target = state.goal
+        else:
+            target = state.player_pos
+        # Wall-aware step counts to the target, from its cached distance field
+        target_dist = state.static_map.distances_from(*target)
+        width = state.width
+
+        killers = self._killers.get(depth, ())
+        history = self._history
+
+        def order_key(action):
+            if action == first_move:
+                rank = 0
+            elif action in killers:
+                rank = 1
+            else:
+                rank = 2
+            distance = target_dist[action[1] * width + action[0]]
+            return rank, -history.get((turn, action), 0), distance, action
+
+        return sorted(legal_actions, key=order_key)
+
+    # ------------------------------------------------------------------
+    # Child Generation
+    # ------------------------------------------------------------------
+    def _child(self, state, action):
+        """
+        Produce the state reached by playing action.
+
+        Args:
+            state: Current game state
+            action: Action to play
+
+        Returns:
+            tuple: (child_state, undo_record). In in-place mode the child is
+            the same object as state and the record must be passed to
+            _restore(); otherwise the child is a clone and the record is None.
+        """
+        if self.in_place:
+            return state, state.apply(action)
+
+        next_state = state.clone()
+        next_state.step(action)
+        return next_state, None
+
+    @staticmethod
+    def _restore(state, record):
+        """Undo an in-place child produced by _child()."""
+        if record is not None:
+            state.undo(record)
+
     # ------------------------------------------------------------------
     # Scoring Utilities
     # ------------------------------------------------------------------
@@ -35,28 +35,27 @@ class AlphaBetaNode:
         if player_pos == goal_pos:
             return 1.0  # WIN
 
-        if player_pos == enemy_pos or player_pos in self.state.traps:
+        if player_pos == enemy_pos or self.state.is_trap(*player_pos):
             return -1.0  # LOSS
 
         # Non-terminal heuristic evaluation
         cumulative_score = 0.0
 
+        # Wall-aware step counts from the map's cached distance fields
+        static_map = self.state.static_map
+
         # Goal proximity BONUS (closer = better) - PRIMARY OBJECTIVE
-        manhattan_dist_to_goal = abs(player_pos[0] - goal_pos[0]) + abs(
-            player_pos[1] - goal_pos[1]
-        )
         # Normalize distance to goal (max distance on 30x15 grid is ~45)
         max_distance = self.state.width + self.state.height
-        goal_bonus = (max_distance - manhattan_dist_to_goal) / max_distance
+        path_dist_to_goal = min(static_map.goal_distance(*player_pos), max_distance)
+        goal_bonus = (max_distance - path_dist_to_goal) / max_distance
         cumulative_score += goal_bonus * 0.8  # 80% weight on goal proximity
 
         # Enemy proximity penalty (danger zone) - avoid being close to enemy
-        manhattan_dist_to_enemy = abs(player_pos[0] - enemy_pos[0]) + abs(
-            player_pos[1] - enemy_pos[1]
-        )
-        if manhattan_dist_to_enemy <= 5 and manhattan_dist_to_enemy > 0:
+        path_dist_to_enemy = static_map.distance(enemy_pos, player_pos)
+        if path_dist_to_enemy <= 5 and path_dist_to_enemy > 0:
             # Heavy penalty for being too close
-            enemy_penalty = -1.0 / (manhattan_dist_to_enemy + 1.0)
+            enemy_penalty = -1.0 / (path_dist_to_enemy + 1.0)
             cumulative_score += enemy_penalty * 0.2  # 20% weight on enemy avoidance
         else:
             # Safe distance bonus
@@ -0,0 +1,108 @@
+"""Transposition table for Alpha-Beta search.
+
+Stores search results keyed by the environment's Zobrist hash so positions
+reached through different move orders are searched only once.
+"""
+
+from typing import NamedTuple, Optional
+
+# Bound types: how the stored value relates to the true minimax value
+EXACT = 0
+LOWER_BOUND = 1  # Search failed high (beta cutoff): true value >= value
+UPPER_BOUND = 2  # Search failed low: true value <= value
+
+
+class TTEntry(NamedTuple):
+    """One stored search result."""
+
+    key: int
+    depth: int  # Remaining search depth the value is valid for
+    value: float
+    bound: int
+    best_move: Optional[tuple]
+    age: int  # Search generation that wrote the entry
+
+
+class TranspositionTable:
+    """
+    Fixed-size, direct-mapped transposition table.
+
+    Each hash maps to one slot (key % size). A new entry replaces the
+    current occupant if the slot is empty, holds the same position, was
+    written by an earlier search (older age), or was searched to a depth no
+    greater than the new entry's.
+
+    Attributes:
+        size: Number of slots
+        age: Current search generation
+        probes: Lookups since the last new_search()
+        hits: Lookups that found the requested position
+    """
+
+    def __init__(self, size: int = 1 << 16):
+        """
+        Initialize the table.
+
+        Args:
+            size (int): Number of slots (bounds memory use).
+        """
+        self.size = max(1, int(size))
+        self._slots = [None] * self.size
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. when the map changes."""
+        self._slots = [None] * self.size
+
+    def new_search(self) -> None:
+        """Start a new search generation and reset hit statistics."""
+        self.age += 1
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """
+        Look up a position.
+
+        Args:
+            key (int): Zobrist hash of the position
+
+        Returns:
+            TTEntry or None: Stored entry for exactly this key, if any
+        """
+        self.probes += 1
+        entry = self._slots[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, bound, best_move) -> None:
+        """
+        Store a search result, subject to the replacement policy.
+
+        Args:
+            key (int): Zobrist hash of the position
+            depth (int): Remaining depth the value was searched to
+            value (float): Search value
+            bound (int): EXACT, LOWER_BOUND or UPPER_BOUND
+            best_move: Best action found, or None
+        """
+        index = key % self.size
+        current = self._slots[index]
+        if (
+            current is None
+            or current.key == key
+            or current.age != self.age
+            or depth >= current.depth
+        ):
+            self._slots[index] = TTEntry(key, depth, value, bound, best_move, self.age)
+
+    def hit_rate(self) -> float:
+        """Fraction of probes in the current search that found an entry."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._slots if entry is not None)
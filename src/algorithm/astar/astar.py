@@ -2,6 +2,10 @@
 
 Uses Manhattan distance heuristic and standard A* search with f = g + h scoring.
 Finds shortest path from start to goal while avoiding walls.
+
+The search runs over flat tile indices with preallocated score and parent
+arrays; Node and get_neighbors() remain for callers that walk the grid with
+node objects.
 """
 
 import heapq
@@ -11,7 +15,14 @@ from environment.environment import TacticalEnvironment
 
 
 class AStar:
-    """A* pathfinder for tactical grid environments."""
+    """
+    A* pathfinder for tactical grid environments.
+
+    Attributes:
+        env: Environment whose map is searched
+        counter: Heap entries pushed by the last search
+        expanded: Tiles expanded by the last search
+    """
 
     def __init__(self, env: TacticalEnvironment):
         """
@@ -22,6 +33,15 @@ class AStar:
         """
         self.env = env
         self.counter = 0
+        self.expanded = 0
+
+        # Per-map search arrays, allocated by the first search on a map
+        self._static_map = None
+        self._g_score = None
+        self._parent = None
+        self._seen = None
+        self._closed = None
+        self._search_id = 0
 
     def heuristic(self, pos, goal):
         """
@@ -73,12 +93,19 @@ class AStar:
         Perform A* search from start to goal.
 
         Uses standard A* with:
-        - Open set: Priority queue of nodes to explore (by f-score)
-        - Closed set: Already explored nodes
-        - g: Cost from start to current node
-        - h: Heuristic estimate from current to goal
+        - Open set: Priority queue of (f, push counter, tile) entries
+        - Closed set: Already explored tiles
+        - g: Cost from start to current tile
+        - h: Heuristic estimate from current tile to goal
         - f: g + h (total estimated cost)
 
+        Tiles are flat indices (y * width + x). Scores, parents and the
+        closed set live in per-map arrays that are allocated once and
+        invalidated by a search id instead of being cleared, and neighbours
+        come from the map's precomputed table, so a search allocates no
+        per-node objects. Neighbours are pushed in get_neighbors() order,
+        which keeps the path chosen among equally short ones unchanged.
+
         Args:
             start: Starting position as (x, y) tuple
             goal: Goal position as (x, y) tuple
@@ -87,59 +114,97 @@ class AStar:
             list: Path from start to goal (including both endpoints)
                   Returns None if no path exists
         """
-        # Initialize start node
-        start_node = Node(parent=None, position=start)
-        goal_node = Node(parent=None, position=goal)
-
-        # Open set: priority queue ordered by f-score
-        open_heap = []
-        self.counter = 0
-
-        heapq.heappush(open_heap, (0, self.counter, start_node))
-        self.counter += 1
-
-        # Track nodes in open set by position for quick lookup
-        open_set = {start: start_node}
-        closed_set = set()
+        static_map = self.env.static_map
+        if static_map is not self._static_map:
+            self._allocate(static_map)
+
+        width = static_map.width
+        neighbours = static_map.neighbours
+        g_score = self._g_score
+        parent = self._parent
+        seen = self._seen
+        closed = self._closed
+        self._search_id += 1
+        search_id = self._search_id
+
+        gx, gy = goal
+        source = start[1] * width + start[0]
+        target = gy * width + gx
+
+        g_score[source] = 0
+        parent[source] = -1
+        seen[source] = search_id
+        open_heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, source)]
+        counter = 1
+        expanded = 0
 
         # Main A* loop
         while open_heap:
-            # Get node with lowest f-score
-            _, _, current = heapq.heappop(open_heap)
-            closed_set.add(current.position)
+            # Get tile with lowest f-score
+            _, _, tile = heapq.heappop(open_heap)
+            if closed[tile] == search_id:
+                continue  # Stale entry, superseded by a cheaper push
+            closed[tile] = search_id
+            expanded += 1
 
             # Goal reached - reconstruct path
-            if current == goal_node:
+            if tile == target:
+                self.counter = counter
+                self.expanded = expanded
                 path = []
-                while current is not None:
-                    path.append(current.position)
-                    current = current.parent
+                while tile >= 0:
+                    path.append((tile % width, tile // width))
+                    tile = parent[tile]
                 return path[::-1]
 
-            # Explore neighbors
-            for neighbor in self.get_neighbors(current):
-                # Skip if already explored
-                if neighbor.position in closed_set:
+            tentative_g = g_score[tile] + 1
+            for neighbor in neighbours[tile]:
+                if closed[neighbor] == search_id:
                     continue
 
-                # Calculate tentative g-score (cost from start)
-                tentative_g = current.g + 1
-
                 # Update if we found a better path to this neighbor
-                if (
-                    neighbor.position not in open_set
-                    or tentative_g < open_set[neighbor.position].g
-                ):
-                    # Update neighbor's scores
-                    neighbor.g = tentative_g
-                    neighbor.h = self.heuristic(neighbor.position, goal)
-                    neighbor.f = neighbor.g + neighbor.h
-                    neighbor.parent = current
-
-                    # Add/update in open set
-                    open_set[neighbor.position] = neighbor
-                    heapq.heappush(open_heap, (neighbor.f, self.counter, neighbor))
-                    self.counter += 1
+                if seen[neighbor] != search_id or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = search_id
+                    g_score[neighbor] = tentative_g
+                    parent[neighbor] = tile
+                    f = tentative_g + abs(neighbor % width - gx) + abs(
+                        neighbor // width - gy
+                    )
+                    heapq.heappush(open_heap, (f, counter, neighbor))
+                    counter += 1
 
         # No path found
+        self.counter = counter
+        self.expanded = expanded
         return None
+
+    def _allocate(self, static_map):
+        """Size the per-search arrays for static_map."""
+        tiles = static_map.width * static_map.height
+        self._static_map = static_map
+        # Plain lists: scalar indexing is what the search loop does, and
+        # lists answer it faster than array or NumPy buffers
+        self._g_score = [0] * tiles
+        self._parent = [0] * tiles
+        self._seen = [0] * tiles
+        self._closed = [0] * tiles
+        self._search_id = 0
+
+    def chase_move(self, start, goal, move_range):
+        """
+        Return where a pursuer at start ends its turn when it moves up to
+        move_range tiles along the A* path to goal.
+
+        Args:
+            start: Pursuer position as (x, y) tuple
+            goal: Target position as (x, y) tuple
+            move_range: Maximum tiles moved along the path
+
+        Returns:
+            tuple: (next_tile, path); next_tile is start when there is no
+            path or start is the goal, path is the A* path or None
+        """
+        path = self.search(start, goal)
+        if path is None or len(path) <= 1:
+            return start, path
+        return path[min(move_range, len(path) - 1)], path
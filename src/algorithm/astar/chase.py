@@ -0,0 +1,109 @@
+"""Model of the A* pursuer used by EnemyAgent.
+
+The enemy is deterministic: it follows the A* path to the player for up to
+move_range tiles. Searches that know this can replace the enemy's branching
+with its one predicted move, turning the game tree into a single-agent
+search. ChaseModel makes that prediction and checks it against the moves
+the enemy actually plays, so a search can fall back to adversarial play as
+soon as the enemy turns out to behave differently.
+"""
+
+from algorithm.astar.pursuit import Pursuit
+
+
+class ChaseModel:
+    """
+    Predicts EnemyAgent moves and verifies the predictions.
+
+    Attributes:
+        move_range: Tiles the enemy moves along its path per turn
+        predictions: Moves predicted since creation
+        cache_hits: Predictions answered from the path cache
+    """
+
+    def __init__(self, move_range: int = 2):
+        """
+        Initialize the model.
+
+        Args:
+            move_range (int): Enemy move range (EnemyAgent.move_range)
+        """
+        self.move_range = move_range
+        self.predictions = 0
+        self.cache_hits = 0
+        self._pursuit = Pursuit(move_range)
+        self._moves = {}
+        self._static_map = None
+        self._expected = None
+
+    def move(self, state) -> tuple:
+        """
+        Return the tile the enemy moves to in state.
+
+        Walls are the only obstacles A* considers, so the move depends on the
+        two unit positions alone and is cached per map. Uncached moves come
+        from Pursuit, which reads them off the player's distance field.
+
+        Args:
+            state: TacticalEnvironment (any turn)
+
+        Returns:
+            tuple: (x, y) the enemy ends its turn on
+        """
+        return self.move_between(state, tuple(state.enemy_pos), tuple(state.player_pos))
+
+    def move_between(self, state, enemy_pos: tuple, player_pos: tuple) -> tuple:
+        """Like move(), for the given unit positions on state's map."""
+        if state.static_map is not self._static_map:
+            self._static_map = state.static_map
+            self._moves = {}
+
+        self.predictions += 1
+        key = (enemy_pos, player_pos)
+        move = self._moves.get(key)
+        if move is None:
+            move, _ = self._pursuit.chase_move(state.static_map, enemy_pos, player_pos)
+            self._moves[key] = move
+        else:
+            self.cache_hits += 1
+        return move
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+    def expect(self, state, action) -> None:
+        """
+        Remember where the enemy should stand after the player plays action.
+
+        Args:
+            state: State the player moves from
+            action: Player move about to be played
+        """
+        player_pos = tuple(action)
+        self._expected = (
+            state.static_map,
+            player_pos,
+            self.move_between(state, tuple(state.enemy_pos), player_pos),
+        )
+
+    def confirm(self, state) -> bool:
+        """
+        Check the enemy's last move against the expectation from expect().
+
+        Only a state that continues the expected line (same map, player on
+        the expected tile) can contradict the model; anything else, such as
+        a new episode, is not counted against it.
+
+        Args:
+            state: State at the player's next turn
+
+        Returns:
+            bool: False if the enemy moved somewhere the model did not predict
+        """
+        expected, self._expected = self._expected, None
+        if expected is None:
+            return True
+        static_map, player_pos, enemy_pos = expected
+        if static_map is not state.static_map or tuple(state.player_pos) != player_pos:
+            return True
+        return tuple(state.enemy_pos) == enemy_pos
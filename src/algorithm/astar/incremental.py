@@ -0,0 +1,260 @@
+"""Incremental replanning for the pursuing enemy.
+
+Every enemy turn both ends of the chase have moved: the enemy up to two
+tiles along its last path, the player up to three tiles. D* Lite and LPA*
+keep distances rooted at one end and repair them after edge-cost changes,
+but the walls the enemy plans around never change, while moving the root
+shifts the distance of nearly every explored tile, so such a repair costs
+about as much as a new search.
+
+IncrementalPlanner therefore reuses the previous A* search tree the way
+Generalized Fringe-Retrieving A* (G-FRA*), a moving-target method from the
+same line of work as MT-D* Lite, does:
+
+- The enemy's new tile lies on its previous path, so the part of the old
+  search tree below that tile consists of shortest paths from it (a
+  sub-path of a shortest path is itself shortest). Those tiles keep their
+  g-values; they are measured from the old root, which only shifts every
+  f-value by the same constant.
+- The rest of the tree is forgotten. Kept tiles next to a forgotten or
+  unseen tile form the fringe and are expanded again; open tiles whose
+  parent was kept stay on the open list.
+- The open list is re-keyed for the player's new tile and A* resumes. A
+  player who is still inside the kept tree is found without expanding
+  anything.
+"""
+
+import heapq
+
+from environment.state import UNREACHABLE
+
+
+class IncrementalPlanner:
+    """
+    Shortest-path planner that carries its search tree from turn to turn.
+
+    Paths are shortest paths, but ties between equally short ones may be
+    broken differently from AStar.search().
+
+    Attributes:
+        move_range: Tiles the pursuer moves along its path per turn
+        reuse: Whether plans continue the previous search tree
+        expanded: Tiles expanded by the last plan (fringe tiles included)
+        total_expanded: Tiles expanded since creation
+        plans: Plans computed since creation
+        reused: Plans that continued the previous search tree
+    """
+
+    def __init__(self, move_range: int = 2, reuse: bool = True):
+        """
+        Initialize the planner.
+
+        Args:
+            move_range (int): Pursuer move range (EnemyAgent.move_range)
+            reuse (bool): False searches from scratch on every plan, which
+                gives the baseline the reuse is measured against
+        """
+        self.move_range = move_range
+        self.reuse = reuse
+        self.expanded = 0
+        self.total_expanded = 0
+        self.plans = 0
+        self.reused = 0
+
+        # Search tree, valid for tiles stamped with the current version
+        self._static_map = None
+        self._version = 0
+        self._stamp = None  # == version: tile is in the tree
+        self._closed = None  # == version: tile was expanded
+        self._g = None
+        self._parent = None
+        self._order = []  # Expanded tiles, parents before children
+        self._open = []  # Heap of (f, -g, tile) for the current target
+        self._fringe = set()  # Expanded tiles waiting to be expanded again
+        self._target = -1
+
+    def chase_move(self, static_map, start, goal):
+        """
+        Return where a pursuer at start ends its turn chasing goal.
+
+        Same contract as Pursuit.chase_move().
+
+        Args:
+            static_map: StaticMap the units stand on
+            start: Pursuer position as (x, y) tuple
+            goal: Target position as (x, y) tuple
+
+        Returns:
+            tuple: (next_tile, path); next_tile is start when there is no
+            path or start is the goal, path is None if goal is unreachable
+        """
+        start = tuple(start)
+        path = self.plan(static_map, start, goal)
+        if path is None or len(path) <= 1:
+            return start, path
+        return path[min(self.move_range, len(path) - 1)], path
+
+    def plan(self, static_map, start, goal):
+        """
+        Return a shortest path from start to goal.
+
+        Continues the previous search tree when start is a tile the
+        previous search expanded, and searches from scratch otherwise.
+
+        Args:
+            static_map: StaticMap to plan on
+            start: Start position as (x, y)
+            goal: Goal position as (x, y)
+
+        Returns:
+            list: Path from start to goal (including both endpoints), or
+            None if no path exists
+        """
+        width = static_map.width
+        source = start[1] * width + start[0]
+        target = goal[1] * width + goal[0]
+
+        self.plans += 1
+        self.expanded = 0
+        if static_map is not self._static_map:
+            self._allocate(static_map)
+            self._restart(source)
+        elif self.reuse and self._closed[source] == self._version:
+            self._reroot(source)
+            self.reused += 1
+        else:
+            self._restart(source)
+
+        if target != self._target:
+            self._retarget(target)
+        found = self._search(target)
+        self.total_expanded += self.expanded
+        if not found:
+            return None
+
+        path = []
+        tile = target
+        while tile != source:
+            path.append((tile % width, tile // width))
+            tile = self._parent[tile]
+        path.append(tuple(start))
+        return path[::-1]
+
+    # ------------------------------------------------------------------
+    # Search tree
+    # ------------------------------------------------------------------
+    def _allocate(self, static_map):
+        """Size the tree arrays for static_map."""
+        tiles = static_map.width * static_map.height
+        self._static_map = static_map
+        self._version = 0
+        self._stamp = [0] * tiles
+        self._closed = [0] * tiles
+        self._g = [UNREACHABLE] * tiles
+        self._parent = [-1] * tiles
+
+    def _restart(self, source):
+        """Drop the tree and start a new one rooted at source."""
+        self._version += 1
+        self._stamp[source] = self._version
+        self._g[source] = 0
+        self._parent[source] = -1
+        self._order = []
+        self._fringe = set()
+        self._open = [(0, 0, source)]
+        self._target = -1
+
+    def _reroot(self, source):
+        """Keep the subtree below source, which the last search expanded."""
+        old = self._version
+        new = self._version = old + 1
+        stamp, closed, g, parent = self._stamp, self._closed, self._g, self._parent
+
+        # Expanded tiles whose tree path runs through source
+        stamp[source] = closed[source] = new
+        order = [source]
+        for tile in self._order:
+            up = parent[tile]
+            if up >= 0 and closed[up] == new and tile != source:
+                stamp[tile] = closed[tile] = new
+                order.append(tile)
+        self._order = order
+
+        # Open tiles generated from a kept tile keep their best g
+        for _, neg_g, tile in self._open:
+            if (
+                stamp[tile] == old
+                and closed[tile] != old
+                and -neg_g == g[tile]
+                and closed[parent[tile]] == new
+            ):
+                stamp[tile] = new
+
+        # Kept tiles bordering a forgotten or unseen tile are expanded again
+        neighbours = self._static_map.neighbours
+        self._fringe = {
+            tile
+            for tile in order
+            if tile in self._fringe
+            or any(stamp[n] != new for n in neighbours[tile])
+        }
+        self._open = [
+            (0, -g[tile], tile)
+            for tile in set(t for _, _, t in self._open) | self._fringe
+            if stamp[tile] == new and (closed[tile] != new or tile in self._fringe)
+        ]
+        self._target = -1
+
+    def _retarget(self, target):
+        """Re-key the open list for a new target tile."""
+        width = self._static_map.width
+        gx, gy = target % width, target // width
+        g = self._g
+        self._open = [
+            (g[tile] + abs(tile % width - gx) + abs(tile // width - gy), -g[tile], tile)
+            for _, neg_g, tile in self._open
+            if -neg_g == g[tile]
+        ]
+        heapq.heapify(self._open)
+        self._target = target
+
+    def _search(self, target) -> bool:
+        """Run A* until target has its shortest distance; return False if
+        it is unreachable."""
+        version = self._version
+        if self._closed[target] == version:
+            return True
+
+        width = self._static_map.width
+        neighbours = self._static_map.neighbours
+        gx, gy = target % width, target // width
+        stamp, closed, g, parent = self._stamp, self._closed, self._g, self._parent
+        open_heap, fringe, order = self._open, self._fringe, self._order
+
+        while open_heap:
+            _, neg_g, tile = open_heap[0]
+            if tile in fringe:
+                fringe.discard(tile)
+            elif closed[tile] == version or -neg_g != g[tile]:
+                heapq.heappop(open_heap)  # Expanded already, or superseded
+                continue
+            elif tile == target:
+                return True
+            else:
+                closed[tile] = version
+                order.append(tile)
+            heapq.heappop(open_heap)
+            self.expanded += 1
+
+            next_g = g[tile] + 1
+            for n in neighbours[tile]:
+                if closed[n] == version:
+                    continue
+                if stamp[n] != version or next_g < g[n]:
+                    stamp[n] = version
+                    g[n] = next_g
+                    parent[n] = tile
+                    f = next_g + abs(n % width - gx) + abs(n // width - gy)
+                    heapq.heappush(open_heap, (f, -next_g, n))
+
+        return False
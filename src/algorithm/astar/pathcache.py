@@ -0,0 +1,86 @@
+"""LRU cache of A* paths for the path previews.
+
+The pygame loop asks both agents for their A* paths (enemy to player,
+player to goal) on every frame, although the units only move a few times a
+second. Walls never change within a StaticMap, so a path is fully
+determined by its endpoints and the map it was searched on: PathCache keys
+paths by (start, goal, map version) and only searches when one of them
+changes. PATH_CACHE is the instance both agents share.
+
+The cache outlives games, so it holds no environment between lookups: its
+searcher only keeps the arrays of the last map searched, and clear() drops
+those as well.
+"""
+
+from collections import OrderedDict
+
+from algorithm.astar.astar import AStar
+
+
+class PathCache:
+    """
+    Least-recently-used store of A* paths.
+
+    Attributes:
+        max_size: Maximum number of paths kept
+        hits: Lookups answered from the cache
+        misses: Lookups that ran a search
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of paths kept
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._paths = OrderedDict()
+        self._a_star = None
+
+    def path(self, env, start, goal) -> list:
+        """
+        Return the A* path from start to goal on env's map.
+
+        Args:
+            env: TacticalEnvironment whose walls the path avoids
+            start: Start position as (x, y)
+            goal: Goal position as (x, y)
+
+        Returns:
+            list: (x, y) tuples from start to goal, or empty list if no path
+            exists. The list is the caller's to keep or modify.
+        """
+        start, goal = tuple(start), tuple(goal)
+        key = (start, goal, env.static_map.version)
+        path = self._paths.get(key)
+        if path is not None:
+            self.hits += 1
+            self._paths.move_to_end(key)
+            return list(path)
+
+        self.misses += 1
+        if self._a_star is None:
+            self._a_star = AStar(env)
+        # One searcher for every map: its arrays are resized on map changes
+        self._a_star.env = env
+        try:
+            path = tuple(self._a_star.search(start, goal) or ())
+        finally:
+            self._a_star.env = None
+
+        self._paths[key] = path
+        if len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+        return list(path)
+
+    def clear(self) -> None:
+        """Drop every cached path and the searcher with its map arrays (the
+        hit and miss counters are kept)."""
+        self._paths.clear()
+        self._a_star = None
+
+
+PATH_CACHE = PathCache()
@@ -0,0 +1,186 @@
+"""Field-based pursuit, a drop-in replacement for the per-turn A* chase.
+
+EnemyAgent moves up to move_range tiles along the A* path to the player.
+Instead of searching the whole map every turn, Pursuit reads the BFS
+distance field rooted at the player (StaticMap.distances_from(), cached
+per player tile on the map) and knows every shortest path at once: a
+tile lies on one exactly when its distance drops by one per step.
+
+The move is a local lookup whenever a single tile move_range steps along
+those paths exists. When several do, the tie is settled by replaying
+AStar.search() restricted to the shortest-path tiles: A* with a consistent
+heuristic expands nodes in (f, push order) order and gives each node the
+first expanded neighbour one step closer to the start as its parent, and
+neither depends on tiles off the shortest paths, so the replay picks the
+same path as the full search.
+
+Only the move is guaranteed to be A*'s. After a lookup the returned path is
+some shortest path through the move tile, which can take other tiles than
+A*'s path before and after it; the HUD preview (EnemyAgent.peek_path())
+draws A*'s own path, and both pass through the tile the enemy moves to.
+"""
+
+import heapq
+
+from environment.state import UNREACHABLE
+
+# Neighbour order of AStar.get_neighbors(), which decides its push order
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Pursuit:
+    """
+    Computes the A* chase move from the target's distance field.
+
+    Attributes:
+        move_range: Tiles the pursuer moves along its path per turn
+        lookups: Moves read directly from the distance field
+        replays: Moves that needed the shortest-path tie replay
+    """
+
+    def __init__(self, move_range: int = 2):
+        """
+        Initialize the engine.
+
+        Args:
+            move_range (int): Pursuer move range (EnemyAgent.move_range)
+        """
+        self.move_range = move_range
+        self.lookups = 0
+        self.replays = 0
+
+    def chase_move(self, static_map, start, goal):
+        """
+        Return where a pursuer at start ends its turn chasing goal.
+
+        Same result as AStar.chase_move() with this engine's move range.
+
+        Args:
+            static_map: StaticMap the units stand on
+            start: Pursuer position as (x, y) tuple
+            goal: Target position as (x, y) tuple
+
+        Returns:
+            tuple: (next_tile, path); next_tile is start when there is no
+            path or start is the goal. path runs from start to goal through
+            next_tile (at index min(move_range, length)) and is A*'s own path
+            whenever a tie was replayed, otherwise a shortest path that may
+            differ from A*'s away from next_tile; None if goal is
+            unreachable.
+        """
+        start, goal = tuple(start), tuple(goal)
+        width = static_map.width
+        height = static_map.height
+        dist = static_map.distances_from(*goal)
+
+        remaining = dist[start[1] * width + start[0]]
+        if remaining >= UNREACHABLE:
+            return start, None
+        if remaining == 0:
+            return start, [start]
+
+        # Tiles reachable in `steps` moves along some shortest path
+        steps = min(self.move_range, remaining)
+        layers = [[start]]
+        for step in range(1, steps + 1):
+            target = remaining - step
+            layer = []
+            for x, y in layers[-1]:
+                for dx, dy in DIRECTIONS:
+                    nx, ny = x + dx, y + dy
+                    if (
+                        0 <= nx < width
+                        and 0 <= ny < height
+                        and dist[ny * width + nx] == target
+                        and (nx, ny) not in layer
+                    ):
+                        layer.append((nx, ny))
+            layers.append(layer)
+
+        if len(layers[-1]) == 1:
+            self.lookups += 1
+            next_tile = layers[-1][0]
+            return next_tile, self._descend(static_map, dist, layers, next_tile, goal)
+
+        self.replays += 1
+        path = self._replay(static_map, dist, start, goal)
+        return path[steps], path
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _replay(static_map, dist, start, goal) -> list:
+        """Run AStar.search()'s expansion order over the shortest-path tiles
+        only and return the path it reconstructs."""
+        width = static_map.width
+        height = static_map.height
+        gx, gy = goal
+        remaining = dist[start[1] * width + start[0]]
+
+        parent = {start: None}
+        heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+        counter = 1
+        while heap:
+            _, _, tile = heapq.heappop(heap)
+            if tile == goal:
+                break
+
+            x, y = tile
+            closer = dist[y * width + x] - 1
+            g = remaining - closer
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbour = (nx, ny)
+                # The first expanded neighbour one step closer wins, later
+                # ones cannot improve g and push nothing, as in AStar
+                if dist[ny * width + nx] == closer and neighbour not in parent:
+                    parent[neighbour] = tile
+                    f = g + abs(nx - gx) + abs(ny - gy)
+                    heapq.heappush(heap, (f, counter, neighbour))
+                    counter += 1
+
+        path = []
+        tile = goal
+        while tile is not None:
+            path.append(tile)
+            tile = parent[tile]
+        return path[::-1]
+
+    @staticmethod
+    def _descend(static_map, dist, layers, next_tile, goal) -> list:
+        """Return a shortest path from the start through next_tile to goal,
+        following the distance field from the chosen layer onwards."""
+        width = static_map.width
+        height = static_map.height
+
+        # Walk back through the layers to the start
+        path = [next_tile]
+        for layer in reversed(layers[:-1]):
+            x, y = path[-1]
+            path.append(
+                next(
+                    (px, py)
+                    for px, py in layer
+                    if abs(px - x) + abs(py - y) == 1
+                )
+            )
+        path.reverse()
+
+        # Then downhill to the goal
+        x, y = next_tile
+        while (x, y) != goal:
+            closer = dist[y * width + x] - 1
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if (
+                    0 <= nx < width
+                    and 0 <= ny < height
+                    and dist[ny * width + nx] == closer
+                ):
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+        return path
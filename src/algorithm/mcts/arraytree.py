@@ -0,0 +1,329 @@
+"""Array-backed MCTS tree.
+
+Alternative to linked MCTSNode objects: every node is a row in a set of
+NumPy arrays (struct of arrays) and its game state is a compact record of
+unit positions, turn and trap bitboard instead of a full environment.
+Children of a node occupy one contiguous block, so UCB selection is a single
+vectorized expression over the block, and every walk over the tree is a
+loop over indices rather than a recursion.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from algorithm.mcts.mctsnode import (
+    UNPROVEN,
+    initial_proof,
+    passed_up,
+    solve_from_children,
+)
+from environment.environment import TacticalEnvironment
+from environment.state import DynamicState
+
+# State-record values of the terminal column
+NO_STATE = -1  # Slot allocated for an action that has not been expanded yet
+NON_TERMINAL = 0
+TERMINAL = 1
+
+
+class ArrayTree:
+    """
+    MCTS tree stored as parallel NumPy arrays.
+
+    Node 0 is the root. A node's children are allocated together the first
+    time selection reaches it; a child slot stays unexpanded (NO_STATE, zero
+    visits) until expansion plays its action and stores the resulting state.
+
+    Attributes:
+        static_map: StaticMap shared by every state in the tree
+        size: Number of allocated node slots
+        visits, wins: Visit count and summed reward per node
+        parent, first_child, num_children: Tree links (-1 for none;
+            first_child is -1 until the children block is allocated)
+        action: Flat tile index of the move leading to the node
+        player, enemy, turn, turn_counter, terminal: Compact state record
+        proven: MCTS-Solver result per node (see mctsnode)
+        trap_masks: Trap bitboard per node (Python ints, shared between a
+            parent and its children while no trap spawns)
+    """
+
+    # Column name -> dtype; every column is grown together
+    COLUMNS = {
+        "visits": np.int32,
+        "wins": np.float64,
+        "parent": np.int32,
+        "first_child": np.int32,
+        "num_children": np.int16,
+        "action": np.int32,
+        "player": np.int32,
+        "enemy": np.int32,
+        "turn": np.int8,
+        "turn_counter": np.int16,
+        "terminal": np.int8,
+        "proven": np.int8,
+    }
+
+    def __init__(self, state: TacticalEnvironment, capacity: int = 1024):
+        """
+        Create a tree whose root holds state.
+
+        Args:
+            state: Root TacticalEnvironment
+            capacity: Initial number of node slots (grows by half each time)
+        """
+        self.static_map = state.static_map
+        self.capacity = max(1, int(capacity))
+        self.size = 0
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        self.trap_masks = []
+
+        # Environment last built by select()/expand(), see take_state()
+        self._cached_node = -1
+        self._cached_env = None
+
+        root = self._allocate(1, parent=-1, actions=[-1])
+        self._store_state(root, state)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _allocate(self, count, parent, actions) -> int:
+        """Append count unexpanded slots and return the index of the first."""
+        if self.size + count > self.capacity:
+            self._grow(self.size + count)
+
+        start = self.size
+        end = start + count
+        self.parent[start:end] = parent
+        self.action[start:end] = actions
+        self.first_child[start:end] = -1
+        self.num_children[start:end] = 0
+        self.visits[start:end] = 0
+        self.wins[start:end] = 0.0
+        self.terminal[start:end] = NO_STATE
+        self.proven[start:end] = UNPROVEN
+        self.trap_masks.extend([0] * count)
+        self.size = end
+        return start
+
+    def _grow(self, needed):
+        """Reallocate every column with room for at least needed slots."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity += capacity // 2 + 1
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _store_state(self, node, env):
+        """Record env as the state of node."""
+        width = self.static_map.width
+        px, py = env.player_pos
+        ex, ey = env.enemy_pos
+        self.player[node] = py * width + px
+        self.enemy[node] = ey * width + ex
+        self.turn[node] = env.turn == "enemy"
+        self.turn_counter[node] = env.turn_counter
+        self.trap_masks[node] = env._trap_mask()
+        self.terminal[node] = TERMINAL if env.is_terminal()[0] else NON_TERMINAL
+        self.proven[node] = initial_proof(env)
+
+    def state(self, node) -> TacticalEnvironment:
+        """
+        Rebuild a standalone environment for an expanded node.
+
+        Args:
+            node (int): Node index
+
+        Returns:
+            TacticalEnvironment: New environment the caller may modify
+        """
+        static_map = self.static_map
+        width = static_map.width
+        player = int(self.player[node])
+        enemy = int(self.enemy[node])
+        mask = self.trap_masks[node]
+        dynamic = DynamicState(
+            player_pos=[player % width, player // width],
+            enemy_pos=[enemy % width, enemy // width],
+            traps=static_map.positions(mask),
+            turn="enemy" if self.turn[node] else "player",
+            turn_counter=int(self.turn_counter[node]),
+            trap_mask=mask,
+        )
+        return TacticalEnvironment._from_parts(static_map, dynamic)
+
+    def take_state(self, node) -> TacticalEnvironment:
+        """
+        Like state(), but hand over the environment the last select() or
+        expand() built for node instead of rebuilding it.
+
+        Args:
+            node (int): Node index
+
+        Returns:
+            TacticalEnvironment: Environment the caller now owns
+        """
+        if self._cached_node == node:
+            env = self._cached_env
+            self._cached_node, self._cached_env = -1, None
+            return env
+        return self.state(node)
+
+    # ------------------------------------------------------------------
+    # MCTS phases
+    # ------------------------------------------------------------------
+    def select(self, exploration_constant: float = 1.4, start: int = 0) -> int:
+        """
+        Descend by UCB1 over unproven children to a node that is proven,
+        childless or has an unexpanded child.
+
+        Args:
+            exploration_constant (float): UCB exploration weight
+            start (int): Node to descend from (a root policy's choice)
+
+        Returns:
+            int: Index of the selected node
+        """
+        node = start
+        while self.proven[node] == UNPROVEN:
+            first = int(self.first_child[node])
+            if first < 0:
+                first = self._allocate_children(node)
+
+            count = int(self.num_children[node])
+            if count == 0:
+                return node
+
+            visits = self.visits[first : first + count]
+            if not visits.all():
+                return node
+
+            wins = self.wins[first : first + count]
+            log_parent = math.log(int(self.visits[node]))
+            ucb = wins / visits + exploration_constant * np.sqrt(log_parent / visits)
+            ucb[self.proven[first : first + count] != UNPROVEN] = -np.inf
+            node = first + int(np.argmax(ucb))
+
+        return node
+
+    def _allocate_children(self, node) -> int:
+        """Allocate the children block of node, one slot per legal action."""
+        env = self.state(node)
+        actions = self.static_map.indices(env.legal_mask())
+        first = self._allocate(len(actions), parent=node, actions=actions)
+        self.first_child[node] = first
+        self.num_children[node] = len(actions)
+        self._cached_node, self._cached_env = node, env
+        return first
+
+    def expand(self, node) -> int:
+        """
+        Expand one random unexpanded child of node.
+
+        Args:
+            node (int): Node returned by select()
+
+        Returns:
+            int: The new child, or node itself if it is proven or has no
+            unexpanded children
+        """
+        if self.proven[node] != UNPROVEN:
+            return node
+
+        first = int(self.first_child[node])
+        count = int(self.num_children[node])
+        if first < 0 or count == 0:
+            return node
+
+        untried = np.flatnonzero(self.visits[first : first + count] == 0)
+        if not len(untried):
+            return node
+
+        child = first + int(random.choice(untried))
+
+        env = self.take_state(node)
+
+        width = self.static_map.width
+        tile = int(self.action[child])
+        env.step((tile % width, tile // width), simulate=True)
+        self._store_state(child, env)
+        self._cached_node, self._cached_env = child, env
+        return child
+
+    def backpropagate(self, node, reward: float):
+        """Add one visit and reward to node and all of its ancestors, and
+        propagate solver proofs."""
+        visits = self.visits
+        wins = self.wins
+        parent = self.parent
+        changed = self.proven[node] != UNPROVEN
+        while node >= 0:
+            visits[node] += 1
+            wins[node] += reward
+            node = int(parent[node])
+            changed = changed and node >= 0 and self._update_proof(node)
+
+    def _update_proof(self, node) -> bool:
+        """Re-derive node's solver result; return True if it became proven."""
+        if self.proven[node] != UNPROVEN:
+            return False
+        first = int(self.first_child[node])
+        count = int(self.num_children[node])
+        block = slice(first, first + count)
+        expanded = self.terminal[block] != NO_STATE
+        children = np.flatnonzero(expanded) + first
+        mover = "enemy" if self.turn[node] else "player"
+        proof = solve_from_children(
+            mover,
+            [
+                passed_up(
+                    int(self.proven[child]),
+                    mover,
+                    "enemy" if self.turn[child] else "player",
+                    int(self.turn_counter[child]),
+                )
+                for child in children
+            ],
+            bool(expanded.all()),
+        )
+        self.proven[node] = proof
+        return proof != UNPROVEN
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def root_statistics(self) -> dict:
+        """Map each expanded root child's (x, y) action to (visits, wins,
+        proven)."""
+        first = int(self.first_child[0])
+        if first < 0:
+            return {}
+
+        width = self.static_map.width
+        stats = {}
+        for child in range(first, first + int(self.num_children[0])):
+            visits = int(self.visits[child])
+            if visits:
+                tile = int(self.action[child])
+                stats[(tile % width, tile // width)] = (
+                    visits,
+                    float(self.wins[child]),
+                    int(self.proven[child]),
+                )
+        return stats
+
+    def node_count(self) -> int:
+        """Number of expanded nodes (allocated but unexpanded slots excluded)."""
+        return int(np.count_nonzero(self.terminal[: self.size] != NO_STATE))
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the node arrays and trap-mask list."""
+        arrays = sum(getattr(self, name).nbytes for name in self.COLUMNS)
+        return arrays + 8 * len(self.trap_masks)
@@ -1,122 +1,859 @@
 import numpy as np
 import random
 import math
-
-from algorithm.mcts.mctsnode import MCTSNode
+import time
+import multiprocessing
+from collections import OrderedDict
+from multiprocessing.pool import Pool
+
+from algorithm.mcts.arraytree import ArrayTree
+from algorithm.mcts.mctsnode import (
+    PROVEN_LOSS,
+    PROVEN_WIN,
+    UNPROVEN,
+    MCTSNode,
+    initial_proof,
+)
+from algorithm.mcts.rollout import BatchRollout
 from algorithm.astar.astar import AStar
+from environment.environment import TacticalEnvironment
 from utils.logger import Logger
 
+# Solver result names reported in the search meta
+SOLVER_RESULTS = {PROVEN_WIN: "win", PROVEN_LOSS: "loss", UNPROVEN: None}
+
+
+def _run_root_worker(args):
+    """Grow one independent tree in a worker process (root parallelism).
+
+    Args:
+        args: Tuple of (static_map, dynamic_state, iterations,
+            exploration_constant, max_sim_depth, time_budget_ms, tree_store,
+            rollouts_per_leaf, transposition_size, root_policy, max_nodes,
+            seed)
+
+    Returns:
+        tuple: ({action: (visits, total_wins, proven)} for the root children,
+        number of nodes in the tree, iteration/phase timing stats)
+    """
+    (
+        static_map,
+        dynamic,
+        iterations,
+        exploration_constant,
+        max_sim_depth,
+        time_budget_ms,
+        tree_store,
+        rollouts_per_leaf,
+        transposition_size,
+        root_policy,
+        max_nodes,
+        seed,
+    ) = args
+    random.seed(seed)
+
+    state = TacticalEnvironment._from_parts(static_map, dynamic)
+    mcts = MCTS(
+        iterations=iterations,
+        exploration_constant=exploration_constant,
+        max_sim_depth=max_sim_depth,
+        time_budget_ms=time_budget_ms,
+        tree_store=tree_store,
+        rollouts_per_leaf=rollouts_per_leaf,
+        transposition_size=transposition_size,
+        root_policy=root_policy,
+        max_nodes=max_nodes,
+    )
+    root = mcts._grow_tree(state, deadline=mcts._deadline_from_now())
+    return MCTS._root_statistics(root), MCTS._count_nodes(root), mcts._run_stats
+
 
 class MCTS:
-    """Monte Carlo Tree Search algorithm implementation."""
+    """Monte Carlo Tree Search algorithm implementation.
+
+    With workers > 1 the search is root-parallel: every worker process grows
+    its own tree of `iterations` iterations from a copy of the root state, and
+    the root children's visits and wins are summed before picking the move.
+    The workers run on `pool` when the caller passes one (the caller then
+    owns it), otherwise on a pool the search starts on first use and shuts
+    down in close(). Daemon processes such as Pool workers cannot start a
+    pool of their own, so asking for workers there without a pool raises.
+
+    With reuse_tree (sequential mode only) the tree is kept on the instance
+    between calls. The next search re-roots onto the descendant whose state
+    matches the new root, usually the grandchild reached by the player's move
+    and the enemy's reply, and continues from its statistics.
+
+    With time_budget_ms the search is anytime: it iterates until the deadline
+    instead of for a fixed number of iterations. Either way the meta dict
+    reports the iterations run and the time spent in each MCTS phase.
+
+    The search is an MCTS-Solver: states where the side to move can end the
+    game at once are proven on creation, proofs are propagated to parents as
+    children get proven, proven nodes are never selected again and the
+    search stops as soon as the root is proven. Proofs are not propagated
+    across the enemy moves that spawn a random trap (see passed_up()).
+
+    tree_store selects the tree representation: "nodes" links MCTSNode
+    objects that each hold an environment; "array" uses ArrayTree, which
+    keeps node statistics in NumPy arrays and states as compact records.
+    Tree reuse between calls is only available with "nodes".
+
+    With rollouts_per_leaf > 1 each leaf is evaluated by that many rollouts
+    played in lockstep by BatchRollout, and the mean reward is backed up.
+
+    With the "nodes" store the tree is a DAG: expansion looks the new state
+    up by Zobrist hash in a transposition table of at most transposition_size
+    nodes (least recently used evicted first), and a state already in the
+    table is linked as a child instead of getting a second node, so both
+    move orders share its statistics. Rewards are backed up along the path
+    selection took. transposition_size=0 grows a plain tree.
+
+    root_policy selects how iterations are spread over the root moves: "ucb"
+    applies UCB1 at the root like everywhere else; "halving" runs Sequential
+    Halving at the root (see _halving_schedule()) with UCB1 below it, which
+    concentrates a small iteration budget on the moves that matter.
+
+    max_nodes / max_tree_bytes cap the "nodes" tree (bytes are converted to
+    nodes with the NODE_BYTES estimate). When an expansion exceeds the cap,
+    the least-visited subtrees are cut until PRUNE_TO of the budget is left
+    (see _prune()); their actions become untried again and the node objects
+    go to a free list that later expansions recycle.
+    """
+
+    TREE_STORES = ("nodes", "array")
+    ROOT_POLICIES = ("ucb", "halving")
+
+    # Phases timed for the search meta
+    PHASES = ("selection", "expansion", "simulation", "backprop")
+
+    # Approximate bytes per MCTSNode with its environment clone and action
+    # list (see the memory benchmark in scoring/perf_benchmark.py)
+    NODE_BYTES = 1400
+
+    # Share of the node budget kept when the tree is pruned
+    PRUNE_TO = 0.75
+
+    def __init__(
+        self,
+        iterations=2000,
+        exploration_constant=1.4,
+        max_sim_depth=500,
+        workers=1,
+        reuse_tree=True,
+        time_budget_ms=None,
+        tree_store="nodes",
+        rollouts_per_leaf=1,
+        transposition_size=1 << 16,
+        root_policy="ucb",
+        max_nodes=None,
+        max_tree_bytes=None,
+        pool=None,
+    ):
+        if tree_store not in self.TREE_STORES:
+            raise ValueError(f"Unknown MCTS tree store: {tree_store!r}")
+        if root_policy not in self.ROOT_POLICIES:
+            raise ValueError(f"Unknown MCTS root policy: {root_policy!r}")
 
-    def __init__(self, iterations=2000, exploration_constant=1.4, max_sim_depth=500):
         self.iterations = iterations
         self.exploration_constant = exploration_constant
         self.max_sim_depth = max_sim_depth
+        self.workers = max(1, int(workers or 1))
+        daemon = multiprocessing.current_process().daemon
+        if self.workers > 1 and pool is None and daemon:
+            raise RuntimeError(
+                f"Root-parallel MCTS with {self.workers} workers cannot start "
+                "a process pool inside a daemon process; pass pool= or use "
+                "workers=1"
+            )
+        self.reuse_tree = reuse_tree
+        self.time_budget_ms = time_budget_ms
+        self.tree_store = tree_store
+        self.root_policy = root_policy
+        self.rollouts_per_leaf = max(1, int(rollouts_per_leaf))
+        self.transposition_size = max(0, int(transposition_size or 0))
+        self._transpositions = OrderedDict()
+        self._merged = 0
+        self._path = []
+
+        caps = [int(max_nodes)] if max_nodes else []
+        if max_tree_bytes:
+            caps.append(int(max_tree_bytes) // self.NODE_BYTES)
+        # The root, its children and a selection path must always fit
+        self.max_nodes = max(64, min(caps)) if caps else None
+        self._node_count = 0
+        self._pruned = 0
+        self._free_nodes = []
+        self._rollout_engine = None
         self.log = Logger("MCTS")
+        self._run_stats = self._empty_run_stats()
+        self._pool = pool
+        self._owns_pool = pool is None
+        self._root = None
 
     def search(self, node):
-        """Execute MCTS search algorithm."""
-        root_state = MCTSNode(state=node).state
-        valid_actions = list(root_state.get_valid_actions(unit="current"))
-
-        for action in valid_actions:
-            temp_state = root_state.clone()
-            temp_state.step(action, simulate=True)
-            if tuple(temp_state.player_pos) == temp_state.goal:
-                self.log.info(f"Instant Win found at {action}!")
-                return action
-
-        root = MCTSNode(state=node)
-
-        for _ in range(self.iterations):
-            selected = self.selection(root)
-            expanded = self.expansion(selected)
-            reward = self.simulation(expanded)
-            self.backpropagation(expanded, reward)
-
-        if not root.children:
+        """Execute MCTS search algorithm.
+
+        Returns:
+            tuple: (action, meta). Besides the statistics below, meta has the
+            timing fields of _timing_meta() when a tree was searched.
+                * nodes_visited (int): Nodes in the searched tree(s)
+                * win_probability (float): Mean reward of the chosen move,
+                  1.0 / 0.0 when the solver proved it won / lost
+                * solver_result (str or None): "win" or "loss" if the chosen
+                  move is proven
+                * reused_visits (int): Visits inherited from the kept tree
+                * transpositions (int): Expansions that reached a state
+                  already in the tree and were merged into its node
+                * pruned_nodes (int): Nodes cut to stay within max_nodes
+                * tree_bytes (int): Estimated memory held by the tree(s)
+        """
+        deadline = self._deadline_from_now()
+        valid_actions = list(node.get_valid_actions(unit="current"))
+
+        if initial_proof(node) == PROVEN_WIN:
+            self.log.info(f"Proven win: goal {node.goal} is in reach")
+            return node.goal, self._result_meta(0, 1.0, PROVEN_WIN)
+
+        reused_visits = 0
+        if self._use_pool():
+            stats, nodes = self._search_parallel(node)
+            run_stats = self._run_stats
+        else:
+            reuse = self.reuse_tree and self.tree_store == "nodes"
+            root = self._reroot(node) if reuse else None
+            if root is not None:
+                reused_visits = root.visits
+            root = self._grow_tree(node, root, deadline)
+            run_stats = self._run_stats
+            if reuse:
+                self._root = root
+            stats, nodes = self._root_statistics(root), self._count_nodes(root)
+
+        if not stats:
             chosen = random.choice(valid_actions)
             return chosen, {"nodes_visited": 0, "win_probability": 0.0}
 
-        best_child = max(root.children, key=lambda child: child.visits)
-        mcts_action = best_child.action
-
-        win_rate = (
-            best_child.total_wins / best_child.visits if best_child.visits > 0 else 0.0
+        mcts_action, (visits, total_wins, proven) = self._choose_root_action(
+            stats, valid_actions
         )
+
+        if proven == PROVEN_WIN:
+            win_rate = 1.0
+        elif proven == PROVEN_LOSS:
+            win_rate = 0.0
+            self.log.warning("Every move is a proven loss. Accepting fate.")
+        else:
+            win_rate = total_wins / visits if visits > 0 else 0.0
         self.log.info(
-            f"MCTS suggests: {mcts_action}, visits: {best_child.visits}, win_rate: {win_rate:.2f}"
+            f"MCTS suggests: {mcts_action}, visits: {visits}, win_rate: {win_rate:.2f}"
         )
 
-        # Count expanded nodes for reporting
-        def count_nodes(n):
-            total = 1
-            for c in n.children:
-                total += count_nodes(c)
-            return total
-
-        nodes = count_nodes(root)
-
-        enemy_pos = tuple(root_state.enemy_pos)
-
-        dist_to_enemy = abs(mcts_action[0] - enemy_pos[0]) + abs(
-            mcts_action[1] - enemy_pos[1]
+        meta = self._result_meta(nodes, win_rate, proven)
+        meta["reused_visits"] = reused_visits
+        meta["transpositions"] = run_stats["transpositions"]
+        meta["pruned_nodes"] = run_stats["pruned_nodes"]
+        meta["tree_bytes"] = run_stats["tree_bytes"]
+        meta.update(self._timing_meta(run_stats))
+        return mcts_action, meta
+
+    @staticmethod
+    def _choose_root_action(stats: dict, valid_actions) -> tuple:
+        """
+        Pick the move to play from the root statistics.
+
+        A proven win is played at once. Otherwise the most visited move not
+        proven lost is chosen (the better mean reward among equally visited
+        ones); an unexpanded move is preferred over proven
+        losses, and only if every move is lost is the most visited one taken.
+
+        Args:
+            stats: {action: (visits, total_wins, proven)} of the root children
+            valid_actions: Legal root moves
+
+        Returns:
+            tuple: (action, (visits, total_wins, proven))
+        """
+        # Equal visits are broken by mean reward; Sequential Halving gives
+        # the two finalists the same visits and this picks the winner
+        by_visits = sorted(
+            stats.items(),
+            key=lambda item: (item[1][0], item[1][1] / item[1][0] if item[1][0] else 0.0),
+            reverse=True,
         )
-        if dist_to_enemy <= 2:
-            self.log.warning(
-                f"DANGER! MCTS chose a suicide move {mcts_action} (Dist {dist_to_enemy}). Overriding..."
-            )
 
-            best_safe_action = None
-            max_dist = -1
-
-            for action in valid_actions:
-                manhattan_dist = abs(action[0] - enemy_pos[0]) + abs(
-                    action[1] - enemy_pos[1]
-                )
-                if manhattan_dist > 2:
-                    if manhattan_dist > max_dist:
-                        max_dist = manhattan_dist
-                        best_safe_action = action
-
-            if best_safe_action:
-                self.log.info(
-                    f"Safety Override: Switched to {best_safe_action} (Dist {max_dist})"
-                )
-                return best_safe_action
+        for action, entry in by_visits:
+            if entry[2] == PROVEN_WIN:
+                return action, entry
+        for action, entry in by_visits:
+            if entry[2] != PROVEN_LOSS:
+                return action, entry
+
+        untried = [action for action in valid_actions if action not in stats]
+        if untried:
+            return random.choice(untried), (0, 0.0, UNPROVEN)
+        return by_visits[0]
+
+    @staticmethod
+    def _result_meta(nodes: int, win_probability: float, proven: int) -> dict:
+        """Build the common part of the search meta."""
+        return {
+            "nodes_visited": nodes,
+            "win_probability": float(win_probability),
+            "solver_result": SOLVER_RESULTS[proven],
+        }
+
+    def _grow_tree(self, state, root=None, deadline=None):
+        """Run iterations from the root and return it.
+
+        Runs self.iterations iterations, or until deadline when one is given.
+        Iteration count, per-phase times, merged transpositions, pruned nodes
+        and the tree's memory estimate are left in self._run_stats.
+
+        Args:
+            state: Root TacticalEnvironment, used when root is None
+            root: Existing (re-rooted) tree to continue searching
+            deadline (float): time.perf_counter() value to stop at, or None
+
+        Returns:
+            MCTSNode or ArrayTree: Root of the grown tree
+        """
+        if root is None:
+            if self.tree_store == "array":
+                root = ArrayTree(state)
             else:
-                self.log.warning("No safe moves available. Accepting fate.")
+                root = self._new_node(state)
+                self._transpositions.clear()
+                self._remember(root)
+                self._node_count = 1
+
+        if isinstance(root, ArrayTree):
+            tree = root
+
+            def solved():
+                return tree.proven[0] != UNPROVEN
+
+            def select(_):
+                return tree.select(self.exploration_constant)
+
+            def descend(arm):
+                return tree.select(self.exploration_constant, start=arm)
+
+            def simulate(node):
+                proven = int(tree.proven[node])
+                if proven != UNPROVEN:
+                    return self._proven_reward(proven)
+                return self._rollout(tree.take_state(node))
+
+            expand = tree.expand
+            backpropagate = tree.backpropagate
+        else:
+
+            def solved():
+                return root.proven != UNPROVEN
+
+            def descend(arm):
+                return self.selection(arm, path=[root])
+
+            select = self.selection
+            expand = self.expansion
+            simulate = self.simulation
+            backpropagate = self.backpropagation
+
+        if self.root_policy == "halving":
+            schedule = self._halving_schedule(root)
+            select_from_root = select
+
+            def select(node):
+                arm = next(schedule, None)
+                return select_from_root(node) if arm is None else descend(arm)
+
+        self._merged = 0
+        self._pruned = 0
+        clock = time.perf_counter
+        selection_time = expansion_time = simulation_time = backprop_time = 0.0
+        iterations = 0
+        start = clock()
+
+        while not solved():
+            if deadline is None:
+                if iterations >= self.iterations:
+                    break
+            elif iterations and start >= deadline:
+                # At least one iteration always runs so there is a move
+                break
+
+            t0 = clock()
+            selected = select(root)
+            t1 = clock()
+            expanded = expand(selected)
+            t2 = clock()
+            reward = simulate(expanded)
+            t3 = clock()
+            backpropagate(expanded, reward)
+            start = clock()
+
+            selection_time += t1 - t0
+            expansion_time += t2 - t1
+            simulation_time += t3 - t2
+            backprop_time += start - t3
+            iterations += 1
+
+        self._run_stats = {
+            "iterations": iterations,
+            "selection": selection_time,
+            "expansion": expansion_time,
+            "simulation": simulation_time,
+            "backprop": backprop_time,
+            "transpositions": self._merged,
+            "pruned_nodes": self._pruned,
+            "tree_bytes": self._tree_bytes(root),
+        }
+        return root
+
+    # ------------------------------------------------------------------
+    # Sequential Halving at the root
+    # ------------------------------------------------------------------
+    def _halving_schedule(self, root):
+        """Yield the root child each iteration should start its descent from.
+
+        Until every root move has been tried, None is yielded (select from
+        the root as usual, which expands the next move). The remaining
+        iteration budget is then split over ceil(log2(K)) rounds for K
+        moves: each round gives every surviving move the same number of
+        descents, then keeps the better half by mean reward and drops moves
+        proven lost. Once one move is left the generator ends, so any further
+        iterations (time-budgeted search) select by UCB1 from the root.
+
+        Args:
+            root: MCTSNode or ArrayTree being grown
+
+        Yields:
+            MCTSNode, int or None: Root child (node or ArrayTree index)
+        """
+        spent = 0
+        while not self._root_expanded(root):
+            spent += 1
+            yield None
+
+        stats = self._root_arms(root)
+        survivors = [arm for arm, (_, _, proven) in stats.items() if proven == UNPROVEN]
+        rounds = math.ceil(math.log2(len(survivors))) if len(survivors) > 1 else 0
+
+        for round_index in range(rounds):
+            remaining = max(0, self.iterations - spent)
+            per_arm = max(1, remaining // ((rounds - round_index) * len(survivors)))
+            for arm in survivors:
+                for _ in range(per_arm):
+                    spent += 1
+                    yield arm
+
+            stats = self._root_arms(root)
+            keep = math.ceil(len(survivors) / 2)
+            survivors = sorted(
+                (arm for arm in survivors if stats[arm][2] != PROVEN_LOSS),
+                key=lambda arm: stats[arm][1] / stats[arm][0],
+                reverse=True,
+            )[:keep]
+            if len(survivors) <= 1:
+                break
+
+    @staticmethod
+    def _root_expanded(root) -> bool:
+        """Return True once every root move has a visited child."""
+        if isinstance(root, ArrayTree):
+            first = int(root.first_child[0])
+            count = int(root.num_children[0])
+            return first >= 0 and bool(root.visits[first : first + count].all())
+        return root.is_fully_expanded()
+
+    @staticmethod
+    def _root_arms(root) -> dict:
+        """Map each root child (node or ArrayTree index) to its (visits,
+        total_wins, proven)."""
+        if isinstance(root, ArrayTree):
+            first = int(root.first_child[0])
+            return {
+                child: (
+                    int(root.visits[child]),
+                    float(root.wins[child]),
+                    int(root.proven[child]),
+                )
+                for child in range(first, first + int(root.num_children[0]))
+            }
+        return {
+            child: (child.visits, child.total_wins, child.proven)
+            for child in root.children
+        }
+
+    # ------------------------------------------------------------------
+    # Time budget and timing statistics
+    # ------------------------------------------------------------------
+    def _deadline_from_now(self):
+        """Return the perf_counter() deadline for a search starting now."""
+        if self.time_budget_ms is None:
+            return None
+        return time.perf_counter() + self.time_budget_ms / 1000.0
+
+    @classmethod
+    def _empty_run_stats(cls) -> dict:
+        """Run statistics of a search that did nothing."""
+        stats = {"iterations": 0, "transpositions": 0, "pruned_nodes": 0, "tree_bytes": 0}
+        stats.update((phase, 0.0) for phase in cls.PHASES)
+        return stats
+
+    @classmethod
+    def _timing_meta(cls, run_stats: dict) -> dict:
+        """Convert run statistics into the timing fields of the search meta.
+
+        Args:
+            run_stats: Iterations and per-phase seconds (summed over workers
+                in root-parallel mode)
+
+        Returns:
+            dict: iterations, iterations_per_second and <phase>_time (seconds)
+        """
+        busy = sum(run_stats[phase] for phase in cls.PHASES)
+        meta = {
+            "iterations": run_stats["iterations"],
+            "iterations_per_second": run_stats["iterations"] / busy if busy else 0.0,
+        }
+        for phase in cls.PHASES:
+            meta[f"{phase}_time"] = run_stats[phase]
+        return meta
+
+    # ------------------------------------------------------------------
+    # Memory cap
+    # ------------------------------------------------------------------
+    def _new_node(self, state, parent=None, action=None) -> MCTSNode:
+        """Create a node, recycling a pruned one when the free list has any."""
+        if self._free_nodes:
+            node = self._free_nodes.pop()
+            node.reset(state, parent, action)
+            return node
+        return MCTSNode(state, parent=parent, action=action)
+
+    def _tree_bytes(self, root) -> int:
+        """Estimated memory held by the tree under root."""
+        if isinstance(root, ArrayTree):
+            return root.nbytes()
+        return self._node_count * self.NODE_BYTES
+
+    def _prune(self, root):
+        """Cut the least-visited subtrees until PRUNE_TO of max_nodes is left.
+
+        Nodes are detached in order of increasing visits, so leaves go before
+        the nodes above them. The root, its children (whose statistics pick
+        the move) and the current selection path are never cut. A detached
+        node's action becomes untried again at every parent linking it; nodes
+        no longer reachable from the root are released to the free list and
+        dropped from the transposition table.
+
+        Args:
+            root: Root of the tree being grown
+        """
+        # Collect every node and, for shared nodes, all parents linking it
+        nodes = {id(root): root}
+        parents = {id(root): []}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                key = id(child)
+                if key in nodes:
+                    parents[key].append(node)
+                else:
+                    nodes[key] = child
+                    parents[key] = [node]
+                    stack.append(child)
+
+        protected = {id(node) for node in self._path}
+        protected.add(id(root))
+        protected.update(id(child) for child in root.children)
+        victims = sorted(
+            (node for key, node in nodes.items() if key not in protected),
+            key=lambda node: node.visits,
+        )
 
-        return mcts_action, {"nodes_visited": nodes, "win_probability": float(win_rate)}
+        excess = len(nodes) - int(self.max_nodes * self.PRUNE_TO)
+        for victim in victims[: max(0, excess)]:
+            for parent in parents[id(victim)]:
+                parent.children.remove(victim)
+                parent.untried_actions.append(victim.action)
+
+        # Anything the root can no longer reach is freed
+        reachable = {id(root)}
+        stack = [root]
+        while stack:
+            for child in stack.pop().children:
+                if id(child) not in reachable:
+                    reachable.add(id(child))
+                    stack.append(child)
+
+        table = self._transpositions
+        for key, node in nodes.items():
+            if key in reachable:
+                if node.parent is not None and id(node.parent) not in reachable:
+                    # Re-point the creating parent at one that survived
+                    node.parent = next(
+                        p for p in parents[key] if id(p) in reachable
+                    )
+            else:
+                state_key = node.state.zobrist_key
+                if table.get(state_key) is node:
+                    del table[state_key]
+                node.release()
+                self._free_nodes.append(node)
+
+        self._pruned += len(nodes) - len(reachable)
+        self._node_count = len(reachable)
+
+    # ------------------------------------------------------------------
+    # Tree reuse
+    # ------------------------------------------------------------------
+    REROOT_DEPTH = 2
+
+    def _reroot(self, state):
+        """Find the kept node whose state equals state and make it the root.
+
+        Looks at most REROOT_DEPTH plies below the previous root, matching on
+        the Zobrist hash (positions, traps, turn and trap-spawn phase).
+
+        Args:
+            state: New root TacticalEnvironment
+
+        Returns:
+            MCTSNode or None: The detached subtree, or None if nothing matches
+        """
+        old_root, self._root = self._root, None
+        if old_root is None or old_root.state.static_map is not state.static_map:
+            return None
+
+        key = state.zobrist_key
+        frontier = [old_root]
+        for _ in range(self.REROOT_DEPTH + 1):
+            for candidate in frontier:
+                if candidate.state.zobrist_key == key:
+                    candidate.parent = None
+                    candidate.action = None
+                    self.log.info(f"Reusing subtree with {candidate.visits} visits")
+                    self._reindex(candidate)
+                    return candidate
+            frontier = [child for n in frontier for child in n.children]
+
+        return None
+
+    def _reindex(self, root):
+        """Rebuild the transposition table from the subtree under root.
+
+        Parent links are reset breadth-first to point inside the subtree, so
+        a shared node does not keep a discarded part of the old tree alive.
+        """
+        self._transpositions.clear()
+        self._remember(root)
+        seen = {id(root)}
+        queue = [root]
+        for node in queue:
+            for child in node.children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    child.parent = node
+                    self._remember(child)
+                    queue.append(child)
+        self._node_count = len(queue)
+
+    def reset_tree(self):
+        """Discard the kept tree, e.g. when a new episode starts."""
+        self._root = None
+        self._transpositions.clear()
+        self._free_nodes = []
+
+    # ------------------------------------------------------------------
+    # Transposition table
+    # ------------------------------------------------------------------
+    def _remember(self, node: MCTSNode):
+        """Add node to the transposition table, evicting the least recently
+        used entry when the table is full."""
+        if not self.transposition_size:
+            return
+        table = self._transpositions
+        table[node.state.zobrist_key] = node
+        table.move_to_end(node.state.zobrist_key)
+        if len(table) > self.transposition_size:
+            table.popitem(last=False)
+
+    def _transposition(self, state) -> "MCTSNode | None":
+        """Return the node already holding state, if the table has one."""
+        if not self.transposition_size:
+            return None
+        key = state.zobrist_key
+        node = self._transpositions.get(key)
+        if node is not None:
+            self._transpositions.move_to_end(key)
+        return node
 
-    def selection(self, node: MCTSNode) -> MCTSNode:
-        """Select phase of MCTS."""
-        while not node.is_terminal():
+    @staticmethod
+    def _root_statistics(root) -> dict:
+        """Map each root child's action to its (visits, total_wins, proven)."""
+        if isinstance(root, ArrayTree):
+            return root.root_statistics()
+        return {
+            child.action: (child.visits, child.total_wins, child.proven)
+            for child in root.children
+        }
+
+    @staticmethod
+    def _count_nodes(root) -> int:
+        """Count expanded nodes for reporting, without recursion. Nodes shared
+        by several parents are counted once."""
+        if isinstance(root, ArrayTree):
+            return root.node_count()
+        seen = {id(root)}
+        stack = [root]
+        while stack:
+            for child in stack.pop().children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
+
+    # ------------------------------------------------------------------
+    # Root parallelism
+    # ------------------------------------------------------------------
+    def _use_pool(self) -> bool:
+        """Return True if this search should fan out to worker processes."""
+        return self.workers > 1
+
+    def _search_parallel(self, state):
+        """Grow one tree per worker and merge their root statistics.
+
+        Args:
+            state: Root TacticalEnvironment
+
+        Returns:
+            tuple: (merged {action: (visits, total_wins, proven)}, total nodes)
+        """
+        if self._pool is None:
+            self._pool = Pool(processes=self.workers)
+
+        jobs = [
+            (
+                state.static_map,
+                state.dynamic.copy(),
+                self.iterations,
+                self.exploration_constant,
+                self.max_sim_depth,
+                self.time_budget_ms,
+                self.tree_store,
+                self.rollouts_per_leaf,
+                self.transposition_size,
+                self.root_policy,
+                self.max_nodes,
+                random.getrandbits(32),
+            )
+            for _ in range(self.workers)
+        ]
+
+        merged = {}
+        nodes = 0
+        run_stats = self._empty_run_stats()
+        for stats, tree_nodes, worker_stats in self._pool.map(_run_root_worker, jobs):
+            nodes += tree_nodes
+            for key, value in worker_stats.items():
+                run_stats[key] += value
+            for action, (visits, wins, proven) in stats.items():
+                total_visits, total_wins, merged_proof = merged.get(
+                    action, (0, 0.0, UNPROVEN)
+                )
+                # A win proven by any tree stands; otherwise keep any loss
+                if merged_proof != PROVEN_WIN and proven != UNPROVEN:
+                    merged_proof = proven
+                merged[action] = (total_visits + visits, total_wins + wins, merged_proof)
+
+        self._run_stats = run_stats
+        return merged, nodes
+
+    def close(self):
+        """Shut down the worker pool, if this search started one."""
+        if self._owns_pool and self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    # ------------------------------------------------------------------
+    # MCTS phases
+    # ------------------------------------------------------------------
+    def selection(self, node: MCTSNode, path=None) -> MCTSNode:
+        """Select phase of MCTS. The nodes passed are kept in self._path.
+
+        Args:
+            node: Node to descend from
+            path: Nodes above node already chosen by a root policy
+        """
+        path = self._path = [node] if path is None else path + [node]
+        while node.proven == UNPROVEN:
             if not node.children:
                 return node
             if not node.is_fully_expanded():
                 return node
-            node = node.best_child(exploration_constant=self.exploration_constant)
+            child = node.best_child(exploration_constant=self.exploration_constant)
+            if child is None:
+                # Every child was proven through another parent
+                node.update_proof()
+                return node
+            if child in path:
+                # A transposition leads back onto the path; stop at the cycle
+                return node
+            node = child
+            path.append(node)
         return node
 
     def expansion(self, node: MCTSNode) -> MCTSNode:
         """Expansion phase of MCTS."""
-        if node.is_terminal() or not node.untried_actions:
+        if node.proven != UNPROVEN or not node.untried_actions:
             return node
 
         action = random.choice(node.untried_actions)
         new_state = node.state.clone()
         new_state.step(action, simulate=True)
 
-        child = MCTSNode(new_state, parent=node, action=action)
+        # A move leads to the tile it names, so a node found in the table was
+        # reached by the same action and can be linked as it is
+        child = self._transposition(new_state)
+        if child is None:
+            child = self._new_node(new_state, parent=node, action=action)
+            self._remember(child)
+            self._node_count += 1
+        else:
+            self._merged += 1
         node.add_child(child)
+
+        if child in self._path:
+            return node
+        self._path.append(child)
+
+        if self.max_nodes and self._node_count > self.max_nodes:
+            # Selection paths start at the root of the tree being grown
+            self._prune(self._path[0])
         return child
 
     def simulation(self, node: MCTSNode) -> float:
         """Simulation phase of MCTS."""
-        state = node.state.clone()
+        if node.proven != UNPROVEN:
+            return self._proven_reward(node.proven)
+        return self._rollout(node.state.clone())
+
+    @staticmethod
+    def _proven_reward(proven: int) -> float:
+        """Normalized reward of a proven node, as a terminal rollout scores it."""
+        return MCTSNode._normalize_score(1.0 if proven == PROVEN_WIN else 0.0)
+
+    def _rollout(self, state) -> float:
+        """Play out state (modified in place) and return the normalized reward."""
+        if self.rollouts_per_leaf > 1:
+            engine = self._batch_engine(state)
+            rewards = engine.run(state, self.rollouts_per_leaf, self.max_sim_depth)
+            return float(rewards.mean())
 
         is_term, reason = state.is_terminal()
         if is_term:
@@ -133,9 +870,10 @@ class MCTS:
                 action = random.choice(legal)
                 if random.random() < 0.7:
                     best_dist = float("inf")
-                    goal = state.goal
+                    goal_dist = state.static_map.goal_distances
+                    width = state.width
                     for act in legal:
-                        dist = abs(act[0] - goal[0]) + abs(act[1] - goal[1])
+                        dist = goal_dist[act[1] * width + act[0]]
                         if dist < best_dist:
                             best_dist = dist
                             action = act
@@ -154,6 +892,13 @@ class MCTS:
         reward = self.rollout_reward(state, reason=None)
         return MCTSNode._normalize_score(reward)
 
+    def _batch_engine(self, state) -> BatchRollout:
+        """Return the batched rollout engine for state's map, building it once."""
+        engine = self._rollout_engine
+        if engine is None or engine.static_map is not state.static_map:
+            engine = self._rollout_engine = BatchRollout(state.static_map)
+        return engine
+
     def fast_enemy_policy(self, state):
         """Fast enemy policy for simulation."""
         enemy_pos = tuple(state.enemy_pos)
@@ -164,7 +909,10 @@ class MCTS:
         if player_pos in legal_moves:
             return player_pos
 
-        legal_moves.sort(key=lambda m: abs(m[0] - player_pos[0]) + abs(m[1] - player_pos[1]))
+        # Step counts to the player, read from its cached distance field
+        player_dist = state.static_map.distances_from(*player_pos)
+        width = state.width
+        legal_moves.sort(key=lambda m: player_dist[m[1] * width + m[0]])
 
         return legal_moves[0] if legal_moves else enemy_pos
 
@@ -177,16 +925,14 @@ class MCTS:
 
         player_pos = tuple(state.player_pos)
         enemy_pos = tuple(state.enemy_pos)
-        goal_pos = state.goal
 
-        dist_goal = abs(player_pos[0] - goal_pos[0]) + abs(player_pos[1] - goal_pos[1])
+        static_map = state.static_map
         max_dist = state.width + state.height
+        dist_goal = min(static_map.goal_distance(*player_pos), max_dist)
 
         score = 0.1 + 0.7 * (1.0 - (dist_goal / max_dist))
 
-        dist_enemy = abs(player_pos[0] - enemy_pos[0]) + abs(
-            player_pos[1] - enemy_pos[1]
-        )
+        dist_enemy = static_map.distance(enemy_pos, player_pos)
 
         if dist_enemy <= 2:
             return 0.0
@@ -196,8 +942,24 @@ class MCTS:
         return max(0.0, min(0.9, score))
 
     def backpropagation(self, node: MCTSNode, reward: float):
-        """Backpropagation phase of MCTS."""
-        while node is not None:
+        """Backpropagation phase of MCTS, including solver proofs.
+
+        Follows the path selection and expansion took to node; without one
+        (node was not reached by selection) it follows the parent links.
+        """
+        path = self._path
+        if not path or path[-1] is not node:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = node.parent
+            path.reverse()
+
+        # Proofs only need re-deriving above a node that was just proven
+        changed = path[-1].proven != UNPROVEN
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
             node.visits += 1
             node.total_wins += reward
-            node = node.parent
+            changed = changed and index > 0 and path[index - 1].update_proof()
+        self._path = []
@@ -2,6 +2,89 @@ import math
 import random
 from environment.environment import TacticalEnvironment
 
+# MCTS-Solver results, from the player's point of view
+UNPROVEN = 0
+PROVEN_WIN = 1
+PROVEN_LOSS = -1
+
+
+def initial_proof(state: TacticalEnvironment) -> int:
+    """
+    Solver result of a state known without searching below it.
+
+    Terminal states are proven by their outcome. A non-terminal state is
+    also proven when the side to move can end the game at once: the player
+    by reaching the goal (win), the enemy by reaching the player (loss).
+
+    Args:
+        state: State to classify
+
+    Returns:
+        int: PROVEN_WIN, PROVEN_LOSS or UNPROVEN
+    """
+    terminal, reason = state.is_terminal()
+    if terminal:
+        return PROVEN_WIN if reason == "goal" else PROVEN_LOSS
+
+    static_map = state.static_map
+    if state.turn == "player":
+        if state.legal_mask("player") & static_map.goal_mask:
+            return PROVEN_WIN
+    elif state.legal_mask("enemy") & static_map.bit(*state.player_pos):
+        return PROVEN_LOSS
+    return UNPROVEN
+
+
+def passed_up(proof: int, mover: str, turn: str, turn_counter: int) -> int:
+    """
+    Solver result a child contributes to its parent's proof.
+
+    Every third enemy move spawns a trap on a random tile, so a child
+    reached by that move holds one sampled trap position and another visit
+    could have drawn a different one. Its proof holds for its own state but
+    is not passed up; every other transition is deterministic. A move that
+    ends the game spawns nothing and leaves its side to move.
+
+    Args:
+        proof (int): The child's solver result
+        mover (str): Side to move at the parent
+        turn (str): Side to move in the child's state
+        turn_counter (int): Completed rounds in the child's state
+
+    Returns:
+        int: proof, or UNPROVEN for a child behind a trap spawn
+    """
+    if mover == "enemy" and turn == "player" and turn_counter % 3 == 0:
+        return UNPROVEN
+    return proof
+
+
+def solve_from_children(mover: str, proofs, fully_expanded: bool) -> int:
+    """
+    Combine child solver results into the result of their parent.
+
+    The side to move picks a child proven good for it if there is one; the
+    parent is proven bad for that side only once every move is expanded and
+    proven bad.
+
+    Args:
+        mover (str): "player" or "enemy", the side to move at the parent
+        proofs: Solver results of the expanded children
+        fully_expanded (bool): Whether every legal move has a child
+
+    Returns:
+        int: PROVEN_WIN, PROVEN_LOSS or UNPROVEN
+    """
+    good, bad = (
+        (PROVEN_WIN, PROVEN_LOSS) if mover == "player" else (PROVEN_LOSS, PROVEN_WIN)
+    )
+    proofs = list(proofs)
+    if good in proofs:
+        return good
+    if fully_expanded and proofs and all(proof == bad for proof in proofs):
+        return bad
+    return UNPROVEN
+
 
 class MCTSNode:
     """
@@ -9,9 +92,11 @@ class MCTSNode:
 
     Responsibilities:
     - Store game state
-    - Maintain parent / children relationships
+    - Maintain parent / children relationships (parent is the node that
+      first created this one; with transpositions a node can have several)
     - Track visit statistics
     - Provide UCB-based selection utilities
+    - Track MCTS-Solver proofs (proven win / loss)
     """
 
     def __init__(
@@ -20,6 +105,15 @@ class MCTSNode:
         parent: "MCTSNode | None" = None,
         action=None,
     ):
+        self.reset(state, parent, action)
+
+    def reset(
+        self,
+        state: TacticalEnvironment,
+        parent: "MCTSNode | None" = None,
+        action=None,
+    ):
+        """(Re)initialize the node for state; used to recycle pruned nodes."""
         self.state = state
         self.parent = parent
         self.action = action
@@ -34,6 +128,9 @@ class MCTSNode:
         # Expansion bookkeeping
         self.untried_actions = self._init_untried_actions()
 
+        # Solver result; proven nodes are never selected or expanded again
+        self.proven = initial_proof(state)
+
     # ------------------------------------------------------------------
     # Initialization & Tree Management
     # ------------------------------------------------------------------
@@ -43,6 +140,14 @@ class MCTSNode:
         random.shuffle(actions)
         return actions
 
+    def release(self):
+        """Drop the state and links of a pruned node so it holds no memory
+        until it is reset()."""
+        self.state = None
+        self.parent = None
+        self.children = []
+        self.untried_actions = []
+
     def add_child(self, child: "MCTSNode"):
         """Attach a child node and mark its action as tried."""
         self.children.append(child)
@@ -61,6 +166,28 @@ class MCTSNode:
         """Return True if all legal actions have been expanded."""
         return not self.untried_actions
 
+    def update_proof(self) -> bool:
+        """
+        Re-derive the solver result from the children.
+
+        Returns:
+            bool: True if the node became proven by this call
+        """
+        if self.proven != UNPROVEN:
+            return False
+        mover = self.state.turn
+        self.proven = solve_from_children(
+            mover,
+            (
+                passed_up(
+                    child.proven, mover, child.state.turn, child.state.turn_counter
+                )
+                for child in self.children
+            ),
+            self.is_fully_expanded(),
+        )
+        return self.proven != UNPROVEN
+
     @property
     def depth(self) -> int:
         """Depth of this node from the root."""
@@ -74,31 +201,43 @@ class MCTSNode:
     # ------------------------------------------------------------------
     # UCB / Selection Logic
     # ------------------------------------------------------------------
-    def ucb_score(self, exploration_constant: float = 1.4) -> float:
+    def ucb_score(
+        self, exploration_constant: float = 1.4, parent_visits: int = None
+    ) -> float:
         """
         Compute Upper Confidence Bound (UCB1) score.
 
         UCB = exploitation + exploration
+
+        Args:
+            exploration_constant (float): UCB exploration weight
+            parent_visits (int): Visits of the node selecting this one; defaults
+                to self.parent's. A node shared through the transposition table
+                has several parents, so selection passes the one it came from.
         """
         if self.visits == 0:
             return float("inf")
 
         exploitation = self.total_wins / self.visits
 
-        if self.parent is None:
-            return exploitation
+        if parent_visits is None:
+            if self.parent is None:
+                return exploitation
+            parent_visits = self.parent.visits
 
         exploration = exploration_constant * math.sqrt(
-            math.log(self.parent.visits) / self.visits
+            math.log(parent_visits) / self.visits
         )
 
         return exploitation + exploration
 
-    def best_child(self, exploration_constant: float = 1.4) -> "MCTSNode":
-        """Select child with highest UCB score."""
+    def best_child(self, exploration_constant: float = 1.4) -> "MCTSNode | None":
+        """Select the unproven child with highest UCB score (None if every
+        child is proven)."""
         return max(
-            self.children,
-            key=lambda child: child.ucb_score(exploration_constant),
+            (child for child in self.children if child.proven == UNPROVEN),
+            key=lambda child: child.ucb_score(exploration_constant, self.visits),
+            default=None,
         )
 
     # ------------------------------------------------------------------
@@ -122,14 +261,13 @@ class MCTSNode:
         # Terminal outcomes
         if player_pos == goal_pos:
             return 1.0
-        if player_pos == enemy_pos or player_pos in self.state.traps:
+        if player_pos == enemy_pos or self.state.is_trap(*player_pos):
             return 0.0
 
-        # Heuristic shaping
-        dist_goal = abs(player_pos[0] - goal_pos[0]) + abs(player_pos[1] - goal_pos[1])
-        dist_enemy = abs(player_pos[0] - enemy_pos[0]) + abs(
-            player_pos[1] - enemy_pos[1]
-        )
+        # Heuristic shaping on wall-aware step counts
+        static_map = self.state.static_map
+        dist_goal = static_map.goal_distance(*player_pos)
+        dist_enemy = static_map.distance(enemy_pos, player_pos)
 
         goal_score = 1.0 / (dist_goal + 1)
         danger_penalty = 1.0 / (dist_enemy + 1)
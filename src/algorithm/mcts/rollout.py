@@ -0,0 +1,338 @@
+"""Batched NumPy rollouts for MCTS.
+
+Plays K rollouts from the same state in lockstep. Positions are flat tile
+indices held in NumPy arrays, legal moves come from dense per-tile move
+tables built once per map, and each ply advances every unfinished rollout
+with a handful of array operations instead of one state.step() per rollout.
+
+The policies match MCTS._rollout(): the player moves greedily towards the
+goal with probability 0.7 and randomly otherwise, and the enemy steps onto
+the player if it can reach it or else to the reachable tile closest to the
+player. Ties between equally good tiles are broken the same way. Distances
+are the map's wall-aware BFS step counts, as in the scalar policies; only the
+fields of the goal and of the tiles the player stands on are ever built.
+"""
+
+import random
+
+import numpy as np
+
+from environment.state import UNREACHABLE
+
+# Player and enemy move ranges used by get_valid_actions()
+PLAYER_RANGE = 3
+ENEMY_RANGE = 2
+
+# Probability that the rollout player takes its greedy move
+GREEDY_PROBABILITY = 0.7
+
+# Attempts per rollout to find a free tile for a spawned trap
+TRAP_SPAWN_TRIES = 32
+
+# Distance entries the row store may hold (16 MB of int32), and the fewest
+# rows it keeps on any board
+FIELD_ROW_TILES = 1 << 22
+MIN_FIELD_ROWS = 4
+
+
+class BatchRollout:
+    """
+    Lockstep rollout engine for one map.
+
+    Attributes:
+        static_map: Map the tables were built for
+        goal_dist: Distance field of the goal
+        fields: Copies of the distance fields of recent player tiles, by row
+        field_count: Rows of fields currently holding a field
+        max_rows: Rows the store may hold before evicting
+        row_of: Row of each tile in fields, -1 while it holds none
+        simulated_plies: Plies played by all rollouts since creation
+    """
+
+    def __init__(self, static_map):
+        """
+        Build the move tables for static_map.
+
+        Args:
+            static_map: StaticMap of the environment to simulate
+        """
+        self.static_map = static_map
+        width, height = static_map.width, static_map.height
+        tiles = width * height
+
+        index = np.arange(tiles)
+        self.goal = static_map.index(*static_map.goal)
+        self.open_tiles = np.array(static_map.indices(static_map.open_mask))
+        self.max_dist = width + height
+
+        self.goal_dist = static_map.goal_field
+
+        # Distance fields of recent player tiles, one per row, LRU-evicted
+        self.max_rows = max(MIN_FIELD_ROWS, FIELD_ROW_TILES // tiles)
+        rows = min(16, self.max_rows)
+        self.fields = np.empty((rows, tiles), dtype=np.int32)
+        self.field_count = 0
+        self.row_of = np.full(tiles, -1, dtype=np.int64)
+        self.row_target = np.full(rows, -1, dtype=np.int64)
+        self.row_used = np.zeros(rows, dtype=np.int64)
+        self._allocated_rows = 0
+        self._free_rows = []
+        self._tick = 0
+
+        self.player_moves, self.player_counts = self._move_table(PLAYER_RANGE)
+        self.enemy_moves, self.enemy_counts = self._move_table(ENEMY_RANGE)
+
+        # Greedy player move per tile: the legal move closest to the goal
+        goal_dist = self.goal_dist
+        padded = np.where(
+            self.player_moves >= 0, goal_dist[self.player_moves], UNREACHABLE + 1
+        )
+        best = np.argmin(padded, axis=1)
+        self.greedy_move = self.player_moves[index, best]
+
+        self.simulated_plies = 0
+
+    def _move_table(self, move_range):
+        """
+        Return (moves, counts): moves[tile] lists the reachable tiles of tile,
+        padded with -1.
+
+        Rows follow the iteration order of StaticMap.move_set(), the order
+        the scalar policies scan get_valid_actions() in, so argmin picks the
+        same tile among equally close ones.
+        """
+        m = self.static_map
+        width = m.width
+        tiles = width * m.height
+        rows = [[] for _ in range(tiles)]
+        for tile in m.indices(m.open_mask):
+            moves = m.move_set(tile % width, tile // width, move_range)
+            rows[tile] = [y * width + x for x, y in moves]
+
+        counts = np.array([len(row) for row in rows], dtype=np.int32)
+        moves = np.full((tiles, max(1, int(counts.max()))), -1, dtype=np.int32)
+        for tile, row in enumerate(rows):
+            moves[tile, : len(row)] = row
+        return moves, counts
+
+    def _distances_to(self, targets, tiles) -> np.ndarray:
+        """
+        Return step counts from targets[i] to tiles[i] for every row i.
+
+        The distance fields of the targets are copied into rows of
+        self.fields the first time a target shows up (row_of maps a tile to
+        its row), evicting the least recently used rows beyond max_rows. A
+        call with more distinct targets than max_rows reads the map's fields
+        directly instead.
+
+        Args:
+            targets: (n,) flat tile indices
+            tiles: (n,) or (n, k) flat tile indices
+
+        Returns:
+            np.ndarray: int32 distances shaped like tiles
+        """
+        self._tick += 1
+        rows = self.row_of[targets]
+        missing = rows < 0
+        if missing.any():
+            if len(np.unique(targets)) > self.max_rows:
+                return self._gather(targets, tiles)
+            self.row_used[rows[~missing]] = self._tick
+            self._add_fields(np.unique(targets[missing]))
+            rows = self.row_of[targets]
+        self.row_used[rows] = self._tick
+        if tiles.ndim == 2:
+            rows = rows[:, None]
+        return self.fields[rows, tiles]
+
+    def _add_fields(self, targets):
+        """Copy the distance fields of targets into free or evicted rows."""
+        m = self.static_map
+        width = m.width
+
+        # Evict rows not used by the current call, least recently used first
+        excess = self.field_count + len(targets) - self.max_rows
+        if excess > 0:
+            held = np.flatnonzero(self.row_target >= 0)
+            idle = held[self.row_used[held] < self._tick]
+            victims = idle[np.argsort(self.row_used[idle], kind="stable")[:excess]]
+            self.row_of[self.row_target[victims]] = -1
+            self.row_target[victims] = -1
+            self._free_rows.extend(victims.tolist())
+            self.field_count -= len(victims)
+
+        for target in targets.tolist():
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = self._allocated_rows
+                if row == len(self.fields):
+                    self._grow_rows()
+                self._allocated_rows += 1
+            self.fields[row] = m.distance_field(target % width, target // width)
+            self.row_target[row] = target
+            self.row_used[row] = self._tick
+            self.row_of[target] = row
+            self.field_count += 1
+
+    def _grow_rows(self):
+        """Reallocate the row store with room for more rows, up to max_rows."""
+        size = min(2 * len(self.fields), self.max_rows)
+        fields = np.empty((size, self.fields.shape[1]), dtype=np.int32)
+        fields[: len(self.fields)] = self.fields
+        row_target = np.full(size, -1, dtype=np.int64)
+        row_target[: len(self.row_target)] = self.row_target
+        row_used = np.zeros(size, dtype=np.int64)
+        row_used[: len(self.row_used)] = self.row_used
+        self.fields, self.row_target, self.row_used = fields, row_target, row_used
+
+    def _gather(self, targets, tiles) -> np.ndarray:
+        """_distances_to() straight from the map's fields, one target at a time."""
+        width = self.static_map.width
+        distances = np.empty(tiles.shape, dtype=np.int32)
+        unique, inverse = np.unique(targets, return_inverse=True)
+        for i, target in enumerate(unique.tolist()):
+            rows = inverse == i
+            field = self.static_map.distance_field(target % width, target // width)
+            distances[rows] = field[tiles[rows]]
+        return distances
+
+    # ------------------------------------------------------------------
+    # Rollouts
+    # ------------------------------------------------------------------
+    def run(self, state, count: int, max_depth: int) -> np.ndarray:
+        """
+        Play count rollouts of up to max_depth plies from state.
+
+        Args:
+            state: TacticalEnvironment to start from (not modified)
+            count (int): Number of rollouts
+            max_depth (int): Maximum plies per rollout
+
+        Returns:
+            np.ndarray: Normalized reward in [0.0, 1.0] for every rollout
+        """
+        m = self.static_map
+        width = m.width
+        rng = np.random.default_rng(random.getrandbits(64))
+
+        px, py = state.player_pos
+        ex, ey = state.enemy_pos
+        player = np.full(count, py * width + px, dtype=np.int64)
+        enemy = np.full(count, ey * width + ex, dtype=np.int64)
+        traps = np.zeros((count, width * m.height), dtype=bool)
+        traps[:, m.indices(state._trap_mask())] = True
+
+        rewards = np.empty(count)
+        active = np.ones(count, dtype=bool)
+        self._finish_terminal(np.arange(count), player, enemy, traps, rewards, active)
+        if not active.any():
+            return rewards
+
+        turn = state.turn
+        turn_counter = state.turn_counter
+
+        for _ in range(max_depth):
+            live = np.flatnonzero(active)
+            if not len(live):
+                break
+            self.simulated_plies += len(live)
+
+            if turn == "player":
+                live = self._player_ply(live, player, enemy, rewards, active, rng)
+                turn = "enemy"
+            else:
+                self._enemy_ply(live, player, enemy)
+                turn = "player"
+
+            self._finish_terminal(live, player, enemy, traps, rewards, active)
+
+            if turn == "player":
+                turn_counter += 1
+                if turn_counter % 3 == 0:
+                    self._spawn_traps(
+                        np.flatnonzero(active), player, enemy, traps, rng
+                    )
+
+        live = np.flatnonzero(active)
+        rewards[live] = self._heuristic(player[live], enemy[live])
+        return rewards
+
+    def _player_ply(self, live, player, enemy, rewards, active, rng):
+        """Move the player in every live rollout; return rollouts still live."""
+        position = player[live]
+        counts = self.player_counts[position]
+
+        # A player without moves ends its rollout with the heuristic reward
+        stuck = counts == 0
+        if stuck.any():
+            done = live[stuck]
+            rewards[done] = self._heuristic(player[done], enemy[done])
+            active[done] = False
+            live, position, counts = live[~stuck], position[~stuck], counts[~stuck]
+
+        choice = (rng.random(len(live)) * counts).astype(np.int64)
+        move = self.player_moves[position, choice]
+        greedy = rng.random(len(live)) < GREEDY_PROBABILITY
+        move[greedy] = self.greedy_move[position[greedy]]
+
+        player[live] = move
+        return live
+
+    def _enemy_ply(self, live, player, enemy):
+        """Move the enemy in every live rollout with the fast chase policy."""
+        position = enemy[live]
+        target = player[live]
+        moves = self.enemy_moves[position]
+        valid = moves >= 0
+
+        dist = self._distances_to(target, moves)
+        dist[~valid] = UNREACHABLE + 1
+        move = moves[np.arange(len(live)), np.argmin(dist, axis=1)]
+
+        # Distance 0 is the player itself, so a reachable player is always
+        # taken. With no moves at all the enemy stays put.
+        blocked = self.enemy_counts[position] == 0
+        move[blocked] = position[blocked]
+        enemy[live] = move
+
+    def _finish_terminal(self, live, player, enemy, traps, rewards, active):
+        """Score and deactivate live rollouts that reached a terminal state."""
+        position = player[live]
+        goal = position == self.goal
+        lost = ~goal & (traps[live, position] | (position == enemy[live]))
+
+        rewards[live[goal]] = 1.0
+        # Raw reward 0.0 normalizes to 0.5, as in MCTSNode._normalize_score
+        rewards[live[lost]] = 0.5
+        active[live[goal | lost]] = False
+
+    def _spawn_traps(self, live, player, enemy, traps, rng):
+        """Add one trap on a random free tile to every live rollout."""
+        pending = live
+        for _ in range(TRAP_SPAWN_TRIES):
+            if not len(pending):
+                break
+            tile = self.open_tiles[rng.integers(len(self.open_tiles), size=len(pending))]
+            taken = (
+                traps[pending, tile]
+                | (tile == player[pending])
+                | (tile == enemy[pending])
+                | (tile == self.goal)
+            )
+            placed = ~taken
+            traps[pending[placed], tile[placed]] = True
+            pending = pending[taken]
+
+    def _heuristic(self, player, enemy) -> np.ndarray:
+        """Vectorized MCTS.rollout_reward() for non-terminal states, normalized."""
+        dist_goal = np.minimum(self.goal_dist[player], self.max_dist)
+        score = 0.1 + 0.7 * (1.0 - dist_goal / self.max_dist)
+
+        dist_enemy = self._distances_to(player, enemy)
+        score = np.where(dist_enemy <= 3, score * 0.5, score)
+        score = np.where(dist_enemy <= 2, 0.0, score)
+
+        score = np.clip(score, 0.0, 0.9)
+        return 0.5 * (score + 1.0)
@@ -1,24 +1,77 @@
+from collections import OrderedDict
+
+from algorithm.astar.chase import ChaseModel
 from algorithm.minimax.minimaxnode import MinimaxNode
 from utils.logger import Logger
 import random
 
+INF = float("inf")
+
+# How a memoized value relates to the true minimax value under alpha-beta
+EXACT = 0
+LOWER_BOUND = 1  # Search failed high: true value >= value
+UPPER_BOUND = 2  # Search failed low: true value <= value
+
+# Root moves scoring within this margin of the best one still get an exact
+# score under alpha-beta, so ties can be broken at random
+TIE_MARGIN = 1e-9
+
 
 class MinimaxSearch:
     """
-    Minimax search algorithm with alpha-beta pruning optimization.
+    Depth-limited minimax search over the position DAG.
 
     Finds optimal moves by recursively evaluating game tree with
     depth-limited search (max_depth) and early termination at terminal states.
+
+    Positions reached through different move orders are searched once: node
+    values are memoized by (Zobrist hash, depth remaining) in an LRU table of
+    at most memo_size entries, kept across searches on the same map. With
+    alpha_beta the recursion also prunes with an alpha-beta window; the memo
+    then stores bounds as well as exact values.
+
+    With enemy_model="astar" MIN nodes only search the move the A* pursuer
+    would make, as long as the real enemy keeps matching that prediction.
     """
 
-    def __init__(self, max_depth: int = 4):
+    ENEMY_MODELS = ("adversarial", "astar")
+
+    def __init__(
+        self,
+        max_depth: int = 4,
+        in_place: bool = False,
+        enemy_model: str = "adversarial",
+        memo_size: int = 1 << 16,
+        alpha_beta: bool = False,
+    ):
         """
         Initialize Minimax search.
 
         Args:
             max_depth (int): Maximum search depth (default: 4)
+            in_place (bool): Walk the tree with apply()/undo() on the given
+                state instead of cloning it for every child
+            enemy_model (str): "adversarial" or "astar" (see AlphaBetaSearch)
+            memo_size (int): Memoized positions kept; 0 disables the memo
+            alpha_beta (bool): Prune with an alpha-beta window. The root
+                still scores every move exactly enough to break ties at random.
         """
+        if enemy_model not in self.ENEMY_MODELS:
+            raise ValueError(f"Unknown enemy model: {enemy_model!r}")
+
         self.max_depth = max_depth
+        self.in_place = in_place
+        self.enemy_model = enemy_model
+        self._chase = ChaseModel() if enemy_model == "astar" else None
+        self._model_active = self._chase is not None
+        self._model_map = None
+        self.memo_size = max(0, int(memo_size or 0))
+        self.alpha_beta = alpha_beta
+        self._memo = OrderedDict()
+        self._memo_map = None
+        self._memo_hits = 0
+        self._memo_probes = 0
+        self._nodes_visited = 0
         self.log = Logger("Minimax")
 
     def search(self, state) -> tuple:
@@ -34,24 +87,49 @@ class MinimaxSearch:
         Returns:
             tuple: (best_action, metadata_dict)
                 - best_action: Optimal move found
-                - metadata: {minimax_score, num_actions_evaluated}
+                - metadata: {minimax_score, actions_evaluated, enemy_model,
+                  nodes_visited, memo_hits, memo_probes, memo_hit_rate}
         """
+        self._nodes_visited = 0
+        self._memo_hits = 0
+        self._memo_probes = 0
+
+        if state.static_map is not self._memo_map:
+            # Hashes only cover dynamic state, so entries die with the map
+            self._memo.clear()
+            self._memo_map = state.static_map
+
+        if self._chase is not None:
+            if state.static_map is not self._model_map:
+                self._model_map = state.static_map
+                self._model_active = True
+            if not self._chase.confirm(state) and self._model_active:
+                self.log.warning(
+                    "Enemy deviated from the A* model; searching adversarially"
+                )
+                self._model_active = False
+                # Values searched under the model assumed a cooperative enemy
+                self._memo.clear()
+
         best_minimax_score = -float("inf")
         candidate_best_actions = []
 
         legal_actions = list(state.get_valid_actions(unit="current"))
         if not legal_actions:
-            return None, {"minimax_score": 0.0, "actions_evaluated": 0}
+            return None, self._meta(0.0, 0)
 
         # Randomize action order to avoid bias (e.g., always checking upward)
         random.shuffle(legal_actions)
 
         # Root level: maximize player's perspective
         for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action, simulate=True)
+            next_state, record = self._child(state, action)
 
-            minimax_score = self._min_value(next_state, depth=1)
+            # Moves that cannot reach the best score fail low; moves that tie
+            # with it are still scored exactly
+            alpha = best_minimax_score - TIE_MARGIN if self.alpha_beta else -INF
+            minimax_score = self._min_value(next_state, 1, alpha, INF)
+            self._restore(state, record)
 
             # Track best action(s) with tie-breaking
             if minimax_score > best_minimax_score:
@@ -65,31 +143,51 @@ class MinimaxSearch:
             random.choice(candidate_best_actions) if candidate_best_actions else None
         )
 
-        metadata = {
-            "minimax_score": float(best_minimax_score),
-            "actions_evaluated": len(legal_actions),
+        if self._model_active and chosen_action is not None:
+            self._chase.expect(state, chosen_action)
+
+        return chosen_action, self._meta(best_minimax_score, len(legal_actions))
+
+    def _meta(self, score: float, actions_evaluated: int) -> dict:
+        """Build the metadata dict returned by search()."""
+        return {
+            "minimax_score": float(score),
+            "actions_evaluated": actions_evaluated,
+            "enemy_model": "astar" if self._model_active else "adversarial",
+            "nodes_visited": self._nodes_visited,
+            "memo_hits": self._memo_hits,
+            "memo_probes": self._memo_probes,
+            "memo_hit_rate": (
+                self._memo_hits / self._memo_probes if self._memo_probes else 0.0
+            ),
         }
 
-        return chosen_action, metadata
-
-    def _max_value(self, state, depth: int) -> float:
+    def _max_value(self, state, depth: int, alpha: float = -INF, beta: float = INF):
         """
         Minimax MAX node: player turn (maximize score).
 
         Args:
             state: Current game state
             depth (int): Current search depth
+            alpha (float): Best score MAX is already assured of (alpha_beta)
+            beta (float): Best score MIN is already assured of (alpha_beta)
 
         Returns:
             float: Best achievable score from this state [0.0, 1.0]
         """
         node = MinimaxNode(state)
+        self._nodes_visited += 1
 
         # Terminal condition: reached max depth or game over
         if depth == self.max_depth or node.is_terminal():
             return node.evaluate()
 
-        max_score = -float("inf")
+        alpha_orig, beta_orig = alpha, beta
+        key, cached, alpha, beta = self._memo_lookup(state, depth, alpha, beta)
+        if cached is not None:
+            return cached
+
+        max_score = -INF
         legal_actions = list(state.get_valid_actions(unit="current"))
 
         # No legal moves: evaluate current position
@@ -98,33 +196,50 @@ class MinimaxSearch:
 
         # Expand all child nodes
         for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action, simulate=True)
+            next_state, record = self._child(state, action)
 
-            child_score = self._min_value(next_state, depth + 1)
+            child_score = self._min_value(next_state, depth + 1, alpha, beta)
+            self._restore(state, record)
             max_score = max(max_score, child_score)
 
+            if self.alpha_beta:
+                if max_score >= beta:
+                    break
+                alpha = max(alpha, max_score)
+
+        self._memo_store(key, max_score, alpha_orig, beta_orig)
         return max_score
 
-    def _min_value(self, state, depth: int) -> float:
+    def _min_value(self, state, depth: int, alpha: float = -INF, beta: float = INF):
         """
         Minimax MIN node: enemy turn (minimize score).
 
         Args:
             state: Current game state
             depth (int): Current search depth
+            alpha (float): Best score MAX is already assured of (alpha_beta)
+            beta (float): Best score MIN is already assured of (alpha_beta)
 
         Returns:
             float: Worst-case score assuming optimal enemy play [0.0, 1.0]
         """
         node = MinimaxNode(state)
+        self._nodes_visited += 1
 
         # Terminal condition: reached max depth or game over
         if depth == self.max_depth or node.is_terminal():
             return node.evaluate()
 
-        min_score = float("inf")
-        legal_actions = list(state.get_valid_actions(unit="current"))
+        alpha_orig, beta_orig = alpha, beta
+        key, cached, alpha, beta = self._memo_lookup(state, depth, alpha, beta)
+        if cached is not None:
+            return cached
+
+        min_score = INF
+        if self._model_active:
+            legal_actions = [self._chase.move(state)]
+        else:
+            legal_actions = list(state.get_valid_actions(unit="current"))
 
         # No legal moves: evaluate current position
         if not legal_actions:
@@ -132,10 +247,96 @@ class MinimaxSearch:
 
         # Expand all child nodes
         for action in legal_actions:
-            next_state = state.clone()
-            next_state.step(action, simulate=True)
+            next_state, record = self._child(state, action)
 
-            child_score = self._max_value(next_state, depth + 1)
+            child_score = self._max_value(next_state, depth + 1, alpha, beta)
+            self._restore(state, record)
             min_score = min(min_score, child_score)
 
+            if self.alpha_beta:
+                if min_score <= alpha:
+                    break
+                beta = min(beta, min_score)
+
+        self._memo_store(key, min_score, alpha_orig, beta_orig)
         return min_score
+
+    # ------------------------------------------------------------------
+    # Memoization
+    # ------------------------------------------------------------------
+    def _memo_lookup(self, state, depth, alpha, beta):
+        """
+        Look a node up in the memo.
+
+        Args:
+            state: Current game state
+            depth (int): Current search depth
+            alpha (float): Current alpha
+            beta (float): Current beta
+
+        Returns:
+            tuple: (key, cached_value or None, alpha, beta). A cached value
+            means the node can return at once; otherwise alpha/beta may have
+            been tightened by a stored bound. key is None without a memo.
+        """
+        if not self.memo_size:
+            return None, None, alpha, beta
+
+        key = (state.zobrist_key, self.max_depth - depth)
+        self._memo_probes += 1
+        entry = self._memo.get(key)
+        if entry is None:
+            return key, None, alpha, beta
+
+        self._memo_hits += 1
+        self._memo.move_to_end(key)
+        value, bound = entry
+        if bound == EXACT:
+            return key, value, alpha, beta
+        if bound == LOWER_BOUND:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return key, value, alpha, beta
+        return key, None, alpha, beta
+
+    def _memo_store(self, key, value, alpha_orig, beta_orig):
+        """Memoize a node value with the bound type implied by its window."""
+        if key is None:
+            return
+        if value <= alpha_orig:
+            bound = UPPER_BOUND
+        elif value >= beta_orig:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._memo[key] = (value, bound)
+        self._memo.move_to_end(key)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _child(self, state, action):
+        """
+        Produce the state reached by playing action.
+
+        Args:
+            state: Current game state
+            action: Action to play
+
+        Returns:
+            tuple: (child_state, undo_record); the record is None unless
+                searching in place, where it must be passed to _restore()
+        """
+        if self.in_place:
+            return state, state.apply(action)
+
+        next_state = state.clone()
+        next_state.step(action, simulate=True)
+        return next_state, None
+
+    @staticmethod
+    def _restore(state, record):
+        """Undo an in-place child produced by _child()."""
+        if record is not None:
+            state.undo(record)
@@ -33,32 +33,33 @@ class MinimaxNode:
         if player_pos == goal_pos:
             return 1.0  # WIN
 
-        if player_pos == enemy_pos or player_pos in self.state.traps:
+        if player_pos == enemy_pos or self.state.is_trap(*player_pos):
             return -1.0  # LOSS
 
+        # Wall-aware step counts from the map's cached distance fields
+        static_map = self.state.static_map
+        max_board_distance = float(self.state.width + self.state.height)
+
         # Goal proximity scoring - PRIMARY OBJECTIVE (80% weight)
-        manhattan_dist_to_goal = abs(player_pos[0] - goal_pos[0]) + abs(
-            player_pos[1] - goal_pos[1]
+        path_dist_to_goal = min(
+            static_map.goal_distance(*player_pos), max_board_distance
         )
-        max_board_distance = float(self.state.width + self.state.height)
-        goal_closeness = 1.0 - (manhattan_dist_to_goal / max_board_distance)
+        goal_closeness = 1.0 - (path_dist_to_goal / max_board_distance)
         goal_closeness = max(0.0, min(1.0, goal_closeness))
 
         cumulative_score = goal_closeness * 0.8
 
         # Enemy avoidance penalty - SECONDARY OBJECTIVE (20% weight)
-        manhattan_dist_to_enemy = abs(player_pos[0] - enemy_pos[0]) + abs(
-            player_pos[1] - enemy_pos[1]
-        )
+        path_dist_to_enemy = static_map.distance(enemy_pos, player_pos)
 
         # Graduated penalty based on enemy distance
-        if manhattan_dist_to_enemy <= 1:
+        if path_dist_to_enemy <= 1:
             enemy_penalty_factor = 0.3  # Severe danger
-        elif manhattan_dist_to_enemy == 2:
+        elif path_dist_to_enemy == 2:
             enemy_penalty_factor = 0.6
-        elif manhattan_dist_to_enemy == 3:
+        elif path_dist_to_enemy == 3:
             enemy_penalty_factor = 0.8
-        elif manhattan_dist_to_enemy == 4:
+        elif path_dist_to_enemy == 4:
             enemy_penalty_factor = 0.9
         else:
             enemy_penalty_factor = 1.0  # Safe
@@ -1,10 +1,9 @@
 # src/env/environment.py
 import os
-import copy
 import pygame
 import random
-from collections import deque
 from environment.generator import generate_environment
+from environment.state import DynamicState, StaticMap, TrapSet, UndoRecord
 
 BG_COLOR = (20, 20, 30)
 GRID_COLOR = (50, 50, 70)
@@ -18,8 +17,29 @@ class TacticalEnvironment:
     """
     Turn-based tactical game environment with grid-based movement.
     Manages player, enemy, walls, traps, and goal placement.
+
+    State is held in two objects: an immutable StaticMap (walls, goal,
+    dimensions) shared by every clone, and a small DynamicState (positions,
+    traps, turn bookkeeping) copied per clone. The familiar attributes
+    (width, walls, player_pos, traps, ...) are exposed as properties.
     """
 
+    # Presentation defaults. Environments built by the constructor get their
+    # own copies; lightweight clones fall back to these class attributes.
+    seed = None
+    use_assets = False
+    tile_dir = "assets/tiles"
+    char_dir = "assets/characters"
+    textures = None
+    coordinate_font = None
+    hud_font = None
+    player_draw_pos = None
+    enemy_draw_pos = None
+    hud_visible = True
+    hud_pos = (8, 8)
+    hud_dragging = False
+    hud_drag_offset = (0, 0)
+
     def __init__(
         self,
         width=10,
@@ -44,22 +64,13 @@ class TacticalEnvironment:
               tile_dir: Directory path for tile textures
               char_dir: Directory path for character textures
         """
-        self.width = width
-        self.height = height
-
-        self.num_walls = num_walls
-        self.num_traps = num_traps
         self.seed = seed
 
         self.use_assets = use_assets
         self.tile_dir = tile_dir
         self.char_dir = char_dir
 
-        # Animation draw positions
-        self.player_draw_pos = None
-        self.enemy_draw_pos = None
-
-        self.turn_counter = 0
+        self._init_render_state()
 
         self.textures = self.load_textures() if use_assets else None
 
@@ -70,6 +81,73 @@ class TacticalEnvironment:
         self.hud_font = (
             pygame.font.SysFont("consolas", 16) if pygame.font.get_init() else None
         )
+
+        # Initialize game state
+        self._generate(width, height, num_walls, num_traps)
+
+    @classmethod
+    def from_state(
+        cls,
+        width,
+        height,
+        grid,
+        player_pos,
+        enemy_pos,
+        goal,
+        walls,
+        traps,
+        turn="player",
+        turn_counter=0,
+        num_walls=0,
+        num_traps=0,
+    ):
+        """
+        Build an environment directly from existing game state.
+
+        Unlike the regular constructor this does not generate a map and does
+        not touch pygame fonts or textures, which makes it cheap enough to be
+        called for every node of a search tree. The given containers are used
+        as-is, so callers pass copies when the source must stay untouched.
+
+        Args:
+            width: Grid width in tiles
+            height: Grid height in tiles
+            grid: 2D grid list (grid[y][x])
+            player_pos: Player position as list [x, y]
+            enemy_pos: Enemy position as list [x, y]
+            goal: Goal position as tuple (x, y)
+            walls: Set of wall (x, y) tuples
+            traps: Set of trap (x, y) tuples
+            turn: Whose turn it is ("player" or "enemy")
+            turn_counter: Number of completed player/enemy rounds
+            num_walls: Wall count used when the map is regenerated by reset()
+            num_traps: Trap count used when the map is regenerated by reset()
+
+        Returns:
+            TacticalEnvironment: Environment holding the given state
+        """
+        static_map = StaticMap(
+            width, height, grid, goal, walls, num_walls=num_walls, num_traps=num_traps
+        )
+        dynamic = DynamicState(
+            player_pos, enemy_pos, traps, turn=turn, turn_counter=turn_counter
+        )
+        return cls._from_parts(static_map, dynamic)
+
+    @classmethod
+    def _from_parts(cls, static_map, dynamic):
+        """Allocate an environment around existing map and state objects."""
+        env = cls.__new__(cls)
+        env.static_map = static_map
+        env.dynamic = dynamic
+        return env
+
+    def _init_render_state(self):
+        """Initialize animation and HUD state used only by draw()."""
+        # Animation draw positions
+        self.player_draw_pos = None
+        self.enemy_draw_pos = None
+
         # HUD visibility toggle (can be toggled from main event loop)
         self.hud_visible = True
         # HUD position and dragging state
@@ -77,8 +155,113 @@ class TacticalEnvironment:
         self.hud_dragging = False
         self.hud_drag_offset = (0, 0)
 
-        # Initialize game state
-        self.reset()
+    # ------------------------------------------------------------------
+    # State accessors
+    # ------------------------------------------------------------------
+    @property
+    def width(self):
+        return self.static_map.width
+
+    @property
+    def height(self):
+        return self.static_map.height
+
+    @property
+    def grid(self):
+        return self.static_map.grid
+
+    @property
+    def goal(self):
+        return self.static_map.goal
+
+    @property
+    def walls(self):
+        return self.static_map.walls
+
+    @property
+    def num_walls(self):
+        return self.static_map.num_walls
+
+    @property
+    def num_traps(self):
+        return self.static_map.num_traps
+
+    @property
+    def player_pos(self):
+        return self.dynamic.player_pos
+
+    @player_pos.setter
+    def player_pos(self, pos):
+        self.dynamic.player_pos = pos
+        self.dynamic.hash_key = None
+
+    @property
+    def enemy_pos(self):
+        return self.dynamic.enemy_pos
+
+    @enemy_pos.setter
+    def enemy_pos(self, pos):
+        self.dynamic.enemy_pos = pos
+        self.dynamic.hash_key = None
+
+    @property
+    def turn(self):
+        return self.dynamic.turn
+
+    @turn.setter
+    def turn(self, turn):
+        self.dynamic.turn = turn
+        self.dynamic.hash_key = None
+
+    @property
+    def turn_counter(self):
+        return self.dynamic.turn_counter
+
+    @turn_counter.setter
+    def turn_counter(self, count):
+        self.dynamic.turn_counter = count
+        self.dynamic.hash_key = None
+
+    @property
+    def traps(self) -> TrapSet:
+        """
+        Trap positions as a set view. Reading shares the set with clones and
+        keeps the trap bitboard and hash; add() / discard() copy it on write
+        and invalidate both.
+        """
+        return TrapSet(self.dynamic)
+
+    @traps.setter
+    def traps(self, traps):
+        self.dynamic.traps = traps
+        self.dynamic.traps_shared = False
+        self.dynamic.trap_mask = None
+        self.dynamic.hash_key = None
+
+    @property
+    def zobrist_key(self):
+        """
+        64-bit Zobrist hash of the dynamic state.
+
+        Covers player and enemy positions, side to move, traps and
+        turn_counter % 3. Computed once, then kept up to date in O(1) by
+        apply()/undo() and spawn_trap(), and carried over by clone().
+        Assigning state attributes directly triggers a full recompute on the
+        next access.
+        """
+        d = self.dynamic
+        if d.hash_key is None:
+            m = self.static_map
+            keys = m.zobrist
+            key = keys.player[m.index(*d.player_pos)]
+            key ^= keys.enemy[m.index(*d.enemy_pos)]
+            for i in m.indices(self._trap_mask()):
+                key ^= keys.trap[i]
+            if d.turn == "enemy":
+                key ^= keys.enemy_turn
+            key ^= keys.phase[d.turn_counter % 3]
+            d.hash_key = key
+        return d.hash_key
 
     def load_textures(self):
         """
@@ -124,22 +307,18 @@ class TacticalEnvironment:
         Reset the environment to initial state.
         Generates a new map layout and resets turn to player.
         """
-        (
-            self.grid,
-            self.player_pos,
-            self.enemy_pos,
-            self.goal,
-            self.walls,
-            self.traps,
-        ) = generate_environment(
-            self.width, self.height, self.num_walls, self.num_traps, self.seed
-        )
-        self.turn = "player"
-
-        self._cached_player_moves = None
-        self._cached_enemy_moves = None
+        m = self.static_map
+        self._generate(m.width, m.height, m.num_walls, m.num_traps)
 
-        self.turn_counter = 0
+    def _generate(self, width, height, num_walls, num_traps):
+        """Generate a fresh map and initial dynamic state."""
+        grid, player_pos, enemy_pos, goal, walls, traps = generate_environment(
+            width, height, num_walls, num_traps, self.seed
+        )
+        self.static_map = StaticMap(
+            width, height, grid, goal, walls, num_walls=num_walls, num_traps=num_traps
+        )
+        self.dynamic = DynamicState(player_pos, enemy_pos, traps)
 
         if self.seed is not None:
             random.seed(None)
@@ -168,57 +347,50 @@ class TacticalEnvironment:
         Returns:
             bool: True if position contains a wall
         """
-        return (x, y) in self.walls
-
-    def get_move_range(self, pos, move_range=3):
-        """Calculate all reachable tiles from a position using flood fill (BFS).
+        m = self.static_map
+        if 0 <= x < m.width and 0 <= y < m.height:
+            return (m.wall_mask >> (y * m.width + x)) & 1 == 1
+        return False
 
-        Uses breadth-first search to find all tiles within move_range steps that
-        are not blocked by walls. Walls completely block movement.
+    def is_trap(self, x, y):
+        """
+        Check if a tile holds a trap without detaching the shared trap set.
 
         Args:
-            pos: Starting position as list [x, y]
-            move_range: Maximum number of steps to move
+            x: X coordinate
+            y: Y coordinate
 
         Returns:
-            set: Set of (x, y) tuples representing reachable positions (excluding start)
+            bool: True if position contains a trap
         """
-        queue = deque([(tuple(pos), 0)])
-        visited = {tuple(pos)}
-        reachable = set()
-
-        while queue:
-            (x, y), dist = queue.popleft()
-
-            # Add to reachable if not the starting position
-            if (x, y) != tuple(pos):
-                reachable.add((x, y))
-
-            # If we've used all movement points, don't explore further from this tile
-            if dist >= move_range:
-                continue
-
-            # Explore all four cardinal directions
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = x + dx, y + dy
+        m = self.static_map
+        if 0 <= x < m.width and 0 <= y < m.height:
+            return (self._trap_mask() >> (y * m.width + x)) & 1 == 1
+        return False
+
+    def _trap_mask(self):
+        """Return the trap bitboard, rebuilding it after external trap edits."""
+        d = self.dynamic
+        if d.trap_mask is None:
+            d.trap_mask = self.static_map.mask_of(d.traps)
+        return d.trap_mask
 
-                # Check bounds
-                if not self.in_bounds(nx, ny):
-                    continue
-
-                # Skip if already visited
-                if (nx, ny) in visited:
-                    continue
+    def get_move_range(self, pos, move_range=3):
+        """Calculate all reachable tiles from a position using flood fill.
 
-                # WALL BLOCKS - cannot pass through walls
-                if self.is_blocked(nx, ny):
-                    continue
+        Finds all tiles within move_range steps that are not blocked by walls.
+        Walls completely block movement. Results come from the static map's
+        per-tile tables (see StaticMap.move_set), so each origin is flood
+        filled at most once per map.
 
-                # Mark visited and add to queue with incremented distance
-                visited.add((nx, ny))
-                queue.append(((nx, ny), dist + 1))
+        Args:
+            pos: Starting position as list [x, y]
+            move_range: Maximum number of steps to move
 
-        return reachable
+        Returns:
+            frozenset: Set of (x, y) tuples representing reachable positions (excluding start)
+        """
+        return self.static_map.move_set(pos[0], pos[1], move_range)
 
     def move_unit(self, pos, target):
         """
@@ -243,31 +415,49 @@ class TacticalEnvironment:
         Returns:
             tuple: (is_terminal: bool, reason: str or None)
         """
-        if tuple(self.player_pos) == self.goal:
+        d = self.dynamic
+        m = self.static_map
+        px, py = d.player_pos
+        player_bit = 1 << (py * m.width + px)
+        if player_bit == m.goal_mask:
             return (True, "goal")
-        elif tuple(self.player_pos) in self.traps:
+        elif player_bit & self._trap_mask():
             return (True, "trap")
-        elif tuple(self.enemy_pos) == tuple(self.player_pos):
+        elif d.enemy_pos[0] == px and d.enemy_pos[1] == py:
             return (True, "caught")
         return (False, None)
 
     def spawn_trap(self):
-        empty_tiles = [
-            (x, y)
-            for x in range(self.width)
-            for y in range(self.height)
-            if (x, y) != tuple(self.player_pos)
-            and (x, y) != tuple(self.enemy_pos)
-            and (x, y) != self.goal
-            and (x, y) not in self.walls
-            and (x, y) not in self.traps
-        ]
+        """
+        Place a new trap on a random empty tile.
+
+        Empty tiles are open (non-wall) tiles without a trap, the goal, the
+        player or the enemy.
+
+        Returns:
+            tuple or None: Position of the new trap, or None if no tile is free
+        """
+        d = self.dynamic
+        m = self.static_map
+        trap_mask = self._trap_mask()
+        occupied = (
+            trap_mask
+            | m.goal_mask
+            | m.bit(*d.player_pos)
+            | m.bit(*d.enemy_pos)
+        )
+        empty_tiles = m.indices(m.open_mask & ~occupied)
 
         if not empty_tiles:
-            return
+            return None
 
         new_trap = random.choice(empty_tiles)
-        self.traps.add(new_trap)
+        position = (new_trap % m.width, new_trap // m.width)
+        d.own_traps().add(position)
+        d.trap_mask = trap_mask | (1 << new_trap)
+        if d.hash_key is not None:
+            d.hash_key ^= m.zobrist.trap[new_trap]
+        return position
 
     def step(self, action, simulate=True):
         """
@@ -282,56 +472,119 @@ class TacticalEnvironment:
         Returns:
           tuple or None: (is_terminal, reason) if simulate=True, else None
         """
-        self._cached_player_moves = None
-        self._cached_enemy_moves = None
+        record = self.apply(action)
+        is_terminal, reason = record.result
+
+        if is_terminal and not simulate:
+            if record.turn == "enemy":
+                print("Enemy caught you! Resetting...")
+            elif reason == "goal":
+                print("You reached the goal! Resetting...")
+            elif reason == "trap":
+                print("You hit a trap! Resetting...")
+            self.reset()
+            return
+
+        if simulate:
+            return record.result
+
+    def apply(self, action):
+        """
+        Execute one turn in place and return what is needed to take it back.
 
-        if self.turn == "player" and action is not None:
+        Same transition rules as step(simulate=True); tree searches use
+        apply()/undo() pairs to walk the game tree without cloning.
+
+        Args:
+          action: Target position tuple (x, y) or None to skip turn
+
+        Returns:
+          UndoRecord: Previous state; record.result holds (is_terminal, reason)
+        """
+        d = self.dynamic
+        m = self.static_map
+        record = UndoRecord(
+            d.player_pos,
+            d.enemy_pos,
+            d.turn,
+            d.turn_counter,
+            self._trap_mask(),
+            d.hash_key,
+        )
+        # Incremental Zobrist update, only once a hash has been requested
+        keys = m.zobrist if d.hash_key is not None else None
+
+        if d.turn == "player" and action is not None:
             # Player action
-            if action is not None:
-                move_tiles = self.get_move_range(self.player_pos)
-                if action in move_tiles:
-                    self.player_pos = self.move_unit(self.player_pos, action)
-
-            is_terminal, reason = self.is_terminal()
-            if is_terminal:
-                if not simulate:
-                    if reason == "goal":
-                        print("You reached the goal! Resetting...")
-                    elif reason == "trap":
-                        print("You hit a trap! Resetting...")
-                    self.reset()
-                    return
-                else:
-                    return (True, reason)
+            move_tiles = self.get_move_range(d.player_pos)
+            if action in move_tiles:
+                old_pos = d.player_pos
+                d.player_pos = self.move_unit(d.player_pos, action)
+                if keys is not None:
+                    d.hash_key ^= (
+                        keys.player[m.index(*old_pos)]
+                        ^ keys.player[m.index(*d.player_pos)]
+                    )
+
+            record.result = self.is_terminal()
+            if record.result[0]:
+                return record
 
-            self.turn = "enemy"
+            d.turn = "enemy"
+            if keys is not None:
+                d.hash_key ^= keys.enemy_turn
 
-        elif self.turn == "enemy":
+        elif d.turn == "enemy":
             # Enemy action
             if action is not None:
-                enemy_moves_tiles = self.get_move_range(self.enemy_pos)
+                enemy_moves_tiles = self.get_move_range(d.enemy_pos)
                 if action in enemy_moves_tiles:
-                    self.enemy_pos = self.move_unit(self.enemy_pos, action)
-
-            is_terminal, reason = self.is_terminal()
-            if is_terminal:
-                if not simulate:
-                    print("Enemy caught you! Resetting...")
-                    self.reset()
-                    return
-                else:
-                    return (True, reason)
+                    old_pos = d.enemy_pos
+                    d.enemy_pos = self.move_unit(d.enemy_pos, action)
+                    if keys is not None:
+                        d.hash_key ^= (
+                            keys.enemy[m.index(*old_pos)]
+                            ^ keys.enemy[m.index(*d.enemy_pos)]
+                        )
+
+            record.result = self.is_terminal()
+            if record.result[0]:
+                return record
+
+            d.turn = "player"
+
+            d.turn_counter += 1
+            if keys is not None:
+                d.hash_key ^= (
+                    keys.enemy_turn
+                    ^ keys.phase[(d.turn_counter - 1) % 3]
+                    ^ keys.phase[d.turn_counter % 3]
+                )
+
+            if d.turn_counter % 3 == 0:
+                record.spawned_trap = self.spawn_trap()
+
+        return record
+
+    def undo(self, record):
+        """
+        Revert the turn recorded by apply().
 
-            self.turn = "player"
+        Records must be undone in reverse order of application.
 
-            self.turn_counter += 1
+        Args:
+          record: UndoRecord returned by apply()
+        """
+        d = self.dynamic
+        d.player_pos = record.player_pos
+        d.enemy_pos = record.enemy_pos
+        d.turn = record.turn
+        d.turn_counter = record.turn_counter
 
-            if self.turn_counter % 3 == 0:
-                # print("Trap spawned on turn", self.turn_counter)
-                self.spawn_trap()
-
-        if simulate:
-            return (False, None)
+        if record.spawned_trap is not None:
+            d.own_traps().discard(record.spawned_trap)
+        d.trap_mask = record.trap_mask
+        d.hash_key = record.hash_key
 
     def get_valid_actions(self, unit="current"):
         """
@@ -353,6 +606,32 @@ class TacticalEnvironment:
 
         return set()
 
+    def legal_mask(self, unit="current"):
+        """
+        Get all valid actions for a unit as a bitboard.
+
+        Bitboard counterpart of get_valid_actions() for search code that
+        works on masks; bit y * width + x is set for each reachable (x, y).
+
+        Args:
+            unit: 'current' (current turn), 'player', or 'enemy'
+
+        Returns:
+            int: Bitboard of valid move positions
+        """
+        if unit == "current":
+            unit = self.turn
+
+        m = self.static_map
+        if unit == "player":
+            x, y = self.dynamic.player_pos
+            return m.move_mask(x, y, 3)
+        elif unit == "enemy":
+            x, y = self.dynamic.enemy_pos
+            return m.move_mask(x, y, 2)
+
+        return 0
+
     def draw(self, screen):
         """
         Render the entire game state to screen.
@@ -383,7 +662,7 @@ class TacticalEnvironment:
                     else:
                         pygame.draw.rect(screen, (100, 100, 100), rect)
 
-                elif (x, y) in self.traps:
+                elif self.is_trap(x, y):
                     if self.use_assets:
                         screen.blit(self.textures["trap"], rect.topleft)
                     else:
@@ -502,11 +781,13 @@ class TacticalEnvironment:
             turn = getattr(self, "turn", "-")
             fps = getattr(self, "current_fps", 0.0)
             path = getattr(self, "enemy_intent_path", []) or []
+            path_hits = getattr(self, "path_cache_hits", None)
 
             # Build lines
             nv = meta.get("nodes_visited")
             tt = meta.get("thinking_time")
             wp = meta.get("win_probability")
+            tb = meta.get("tree_bytes")
 
             lines = [
                 f"Algorithm: {alg_name}",
@@ -516,8 +797,12 @@ class TacticalEnvironment:
                 f"FPS: {fps:.1f}",
                 f"EnemyPath: {len(path)}",
             ]
+            if path_hits is not None:
+                lines.append(f"PathCache: {path_hits} hits")
             if nv is not None:
                 lines.append(f"Nodes: {nv}")
+            if tb:
+                lines.append(f"Tree: {tb / 1024:.0f} KB")
             if tt is not None:
                 lines.append(f"Time: {tt:.3f}s")
             if wp is not None:
@@ -560,32 +845,16 @@ class TacticalEnvironment:
 
     def clone(self):
         """
-        Create a deep copy of the environment.
+        Create an independent copy of the environment.
         Useful for MCTS simulations and game tree search.
 
+        The static map is shared and only the dynamic state is copied; the
+        trap set is shared copy-on-write until either side adds a trap.
+
         Returns:
           TacticalEnvironment: Independent copy of current state
         """
+        return TacticalEnvironment._from_parts(self.static_map, self.dynamic.copy())
 
-        cloned = TacticalEnvironment(
-            width=self.width,
-            height=self.height,
-            num_walls=self.num_walls,
-            num_traps=self.num_traps,
-            seed=None,
-            use_assets=False,
-        )
-
-        cloned.grid = copy.deepcopy(self.grid)
-        cloned.player_pos = copy.deepcopy(self.player_pos)
-        cloned.enemy_pos = copy.deepcopy(self.enemy_pos)
-        cloned.goal = copy.deepcopy(self.goal)
-        cloned.walls = copy.deepcopy(self.walls)
-        cloned.traps = copy.deepcopy(self.traps)
-
-        cloned.turn = self.turn
-        cloned._cached_player_moves = None
-        cloned._cached_enemy_moves = None
-        cloned.turn_counter = self.turn_counter
-
-        return cloned
+    def __copy__(self):
+        return self.clone()
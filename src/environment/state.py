@@ -0,0 +1,573 @@
+"""Game state containers for TacticalEnvironment.
+
+The environment is split into two parts:
+
+- StaticMap: everything that is fixed for the whole episode (dimensions,
+  walls, goal, grid) plus the bitboard masks and move-range tables derived
+  from it. A single instance is shared by every clone.
+- DynamicState: the small amount of state that changes turn by turn
+  (unit positions, traps, turn bookkeeping). Cloned per search node, with the
+  trap set shared copy-on-write until one side actually adds a trap.
+
+UndoRecord captures what TacticalEnvironment.apply() changed so that
+undo() can revert it in place.
+
+Bitboards are plain Python ints where tile (x, y) is bit y * width + x.
+
+ZobristKeys holds the random 64-bit keys used to hash a DynamicState; the
+hash is maintained incrementally by TacticalEnvironment.apply()/undo().
+
+StaticMap also provides breadth-first distance fields: true shortest-path
+step counts around the walls, computed per source tile and kept in a
+bounded LRU cache on the map.
+"""
+
+import itertools
+import random
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableSet
+
+import numpy as np
+
+# Fixed so that equal states hash equally across processes and runs
+ZOBRIST_SEED = 0x5EED_2514
+
+# Source of StaticMap.version numbers
+_map_versions = itertools.count(1)
+
+# Boards up to this many tiles build bitboards by OR-ing into an int
+SMALL_BOARD = 1 << 12
+
+# Distance-field value of walls and of tiles sealed off from the source.
+# Larger than any real path length, so it always compares as farthest.
+UNREACHABLE = 1 << 20
+
+# Distance-field entries a StaticMap caches across all sources (64 MB of
+# int32); at least FIELD_CACHE_MIN_SOURCES fields are kept on any board
+FIELD_CACHE_TILES = 1 << 24
+FIELD_CACHE_MIN_SOURCES = 8
+
+
+class ZobristKeys:
+    """Random 64-bit keys for Zobrist hashing of a map's dynamic state.
+
+    A state's hash is the XOR of the keys of the player tile, the enemy tile,
+    every trap tile, the side to move (enemy_turn, player to move hashes as
+    0) and turn_counter % 3, which decides when the next trap spawns.
+
+    Attributes:
+        player: Per-tile keys for the player position
+        enemy: Per-tile keys for the enemy position
+        trap: Per-tile keys for traps
+        enemy_turn: Key XORed in while it is the enemy's turn
+        phase: Keys for turn_counter % 3
+    """
+
+    __slots__ = ("player", "enemy", "trap", "enemy_turn", "phase")
+
+    def __init__(self, num_tiles, seed=ZOBRIST_SEED):
+        rng = random.Random(seed)
+        self.player = [rng.getrandbits(64) for _ in range(num_tiles)]
+        self.enemy = [rng.getrandbits(64) for _ in range(num_tiles)]
+        self.trap = [rng.getrandbits(64) for _ in range(num_tiles)]
+        self.enemy_turn = rng.getrandbits(64)
+        self.phase = [rng.getrandbits(64) for _ in range(3)]
+
+
+class StaticMap:
+    """Immutable map layout shared by an environment and all of its clones.
+
+    Attributes:
+        width: Grid width in tiles
+        height: Grid height in tiles
+        grid: 2D grid list (grid[y][x]); treated as read-only
+        goal: Goal position as tuple (x, y)
+        walls: Frozenset of wall (x, y) tuples
+        num_walls: Wall count used to generate the map
+        num_traps: Initial trap count used to generate the map
+        wall_mask: Bitboard of wall tiles
+        open_mask: Bitboard of in-bounds tiles that are not walls
+        goal_mask: Bitboard with only the goal tile set
+        version: Number unique to this map (and its wall layout) within
+            the process, for caches keyed by map
+        zobrist: ZobristKeys for this map size, created on first use
+        goal_field: Distance field of the goal, created on first use
+        neighbours: Open neighbours per tile, created on first use
+    """
+
+    __slots__ = (
+        "width",
+        "height",
+        "grid",
+        "goal",
+        "walls",
+        "num_walls",
+        "num_traps",
+        "wall_mask",
+        "open_mask",
+        "goal_mask",
+        "version",
+        "_not_first_col",
+        "_not_last_col",
+        "_move_masks",
+        "_move_sets",
+        "_zobrist",
+        "_distance_fields",
+        "_goal_distances",
+        "field_cache_size",
+        "_neighbours",
+    )
+
+    def __init__(self, width, height, grid, goal, walls, num_walls=0, num_traps=0):
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self.goal = tuple(goal)
+        self.walls = frozenset(walls)
+        self.num_walls = num_walls
+        self.num_traps = num_traps
+
+        board = (1 << (width * height)) - 1
+        first_col = 0
+        for y in range(height):
+            first_col |= 1 << (y * width)
+        last_col = first_col << (width - 1)
+
+        self.wall_mask = self.mask_of(self.walls)
+        self.open_mask = board & ~self.wall_mask
+        self.goal_mask = self.bit(*self.goal)
+        self.version = next(_map_versions)
+        self._not_first_col = board & ~first_col
+        self._not_last_col = board & ~last_col
+
+        # Per-tile reachability tables, keyed by move range
+        self._move_masks = {}
+        self._move_sets = {}
+
+        self._zobrist = None
+
+        # Per-source BFS distances, keyed by flat tile index, LRU order
+        self._distance_fields = OrderedDict()
+        self.field_cache_size = max(
+            FIELD_CACHE_MIN_SOURCES, FIELD_CACHE_TILES // (width * height)
+        )
+        self._goal_distances = None  # Held outside the LRU, read constantly
+        self._neighbours = None
+
+    @property
+    def zobrist(self) -> ZobristKeys:
+        """Zobrist keys for this map, generated the first time they are needed."""
+        if self._zobrist is None:
+            self._zobrist = ZobristKeys(self.width * self.height)
+        return self._zobrist
+
+    # ------------------------------------------------------------------
+    # Bitboard helpers
+    # ------------------------------------------------------------------
+    def index(self, x, y) -> int:
+        """Return the flat tile index of (x, y)."""
+        return y * self.width + x
+
+    def bit(self, x, y) -> int:
+        """Return the bitboard with only tile (x, y) set."""
+        return 1 << (y * self.width + x)
+
+    def mask_of(self, positions) -> int:
+        """Return the bitboard of an iterable of in-bounds (x, y) tuples."""
+        width = self.width
+        if width * self.height <= SMALL_BOARD:
+            mask = 0
+            for x, y in positions:
+                mask |= 1 << (y * width + x)
+            return mask
+
+        # OR-ing into an int copies the whole board per position, which is
+        # quadratic on large maps; set bits in a byte buffer and convert once
+        buffer = bytearray((width * self.height + 7) // 8)
+        for x, y in positions:
+            i = y * width + x
+            buffer[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buffer, "little")
+
+    @staticmethod
+    def indices(mask) -> list:
+        """Return the flat indices of all set bits, in ascending order."""
+        bits = bin(mask)[:1:-1]
+        return [i for i, b in enumerate(bits) if b == "1"]
+
+    def positions(self, mask) -> set:
+        """Return the set of (x, y) tuples for all set bits of a bitboard."""
+        width = self.width
+        return {(i % width, i // width) for i in self.indices(mask)}
+
+    def flood_fill(self, x, y, move_range) -> int:
+        """
+        Return the bitboard of tiles reachable within move_range steps.
+
+        Iterative shift-and-mask flood fill over the open tiles: each round
+        grows the reached region by one orthogonal step. Walls block
+        movement. The start tile itself is excluded from the result.
+
+        Args:
+            x: Start X coordinate
+            y: Start Y coordinate
+            move_range: Maximum number of steps
+
+        Returns:
+            int: Bitboard of reachable tiles
+        """
+        width = self.width
+        open_mask = self.open_mask
+        not_first_col = self._not_first_col
+        not_last_col = self._not_last_col
+
+        start = 1 << (y * width + x)
+        reach = start
+        for _ in range(move_range):
+            grown = reach | (
+                (
+                    ((reach << 1) & not_first_col)
+                    | ((reach >> 1) & not_last_col)
+                    | (reach << width)
+                    | (reach >> width)
+                )
+                & open_mask
+            )
+            if grown == reach:
+                break
+            reach = grown
+
+        return reach & ~start
+
+    # ------------------------------------------------------------------
+    # Move-range tables
+    # ------------------------------------------------------------------
+    def move_mask(self, x, y, move_range) -> int:
+        """
+        Return the reachable-tile bitboard from (x, y), via the lookup table.
+
+        Walls never change during an episode, so the flood fill for a given
+        origin and range is computed once per map and reused by every clone.
+        Table entries are filled on first use.
+
+        Args:
+            x: Start X coordinate
+            y: Start Y coordinate
+            move_range: Maximum number of steps
+
+        Returns:
+            int: Bitboard of reachable tiles (excluding the start)
+        """
+        table = self._move_masks.get(move_range)
+        if table is None:
+            table = self._move_masks[move_range] = [None] * (self.width * self.height)
+        i = y * self.width + x
+        mask = table[i]
+        if mask is None:
+            mask = table[i] = self.flood_fill(x, y, move_range)
+        return mask
+
+    def move_set(self, x, y, move_range) -> frozenset:
+        """
+        Return the reachable tiles from (x, y) as a frozenset of (x, y) tuples.
+
+        Set counterpart of move_mask(), cached in the same way.
+
+        Args:
+            x: Start X coordinate
+            y: Start Y coordinate
+            move_range: Maximum number of steps
+
+        Returns:
+            frozenset: Reachable positions (excluding the start)
+        """
+        table = self._move_sets.get(move_range)
+        if table is None:
+            table = self._move_sets[move_range] = [None] * (self.width * self.height)
+        i = y * self.width + x
+        moves = table[i]
+        if moves is None:
+            moves = table[i] = frozenset(
+                self.positions(self.move_mask(x, y, move_range))
+            )
+        return moves
+
+    # ------------------------------------------------------------------
+    # Distance fields
+    # ------------------------------------------------------------------
+    @property
+    def neighbours(self) -> list:
+        """
+        Open orthogonal neighbours of every tile, created on first use.
+
+        Entry i is a tuple of flat indices in the order AStar expands
+        directions: +x, -x, +y, -y. Wall tiles list their open neighbours too.
+
+        Returns:
+            list: Neighbour tuple per flat tile index (read-only, shared)
+        """
+        if self._neighbours is None:
+            width = self.width
+            tiles = width * self.height
+            is_open = bytearray(tiles)
+            for i in self.indices(self.open_mask):
+                is_open[i] = 1
+
+            table = []
+            for i in range(tiles):
+                x = i % width
+                row = []
+                if x + 1 < width and is_open[i + 1]:
+                    row.append(i + 1)
+                if x > 0 and is_open[i - 1]:
+                    row.append(i - 1)
+                if i + width < tiles and is_open[i + width]:
+                    row.append(i + width)
+                if i >= width and is_open[i - width]:
+                    row.append(i - width)
+                table.append(tuple(row))
+            self._neighbours = table
+        return self._neighbours
+
+    def distances_from(self, x, y) -> array:
+        """
+        Return the shortest-path step count from (x, y) to every tile.
+
+        Breadth-first search over orthogonal steps between open tiles. The
+        result is cached per source, keeping the field_cache_size most
+        recently used sources. Walls and tiles the source cannot reach hold
+        UNREACHABLE. Paths are reversible, so the field also gives the
+        distance from every tile to (x, y).
+
+        Args:
+            x: Source X coordinate
+            y: Source Y coordinate
+
+        Returns:
+            array: int32 distance per flat tile index (read-only, shared)
+        """
+        source = y * self.width + x
+        fields = self._distance_fields
+        distances = fields.get(source)
+        if distances is None:
+            distances = fields[source] = array("i", self._breadth_first(source))
+            if len(fields) > self.field_cache_size:
+                fields.popitem(last=False)
+        else:
+            fields.move_to_end(source)
+        return distances
+
+    def distance_field(self, x, y) -> np.ndarray:
+        """
+        NumPy view of distances_from(), for vectorized lookups.
+
+        Args:
+            x: Source X coordinate
+            y: Source Y coordinate
+
+        Returns:
+            np.ndarray: Read-only int32 view sharing the cached field
+        """
+        field = np.frombuffer(self.distances_from(x, y), dtype=np.int32)
+        field.flags.writeable = False
+        return field
+
+    def distance(self, a, b) -> int:
+        """Return the shortest-path step count between tiles a and b."""
+        return self.distances_from(a[0], a[1])[b[1] * self.width + b[0]]
+
+    @property
+    def goal_distances(self) -> array:
+        """distances_from() the goal, kept for the whole episode."""
+        if self._goal_distances is None:
+            self._goal_distances = array(
+                "i", self._breadth_first(self.goal[1] * self.width + self.goal[0])
+            )
+        return self._goal_distances
+
+    @property
+    def goal_field(self) -> np.ndarray:
+        """NumPy view of goal_distances."""
+        field = np.frombuffer(self.goal_distances, dtype=np.int32)
+        field.flags.writeable = False
+        return field
+
+    def goal_distance(self, x, y) -> int:
+        """Return the shortest-path step count from (x, y) to the goal."""
+        return self.goal_distances[y * self.width + x]
+
+    def _breadth_first(self, source) -> list:
+        """Return BFS step counts from flat index source over open tiles."""
+        width = self.width
+        tiles = width * self.height
+        distances = [UNREACHABLE] * tiles
+        if not (self.open_mask >> source) & 1:
+            return distances
+
+        neighbours = self.neighbours
+
+        distances[source] = 0
+        frontier = [source]
+        step = 0
+        while frontier:
+            step += 1
+            reached = []
+            for tile in frontier:
+                for i in neighbours[tile]:
+                    if distances[i] == UNREACHABLE:
+                        distances[i] = step
+                        reached.append(i)
+            frontier = reached
+        return distances
+
+
+class DynamicState:
+    """Mutable per-node game state.
+
+    Attributes:
+        player_pos: Player position as list [x, y]
+        enemy_pos: Enemy position as list [x, y]
+        traps: Set of trap (x, y) tuples, possibly shared with other states
+        traps_shared: True while traps may be referenced by another state
+        trap_mask: Bitboard of traps, or None when it must be rebuilt from traps
+        turn: Whose turn it is ("player" or "enemy")
+        turn_counter: Number of completed player/enemy rounds
+        hash_key: Zobrist hash of this state, or None until first requested
+    """
+
+    __slots__ = (
+        "player_pos",
+        "enemy_pos",
+        "traps",
+        "traps_shared",
+        "trap_mask",
+        "turn",
+        "turn_counter",
+        "hash_key",
+    )
+
+    def __init__(
+        self,
+        player_pos,
+        enemy_pos,
+        traps,
+        turn="player",
+        turn_counter=0,
+        traps_shared=False,
+        trap_mask=None,
+        hash_key=None,
+    ):
+        self.player_pos = player_pos
+        self.enemy_pos = enemy_pos
+        self.traps = traps
+        self.traps_shared = traps_shared
+        self.trap_mask = trap_mask
+        self.turn = turn
+        self.turn_counter = turn_counter
+        self.hash_key = hash_key
+
+    def copy(self) -> "DynamicState":
+        """Return an independent copy that shares the trap set copy-on-write."""
+        self.traps_shared = True
+        return DynamicState(
+            list(self.player_pos),
+            list(self.enemy_pos),
+            self.traps,
+            self.turn,
+            self.turn_counter,
+            traps_shared=True,
+            trap_mask=self.trap_mask,
+            hash_key=self.hash_key,
+        )
+
+    def own_traps(self) -> set:
+        """Return a trap set that is safe to mutate, copying it if shared."""
+        if self.traps_shared:
+            self.traps = set(self.traps)
+            self.traps_shared = False
+        return self.traps
+
+
+class TrapSet(MutableSet):
+    """Set view of a DynamicState's traps, as TacticalEnvironment.traps.
+
+    Reads go straight to the (possibly shared) trap set. Only add() and
+    discard() detach it from other states with own_traps() and mark the
+    trap bitboard and Zobrist hash for rebuilding.
+    """
+
+    __slots__ = ("_dynamic",)
+
+    def __init__(self, dynamic: DynamicState):
+        self._dynamic = dynamic
+
+    @classmethod
+    def _from_iterable(cls, iterable) -> set:
+        # Results of set operators (a - b, a | b, ...) are plain sets
+        return set(iterable)
+
+    def __contains__(self, position) -> bool:
+        return position in self._dynamic.traps
+
+    def __iter__(self):
+        return iter(self._dynamic.traps)
+
+    def __len__(self) -> int:
+        return len(self._dynamic.traps)
+
+    def __repr__(self) -> str:
+        return f"TrapSet({self._dynamic.traps!r})"
+
+    def add(self, position):
+        """Add a trap, copying the set first if another state shares it."""
+        d = self._dynamic
+        d.own_traps().add(position)
+        d.trap_mask = None
+        d.hash_key = None
+
+    def discard(self, position):
+        """Remove a trap if present, copying a shared set first."""
+        d = self._dynamic
+        if position in d.traps:
+            d.own_traps().discard(position)
+            d.trap_mask = None
+            d.hash_key = None
+
+
+class UndoRecord:
+    """Everything TacticalEnvironment.undo() needs to revert one apply().
+
+    Attributes:
+        player_pos: Player position before the turn
+        enemy_pos: Enemy position before the turn
+        turn: Side that moved
+        turn_counter: Round counter before the turn
+        trap_mask: Trap bitboard before the turn
+        hash_key: Zobrist hash before the turn (None if not tracked)
+        spawned_trap: Trap placed at the end of the turn, or None
+        result: (is_terminal, reason) after the turn
+    """
+
+    __slots__ = (
+        "player_pos",
+        "enemy_pos",
+        "turn",
+        "turn_counter",
+        "trap_mask",
+        "hash_key",
+        "spawned_trap",
+        "result",
+    )
+
+    def __init__(
+        self, player_pos, enemy_pos, turn, turn_counter, trap_mask, hash_key
+    ):
+        self.player_pos = player_pos
+        self.enemy_pos = enemy_pos
+        self.turn = turn
+        self.turn_counter = turn_counter
+        self.trap_mask = trap_mask
+        self.hash_key = hash_key
+        self.spawned_trap = None
+        self.result = (False, None)
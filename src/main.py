@@ -22,6 +22,7 @@ import pygame
 from agents.enemy import EnemyAgent
 from agents.player import PlayerAgent
 from environment.environment import TacticalEnvironment
+from environment.state import DynamicState, StaticMap
 from utils.logger import Logger
 from utils.config_loader import load_config
 
@@ -84,11 +85,90 @@ def create_game_config() -> GameConfig:
     )
 
 
+# Per-process state kept by run_agent_action_worker between jobs: the map of
+# the last snapshot and the player agents (one per algorithm) searching it.
+_WORKER_MAP_KEY = None
+_WORKER_MAP = None
+_WORKER_PLAYERS: Dict[str, PlayerAgent] = {}
+
+
+def worker_environment(snap: Dict[str, Any]) -> TacticalEnvironment:
+    """Rebuild the snapshot's environment around this process's cached map.
+
+    The StaticMap is rebuilt only when the layout changes, so consecutive
+    snapshots of one game share a map object. Player agents kept for an
+    older map are closed and dropped when it is replaced.
+
+    Args:
+        snap: Environment state dict from make_env_snapshot.
+
+    Returns:
+        TacticalEnvironment holding the snapshot's state.
+    """
+    global _WORKER_MAP_KEY, _WORKER_MAP
+
+    map_key = (
+        snap["width"],
+        snap["height"],
+        tuple(snap["goal"]),
+        frozenset(snap["walls"]),
+        snap.get("num_walls", 0),
+        snap.get("num_traps", 0),
+    )
+    if map_key != _WORKER_MAP_KEY:
+        for agent in _WORKER_PLAYERS.values():
+            agent.close()
+        _WORKER_PLAYERS.clear()
+        _WORKER_MAP_KEY = map_key
+        _WORKER_MAP = StaticMap(
+            snap["width"],
+            snap["height"],
+            snap["grid"],
+            snap["goal"],
+            snap["walls"],
+            num_walls=snap.get("num_walls", 0),
+            num_traps=snap.get("num_traps", 0),
+        )
+
+    dynamic = DynamicState(
+        list(snap["player_pos"]),
+        list(snap["enemy_pos"]),
+        set(snap["traps"]),
+        turn=snap["turn"],
+        turn_counter=snap.get("turn_counter", 0),
+    )
+    return TacticalEnvironment._from_parts(_WORKER_MAP, dynamic)
+
+
+def worker_player_agent(env: TacticalEnvironment, algorithm: str) -> PlayerAgent:
+    """Return this process's player agent for algorithm, pointed at env.
+
+    The agent (and with it the MCTS tree) lives as long as the map, so a
+    search can reroot onto the subtree kept from the previous turn.
+
+    Args:
+        env: Environment from worker_environment.
+        algorithm: Algorithm name for the player.
+
+    Returns:
+        PlayerAgent searching env.
+    """
+    agent = _WORKER_PLAYERS.get(algorithm)
+    if agent is None:
+        agent = PlayerAgent(env, algorithm=algorithm)
+        _WORKER_PLAYERS[algorithm] = agent
+    agent.env = env
+    return agent
+
+
 def run_agent_action_worker(args: Tuple[str, str, Dict[str, Any]]):
     """Worker that executes agent action in separate process.
 
-    Reconstructs environment from snapshot, creates agent, runs decision,
-    and returns action with metadata.
+    Reconstructs environment from snapshot, runs the agent's decision, and
+    returns action with metadata. The map and player agents persist in the
+    worker process between jobs, so the MCTS tree kept from the previous
+    turn is reused when consecutive player jobs run in the same process
+    (main() gives player jobs a dedicated single-process pool for this).
 
     Args:
         args: Tuple of (agent_type, algorithm_choice, env_snapshot).
@@ -101,26 +181,13 @@ def run_agent_action_worker(args: Tuple[str, str, Dict[str, Any]]):
     """
     agent_type, algorithm_choice, snap = args
 
-    # Reconstruct environment from snapshot (avoid pygame assets in workers)
-    env = TacticalEnvironment(
-        width=snap["width"],
-        height=snap["height"],
-        num_walls=snap.get("num_walls", 0),
-        num_traps=snap.get("num_traps", 0),
-        seed=None,
-        use_assets=False,
-    )
-    env.grid = snap["grid"]
-    env.player_pos = list(snap["player_pos"])
-    env.enemy_pos = list(snap["enemy_pos"])
-    env.goal = snap["goal"]
-    env.walls = set(snap["walls"])
-    env.traps = set(snap["traps"])
-    env.turn = snap["turn"]
+    # Reconstruct environment from snapshot (no pygame assets; the map is
+    # only regenerated when the layout changes)
+    env = worker_environment(snap)
 
     # Create and run agent
     if agent_type == "player":
-        agent = PlayerAgent(env, algorithm=algorithm_choice)
+        agent = worker_player_agent(env, algorithm_choice)
     else:
         agent = EnemyAgent(env)
 
@@ -179,6 +246,7 @@ def make_env_snapshot(env: TacticalEnvironment) -> dict:
         "walls": list(env.walls),
         "traps": list(env.traps),
         "turn": env.turn,
+        "turn_counter": env.turn_counter,
     }
 
 
@@ -259,6 +327,8 @@ def reset_algorithm_caches(player_agent: PlayerAgent) -> None:
     Args:
         player_agent: Player agent whose caches to reset.
     """
+    player_agent.close()
+    player_agent.path_cache.clear()
     for attr in ("mcts_search", "alphabeta_search", "minimax_search"):
         if hasattr(player_agent, attr):
             setattr(player_agent, attr, None)
@@ -365,6 +435,7 @@ def submit_agent_job(
     player_agent: PlayerAgent,
     pool: Pool,
     log: Logger,
+    player_pool: Optional[Pool] = None,
 ) -> Tuple[Any, str]:
     """Submit agent decision job to worker pool.
 
@@ -373,6 +444,9 @@ def submit_agent_job(
         player_agent: Player agent for algorithm info.
         pool: Multiprocessing pool.
         log: Logger instance.
+        player_pool: Single-process pool for player jobs, so each turn runs
+            in the process holding the previous turn's search tree. Player
+            jobs go to pool when omitted.
 
     Returns:
         Tuple of (pending_future, pending_owner).
@@ -381,7 +455,9 @@ def submit_agent_job(
 
     if env.turn == "player":
         args = ("player", player_agent.algorithm_choice, snap)
-        pending_future = pool.apply_async(run_agent_action_worker, (args,))
+        pending_future = (player_pool or pool).apply_async(
+            run_agent_action_worker, (args,)
+        )
         log.info("Started player worker...")
         return pending_future, "player"
 
@@ -480,6 +556,7 @@ def update_hud_data(
     env.paused = paused
     env.step_requested = step_requested
     env.current_fps = clock.get_fps()
+    env.path_cache_hits = player_agent.path_cache.hits
 
 
 def render_frame(
@@ -537,6 +614,7 @@ def main():
     # Setup Multiprocessing Pool
     cpu_count = os.cpu_count() or 4
     pool = Pool(processes=min(cpu_count, config.max_processes))
+    player_pool = Pool(processes=1)
 
     # Game State Variables
     pending_future = None
@@ -558,7 +636,7 @@ def main():
             can_start_job = not paused or step_requested
             if pending_future is None and can_start_job:
                 pending_future, pending_owner = submit_agent_job(
-                    env, player_agent, pool, log
+                    env, player_agent, pool, log, player_pool
                 )
 
             # Process Completed Jobs
@@ -618,12 +696,14 @@ def main():
             render_frame(env, screen, clock)
 
     finally:
-        # Cleanup: Close multiprocessing pool and pygame
-        try:
-            pool.close()
-            pool.join()
-        except Exception:
-            pool.terminate()
+        # Cleanup: Close multiprocessing pools and pygame
+        player_agent.close()
+        for worker_pool in (player_pool, pool):
+            try:
+                worker_pool.close()
+                worker_pool.join()
+            except Exception:
+                worker_pool.terminate()
         pygame.quit()
 
 
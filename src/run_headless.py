@@ -131,37 +131,40 @@ def run_single_episode(config: EvaluationConfig, episode_index: int = 0) -> str:
     )
     enemy_agent = EnemyAgent(env)
 
-    # Run game loop until terminal state
-    while True:
-        # Get action from current player
-        if env.turn == "player":
-            result = player_agent.action()
-            # Handle both (action, metadata) tuple and plain action formats
-            if (
-                isinstance(result, tuple)
-                and len(result) == 2
-                and isinstance(result[1], dict)
-            ):
-                action = result[0]
+    try:
+        # Run game loop until terminal state
+        while True:
+            # Get action from current player
+            if env.turn == "player":
+                result = player_agent.action()
+                # Handle both (action, metadata) tuple and plain action formats
+                if (
+                    isinstance(result, tuple)
+                    and len(result) == 2
+                    and isinstance(result[1], dict)
+                ):
+                    action = result[0]
+                else:
+                    action = result
             else:
-                action = result
-        else:
-            result = enemy_agent.action()
-            # Handle both (action, metadata) tuple and plain action formats
-            if (
-                isinstance(result, tuple)
-                and len(result) == 2
-                and isinstance(result[1], dict)
-            ):
-                action = result[0]
-            else:
-                action = result
-
-        # Step environment and check for terminal condition
-        is_terminal, reason = env.step(action, simulate=True)
-
-        if is_terminal:
-            return reason
+                result = enemy_agent.action()
+                # Handle both (action, metadata) tuple and plain action formats
+                if (
+                    isinstance(result, tuple)
+                    and len(result) == 2
+                    and isinstance(result[1], dict)
+                ):
+                    action = result[0]
+                else:
+                    action = result
+
+            # Step environment and check for terminal condition
+            is_terminal, reason = env.step(action, simulate=True)
+
+            if is_terminal:
+                return reason
+    finally:
+        player_agent.close()
 
 
 # =============================================================================
@@ -61,25 +61,28 @@ class EpisodeRunner:
         player_agent = PlayerAgent(env, algorithm=algorithm, benchmark_mode=True)
         enemy_agent = EnemyAgent(env)
 
-        # Run game loop
-        move_count = 0
-        while True:
-            # Check move limit
-            if move_count >= config.max_moves_per_episode:
-                return "timeout", move_count
-
-            # Get actions
-            if env.turn == "player":
-                action = EpisodeRunner._extract_action(player_agent.action())
-            else:
-                action = EpisodeRunner._extract_action(enemy_agent.action())
-
-            # Step environment
-            is_terminal, reason = env.step(action, simulate=True)
-            move_count += 1
-
-            if is_terminal:
-                return reason, move_count
+        try:
+            # Run game loop
+            move_count = 0
+            while True:
+                # Check move limit
+                if move_count >= config.max_moves_per_episode:
+                    return "timeout", move_count
+
+                # Get actions
+                if env.turn == "player":
+                    action = EpisodeRunner._extract_action(player_agent.action())
+                else:
+                    action = EpisodeRunner._extract_action(enemy_agent.action())
+
+                # Step environment
+                is_terminal, reason = env.step(action, simulate=True)
+                move_count += 1
+
+                if is_terminal:
+                    return reason, move_count
+        finally:
+            player_agent.close()
 
     @staticmethod
     def _extract_action(result):
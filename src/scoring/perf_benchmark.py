@@ -0,0 +1,1269 @@
+"""Micro-benchmarks for the hot paths used by the search algorithms.
+
+Complements benchmark.py (which measures win rates over full episodes) with
+throughput numbers for the individual building blocks the searches call
+millions of times per game.
+
+Usage (from the repository root):
+    python src/scoring/perf_benchmark.py            # run every benchmark
+    python src/scoring/perf_benchmark.py clone      # run selected benchmarks
+"""
+
+import copy
+import gc
+import heapq
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Suppress pygame welcome message
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
+
+from agents.enemy import EnemyAgent
+from algorithm.alphabeta.alphabeta import AlphaBetaSearch
+from algorithm.astar.astar import AStar
+from algorithm.astar.incremental import IncrementalPlanner
+from algorithm.astar.node import Node
+from algorithm.astar.pathcache import PathCache
+from algorithm.astar.pursuit import Pursuit
+from algorithm.mcts.mcts import MCTS
+from algorithm.mcts.mctsnode import MCTSNode
+from algorithm.mcts.rollout import BatchRollout
+from algorithm.minimax.minimax import MinimaxSearch
+from environment.environment import TacticalEnvironment
+from environment.state import UNREACHABLE
+from utils.logger import Logger
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Matches the map used by benchmark.py (configs/config.yaml)
+GRID_WIDTH = 30
+GRID_HEIGHT = 15
+NUM_WALLS = 125
+NUM_TRAPS = 20
+ENVIRONMENT_SEED = 1
+
+
+def create_benchmark_env() -> TacticalEnvironment:
+    """Create the benchmark map used by every micro-benchmark.
+
+    Returns:
+        TacticalEnvironment on the 30x15 / 125-wall benchmark layout.
+    """
+    return TacticalEnvironment(
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        num_walls=NUM_WALLS,
+        num_traps=NUM_TRAPS,
+        seed=ENVIRONMENT_SEED,
+    )
+
+
+def create_midgame_env(turns: int = 8) -> TacticalEnvironment:
+    """Create the benchmark map advanced a few turns into the game.
+
+    The player walks greedily towards the goal and the enemy chases with
+    EnemyAgent, which gives a more open position than the starting corner.
+
+    Args:
+        turns: Number of single-side turns to play
+
+    Returns:
+        TacticalEnvironment in a mid-game position.
+    """
+    env = create_benchmark_env()
+    enemy_agent = EnemyAgent(env)
+    random.seed(ENVIRONMENT_SEED)
+
+    for _ in range(turns):
+        if env.turn == "player":
+            goal = env.goal
+            action = min(
+                sorted(env.get_valid_actions()),
+                key=lambda a: abs(a[0] - goal[0]) + abs(a[1] - goal[1]),
+            )
+        else:
+            action = enemy_agent.action()
+        is_terminal, _ = env.step(action)
+        if is_terminal:
+            break
+
+    random.seed(None)
+    return env
+
+
+def _rate(fn: Callable[[], None], repeats: int) -> float:
+    """Call fn repeatedly and return calls per second."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = time.perf_counter() - start
+    return repeats / elapsed if elapsed > 0 else float("inf")
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+def _legacy_clone(env: TacticalEnvironment) -> TacticalEnvironment:
+    """Clone the way clone() originally did.
+
+    Runs the full constructor (map generation included) and then deep-copies
+    every container, including the static grid and walls.
+    """
+    TacticalEnvironment(
+        width=env.width,
+        height=env.height,
+        num_walls=env.num_walls,
+        num_traps=env.num_traps,
+        seed=None,
+        use_assets=False,
+    )
+    return _private_copy(env)
+
+
+def _private_copy(env: TacticalEnvironment) -> TacticalEnvironment:
+    """Copy an environment without sharing any container with the source."""
+    return TacticalEnvironment.from_state(
+        width=env.width,
+        height=env.height,
+        grid=copy.deepcopy(env.grid),
+        player_pos=list(env.player_pos),
+        enemy_pos=list(env.enemy_pos),
+        goal=env.goal,
+        walls=set(env.walls),
+        traps=set(env.traps),
+        turn=env.turn,
+        turn_counter=env.turn_counter,
+        num_walls=env.num_walls,
+        num_traps=env.num_traps,
+    )
+
+
+def _bytes_per_item(make: Callable[[], object], count: int) -> float:
+    """Measure the retained heap size of one object built by make()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [make() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def bench_clone(repeats: int = 2000) -> Dict[str, float]:
+    """Measure clones per second for the legacy and the fast clone path.
+
+    Args:
+        repeats: Number of clones per measurement
+
+    Returns:
+        Dict with legacy/fast clones per second and the speedup
+    """
+    env = create_benchmark_env()
+
+    legacy = _rate(lambda: _legacy_clone(env), repeats)
+    fast = _rate(env.clone, repeats)
+
+    return {
+        "legacy_clones_per_sec": legacy,
+        "fast_clones_per_sec": fast,
+        "speedup": fast / legacy,
+    }
+
+
+def bench_memory(count: int = 2000, iterations: int = 300) -> Dict[str, float]:
+    """Measure per-clone and per-MCTS-node memory on the benchmark map.
+
+    Args:
+        count: Number of clones to allocate for the per-clone measurement
+        iterations: MCTS iterations used to grow the measured tree
+
+    Returns:
+        Dict with bytes per private copy, bytes per clone and bytes per node
+    """
+    env = create_benchmark_env()
+
+    private_bytes = _bytes_per_item(lambda: _private_copy(env), count)
+    clone_bytes = _bytes_per_item(env.clone, count)
+
+    mcts = MCTS(iterations=iterations, max_sim_depth=5, transposition_size=0)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = MCTSNode(state=env.clone())
+    for _ in range(iterations):
+        leaf = mcts.expansion(mcts.selection(root))
+        mcts.backpropagation(leaf, mcts.simulation(leaf))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = MCTS._count_nodes(root)
+
+    return {
+        "private_copy_bytes": private_bytes,
+        "shared_clone_bytes": clone_bytes,
+        "clone_reduction": private_bytes / clone_bytes,
+        "mcts_nodes": nodes,
+        "mcts_bytes_per_node": (after - before) / nodes,
+    }
+
+
+def _bfs_move_range(env: TacticalEnvironment, pos, move_range: int) -> set:
+    """Reachability the way get_move_range originally computed it (deque BFS)."""
+    queue = deque([(tuple(pos), 0)])
+    visited = {tuple(pos)}
+    while queue:
+        (x, y), dist = queue.popleft()
+        if dist >= move_range:
+            continue
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = x + dx, y + dy
+            if not env.in_bounds(nx, ny) or (nx, ny) in visited:
+                continue
+            if (nx, ny) in env.walls:
+                continue
+            visited.add((nx, ny))
+            queue.append(((nx, ny), dist + 1))
+    visited.discard(tuple(pos))
+    return visited
+
+
+def bench_move_range(repeats: int = 20) -> Dict[str, float]:
+    """Measure move-range queries per second over every open tile.
+
+    Args:
+        repeats: Number of sweeps over all open tiles
+
+    Returns:
+        Dict with BFS, flood-fill (set and mask) and table lookup rates
+    """
+    env = create_benchmark_env()
+    tiles = [
+        [x, y]
+        for y in range(env.height)
+        for x in range(env.width)
+        if not env.is_blocked(x, y)
+    ]
+    flood_fill = env.static_map.flood_fill
+
+    def sweep(query):
+        def run():
+            for pos in tiles:
+                query(pos)
+
+        return _rate(run, repeats) * len(tiles)
+
+    return {
+        "bfs_queries_per_sec": sweep(lambda pos: _bfs_move_range(env, pos, 3)),
+        "set_queries_per_sec": sweep(
+            lambda pos: env.static_map.positions(flood_fill(pos[0], pos[1], 3))
+        ),
+        "mask_queries_per_sec": sweep(lambda pos: flood_fill(pos[0], pos[1], 3)),
+        "table_queries_per_sec": sweep(lambda pos: env.get_move_range(pos, 3)),
+    }
+
+
+def bench_distance_fields(repeats: int = 20) -> Dict[str, float]:
+    """Measure BFS distance fields against the Manhattan estimate they replace.
+
+    Args:
+        repeats: Number of sweeps over all open tiles for the lookup rates
+
+    Returns:
+        Dict with field build times, lookup rates, and how often and by how
+        much Manhattan distance underestimates the true path to the goal
+    """
+    env = create_benchmark_env()
+    static_map = env.static_map
+    goal = env.goal
+
+    start = time.perf_counter()
+    goal_distances = static_map.goal_distances
+    field_ms = (time.perf_counter() - start) * 1000.0
+
+    tiles = [
+        (x, y)
+        for y in range(env.height)
+        for x in range(env.width)
+        if goal_distances[y * env.width + x] < UNREACHABLE
+    ]
+
+    def manhattan():
+        for x, y in tiles:
+            abs(x - goal[0]) + abs(y - goal[1])
+
+    def field():
+        for x, y in tiles:
+            static_map.goal_distance(x, y)
+
+    gaps = [
+        static_map.goal_distance(x, y) - abs(x - goal[0]) - abs(y - goal[1])
+        for x, y in tiles
+    ]
+    return {
+        "goal_field_build_ms": field_ms,
+        "manhattan_lookups_per_sec": _rate(manhattan, repeats) * len(tiles),
+        "field_lookups_per_sec": _rate(field, repeats) * len(tiles),
+        "manhattan_wrong_pct": 100.0 * sum(gap > 0 for gap in gaps) / len(gaps),
+        "manhattan_mean_underestimate": sum(gaps) / len(gaps),
+        "manhattan_max_underestimate": max(gaps),
+    }
+
+
+def bench_pursuit(episodes: int = 30, moves: int = 60) -> Dict[str, float]:
+    """Compare the per-turn A* chase with the field-based Pursuit engine.
+
+    Enemy positions are collected from episodes with a random player, then
+    every enemy move is recomputed with both. Pursuit runs on a fresh map
+    (with only the goal field built, as the evaluators already need it), so
+    its timing includes building each player distance field.
+
+    Args:
+        episodes: Seeded episodes to collect enemy turns from
+        moves: Maximum single-side turns per episode
+
+    Returns:
+        Dict with milliseconds per enemy move for both engines, and the
+        share of Pursuit moves that were direct field lookups
+    """
+    pairs = []
+    for seed in range(1, episodes + 1):
+        env = create_benchmark_env()
+        enemy_agent = EnemyAgent(env)
+        rng = random.Random(seed)
+        for _ in range(moves):
+            if env.turn == "player":
+                action = rng.choice(sorted(env.get_valid_actions()))
+            else:
+                pairs.append((tuple(env.enemy_pos), tuple(env.player_pos)))
+                action = enemy_agent.action()
+            if env.step(action)[0]:
+                break
+
+    env = create_benchmark_env()
+    start = time.perf_counter()
+    for enemy, player in pairs:
+        AStar(env).chase_move(enemy, player, 2)
+    astar_ms = (time.perf_counter() - start) * 1000.0 / len(pairs)
+
+    static_map = create_benchmark_env().static_map
+    static_map.goal_field
+    pursuit = Pursuit(move_range=2)
+    start = time.perf_counter()
+    for enemy, player in pairs:
+        pursuit.chase_move(static_map, enemy, player)
+    pursuit_ms = (time.perf_counter() - start) * 1000.0 / len(pairs)
+
+    return {
+        "enemy_moves": len(pairs),
+        "astar_ms_per_move": astar_ms,
+        "pursuit_ms_per_move": pursuit_ms,
+        "speedup": astar_ms / pursuit_ms,
+        "field_lookup_pct": 100.0 * pursuit.lookups / len(pairs),
+    }
+
+
+def _legacy_astar(a_star: AStar, start, goal):
+    """A* the way AStar.search() originally ran: a Node object per generated
+    neighbour and env.in_bounds()/is_blocked() calls per expansion."""
+    start_node = Node(parent=None, position=start)
+    goal_node = Node(parent=None, position=goal)
+    open_heap = [(0, 0, start_node)]
+    counter = 1
+    open_set = {start: start_node}
+    closed_set = set()
+
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        closed_set.add(current.position)
+        if current == goal_node:
+            path = []
+            while current is not None:
+                path.append(current.position)
+                current = current.parent
+            return path[::-1]
+
+        for neighbor in a_star.get_neighbors(current):
+            if neighbor.position in closed_set:
+                continue
+            tentative_g = current.g + 1
+            if (
+                neighbor.position not in open_set
+                or tentative_g < open_set[neighbor.position].g
+            ):
+                neighbor.g = tentative_g
+                neighbor.h = a_star.heuristic(neighbor.position, goal)
+                neighbor.f = neighbor.g + neighbor.h
+                neighbor.parent = current
+                open_set[neighbor.position] = neighbor
+                heapq.heappush(open_heap, (neighbor.f, counter, neighbor))
+                counter += 1
+    return None
+
+
+def bench_astar(
+    sizes=((30, 15), (200, 200), (1000, 1000)), queries: int = 20
+) -> Dict[str, float]:
+    """Compare the array-based AStar.search() with the original Node-based A*.
+
+    Maps keep the benchmark map's wall density. Each size is queried from
+    the player start to the goal and between seeded random open tiles; the
+    query count shrinks with map size, and the Node-based search is skipped
+    at 1000x1000, where every is_blocked() call shifts a million-bit mask.
+
+    Args:
+        sizes: (width, height) map sizes
+        queries: Queries on the smallest map
+
+    Returns:
+        Dict with one-off neighbour-table build time, milliseconds per
+        search for both versions and tiles expanded per search, per size
+    """
+    density = NUM_WALLS / (GRID_WIDTH * GRID_HEIGHT)
+    results = {}
+
+    for width, height in sizes:
+        tiles = width * height
+        env = TacticalEnvironment(
+            width=width,
+            height=height,
+            num_walls=int(density * tiles),
+            num_traps=0,
+            seed=ENVIRONMENT_SEED,
+        )
+        static_map = env.static_map
+        open_tiles = static_map.indices(static_map.open_mask)
+        rng = random.Random(ENVIRONMENT_SEED)
+        count = max(2, queries * GRID_WIDTH * GRID_HEIGHT // tiles)
+        pairs = [(tuple(env.player_pos), env.goal)]
+        for _ in range(count - 1):
+            a, b = rng.sample(open_tiles, 2)
+            pairs.append(((a % width, a // width), (b % width, b // width)))
+
+        label = f"{width}x{height}"
+        start = time.perf_counter()
+        static_map.neighbours
+        results[f"{label}_table_build_ms"] = (time.perf_counter() - start) * 1000.0
+
+        a_star = AStar(env)
+        expanded = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            a_star.search(source, target)
+            expanded += a_star.expanded
+        results[f"{label}_array_ms"] = (
+            (time.perf_counter() - start) * 1000.0 / len(pairs)
+        )
+        results[f"{label}_expanded"] = expanded / len(pairs)
+
+        if tiles <= 200 * 200:
+            start = time.perf_counter()
+            for source, target in pairs:
+                _legacy_astar(a_star, source, target)
+            results[f"{label}_node_ms"] = (
+                (time.perf_counter() - start) * 1000.0 / len(pairs)
+            )
+
+    return results
+
+
+def _chase_trajectory(env: TacticalEnvironment, replans: int, rng: random.Random) -> list:
+    """Collect (enemy, player) positions of chases on env's map.
+
+    The enemy moves two tiles along a shortest path per turn and the player
+    random-walks three tiles; a caught or cut-off player starts a new chase
+    between two random open tiles.
+    """
+    static_map = env.static_map
+    width = static_map.width
+    neighbours = static_map.neighbours
+    open_tiles = static_map.indices(static_map.open_mask)
+    planner = IncrementalPlanner(move_range=2)
+
+    pairs = []
+    enemy = player = None
+    while len(pairs) < replans:
+        if enemy is None:
+            a, b = rng.sample(open_tiles, 2)
+            enemy, player = (a % width, a // width), (b % width, b // width)
+        tile = player[1] * width + player[0]
+        for _ in range(3):
+            if neighbours[tile]:
+                tile = rng.choice(neighbours[tile])
+        player = (tile % width, tile // width)
+
+        enemy, path = planner.chase_move(static_map, enemy, player)
+        if path is None or enemy == player:
+            enemy = None
+            continue
+        pairs.append((path[0], player))
+    return pairs
+
+
+def bench_incremental(
+    sizes=((30, 15), (200, 200), (1000, 1000)), replans: int = 40
+) -> Dict[str, float]:
+    """Compare per-turn replanning from scratch with IncrementalPlanner.
+
+    Maps keep the benchmark map's wall density. The same chase trajectory
+    is replanned by AStar.search(), by the planner with reuse disabled and
+    by the planner continuing its previous search tree; the replan count
+    shrinks on the 1000x1000 map, where a full search takes ~0.2 s.
+
+    Args:
+        sizes: (width, height) map sizes
+        replans: Enemy turns to replan per map below 1000x1000
+
+    Returns:
+        Dict with tiles expanded and milliseconds per replan for all three,
+        and the share of replans that reused the previous tree, per size
+    """
+    density = NUM_WALLS / (GRID_WIDTH * GRID_HEIGHT)
+    results = {}
+
+    for width, height in sizes:
+        env = TacticalEnvironment(
+            width=width,
+            height=height,
+            num_walls=int(density * width * height),
+            num_traps=0,
+            seed=ENVIRONMENT_SEED,
+        )
+        static_map = env.static_map
+        count = replans if width * height < 1000 * 1000 else max(2, replans // 4)
+        pairs = _chase_trajectory(env, count, random.Random(ENVIRONMENT_SEED))
+
+        label = f"{width}x{height}"
+        a_star = AStar(env)
+        expanded = 0
+        start = time.perf_counter()
+        for enemy, player in pairs:
+            a_star.search(enemy, player)
+            expanded += a_star.expanded
+        results[f"{label}_astar_ms"] = (time.perf_counter() - start) * 1000.0 / len(pairs)
+        results[f"{label}_astar_expanded"] = expanded / len(pairs)
+
+        for name, reuse in (("fresh", False), ("incremental", True)):
+            planner = IncrementalPlanner(move_range=2, reuse=reuse)
+            start = time.perf_counter()
+            for enemy, player in pairs:
+                planner.plan(static_map, enemy, player)
+            results[f"{label}_{name}_ms"] = (
+                (time.perf_counter() - start) * 1000.0 / len(pairs)
+            )
+            results[f"{label}_{name}_expanded"] = planner.total_expanded / len(pairs)
+        results[f"{label}_reused_pct"] = 100.0 * planner.reused / len(pairs)
+
+    return results
+
+
+def bench_path_cache(frames: int = 300, frames_per_turn: int = 10) -> Dict[str, float]:
+    """Measure the per-frame path previews with and without the path cache.
+
+    Replays the pygame loop's calls: every frame asks for the enemy and the
+    player path, and a unit moves every frames_per_turn frames.
+
+    Args:
+        frames: Frames to simulate
+        frames_per_turn: Frames between two moves
+
+    Returns:
+        Dict with milliseconds per frame for fresh A* searches and for the
+        cache, and the cache hit rate
+    """
+    env = create_benchmark_env()
+    enemy_agent = EnemyAgent(env)
+    positions = []
+    for _ in range(frames // frames_per_turn + 1):
+        positions.append((tuple(env.enemy_pos), tuple(env.player_pos)))
+        if env.turn == "player":
+            goal = env.goal
+            action = min(
+                sorted(env.get_valid_actions()),
+                key=lambda a: abs(a[0] - goal[0]) + abs(a[1] - goal[1]),
+            )
+        else:
+            action = enemy_agent.action()
+        if env.step(action)[0]:
+            break
+    frame_positions = [
+        positions[min(frame // frames_per_turn, len(positions) - 1)]
+        for frame in range(frames)
+    ]
+
+    start = time.perf_counter()
+    for enemy, player in frame_positions:
+        AStar(env).search(enemy, player)
+        AStar(env).search(player, env.goal)
+    fresh_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    cache = PathCache()
+    start = time.perf_counter()
+    for enemy, player in frame_positions:
+        cache.path(env, enemy, player)
+        cache.path(env, player, env.goal)
+    cached_ms = (time.perf_counter() - start) * 1000.0 / frames
+
+    return {
+        "fresh_ms_per_frame": fresh_ms,
+        "cached_ms_per_frame": cached_ms,
+        "hit_rate": cache.hits / (cache.hits + cache.misses),
+    }
+
+
+def bench_search(depths=(4, 5)) -> Dict[str, float]:
+    """Measure tree search throughput with cloning vs apply()/undo().
+
+    Args:
+        depths: AlphaBeta depths to measure; Minimax runs one ply shallower
+
+    Returns:
+        Dict with AlphaBeta nodes/sec and Minimax searches/sec per mode
+    """
+    env = create_midgame_env()
+    results = {}
+
+    # Warm the shared move-range tables so both modes see the same cache
+    AlphaBetaSearch(max_depth=max(depths)).search(env.clone())
+
+    for depth in depths:
+        for label, in_place in (("clone", False), ("in_place", True)):
+            search = AlphaBetaSearch(max_depth=depth, in_place=in_place, tt_size=0)
+            best = 0.0
+            for _ in range(3):
+                start = time.perf_counter()
+                _, meta = search.search(env.clone())
+                elapsed = time.perf_counter() - start
+                best = max(best, meta["nodes_visited"] / elapsed)
+            results[f"alphabeta_d{depth}_{label}_nodes_per_sec"] = best
+
+    for depth in depths:
+        depth -= 1
+        for label, in_place in (("clone", False), ("in_place", True)):
+            search = MinimaxSearch(max_depth=depth, in_place=in_place, memo_size=0)
+            results[f"minimax_d{depth}_{label}_searches_per_sec"] = _rate(
+                lambda: search.search(env.clone()), 1
+            )
+
+    return results
+
+
+def bench_alphabeta_tt(depths=(4, 5)) -> Dict[str, float]:
+    """Compare AlphaBeta with and without the transposition table.
+
+    Args:
+        depths: Search depths to measure
+
+    Returns:
+        Dict with nodes visited, search time and TT hit rate per depth
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for depth in depths:
+        for label, tt_size in (("no_tt", 0), ("tt", 1 << 16)):
+            search = AlphaBetaSearch(max_depth=depth, in_place=True, tt_size=tt_size)
+            start = time.perf_counter()
+            _, meta = search.search(env.clone())
+            results[f"d{depth}_{label}_seconds"] = time.perf_counter() - start
+            results[f"d{depth}_{label}_nodes"] = meta["nodes_visited"]
+            if tt_size:
+                results[f"d{depth}_tt_hit_rate"] = meta["tt_hit_rate"]
+
+    return results
+
+
+def bench_alphabeta_ordering(depths=(4, 5)) -> Dict[str, float]:
+    """Compare AlphaBeta nodes and cutoff quality with and without ordering.
+
+    Args:
+        depths: Search depths to measure
+
+    Returns:
+        Dict with nodes visited and first-move cutoff rate per depth
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for depth in depths:
+        for label, ordering in (("unordered", False), ("ordered", True)):
+            search = AlphaBetaSearch(
+                max_depth=depth, in_place=True, move_ordering=ordering
+            )
+            start = time.perf_counter()
+            _, meta = search.search(env.clone())
+            results[f"d{depth}_{label}_seconds"] = time.perf_counter() - start
+            results[f"d{depth}_{label}_nodes"] = meta["nodes_visited"]
+            results[f"d{depth}_{label}_first_cutoff_rate"] = meta[
+                "first_move_cutoff_rate"
+            ]
+
+    return results
+
+
+def bench_mcts_parallel(iterations: int = 400, workers=(1, 2, 4)) -> Dict[str, float]:
+    """Measure root-parallel MCTS: wall time and nodes searched per move.
+
+    Every worker grows a full tree of `iterations`, so with N workers the
+    move is chosen from N times as many samples.
+
+    Args:
+        iterations: Iterations per tree
+        workers: Worker counts to measure
+
+    Returns:
+        Dict with seconds and combined nodes per worker count
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for count in workers:
+        mcts = MCTS(iterations=iterations, max_sim_depth=5, workers=count)
+        try:
+            # First call pays for starting the pool
+            mcts.search(env.clone())
+            random.seed(ENVIRONMENT_SEED)
+            start = time.perf_counter()
+            result = mcts.search(env.clone())
+            elapsed = time.perf_counter() - start
+        finally:
+            mcts.close()
+
+        meta = result[1] if isinstance(result, tuple) else {}
+        results[f"w{count}_seconds"] = elapsed
+        results[f"w{count}_nodes"] = meta.get("nodes_visited", 0)
+        results[f"w{count}_nodes_per_second"] = (
+            meta.get("nodes_visited", 0) / elapsed if elapsed else 0.0
+        )
+
+    return results
+
+
+def bench_mcts_reuse(iterations: int = 200, turns: int = 12) -> Dict[str, float]:
+    """Measure how much of the MCTS tree survives between player turns.
+
+    Plays the same game (MCTS player vs EnemyAgent) with and without tree
+    reuse and reports the root visits available at each decision.
+
+    Args:
+        iterations: Iterations per move
+        turns: Player turns to play
+
+    Returns:
+        Dict with mean root visits, reuse hit rate and seconds per move
+    """
+    results = {}
+
+    for label, reuse in (("fresh", False), ("reuse", True)):
+        env = create_benchmark_env()
+        enemy_agent = EnemyAgent(env)
+        mcts = MCTS(iterations=iterations, max_sim_depth=5, reuse_tree=reuse)
+        random.seed(ENVIRONMENT_SEED)
+
+        root_visits = []
+        reused = 0
+        elapsed = 0.0
+        for _ in range(turns):
+            start = time.perf_counter()
+            result = mcts.search(env.clone())
+            elapsed += time.perf_counter() - start
+            if not isinstance(result, tuple):
+                break
+            action, meta = result
+            reused += meta["reused_visits"] > 0
+            root_visits.append(iterations + meta["reused_visits"])
+
+            if env.step(action)[0] or env.step(enemy_agent.action())[0]:
+                break
+
+        moves = len(root_visits)
+        results[f"{label}_mean_root_visits"] = sum(root_visits) / moves
+        results[f"{label}_reuse_rate"] = reused / moves
+        results[f"{label}_seconds_per_move"] = elapsed / moves
+
+    return results
+
+
+def bench_mcts_tree(iterations: int = 2000) -> Dict[str, float]:
+    """Compare the linked MCTSNode tree with the array-backed tree.
+
+    Args:
+        iterations: MCTS iterations used to grow each tree
+
+    Returns:
+        Dict with bytes per expanded node, iterations per second and node
+        count for each tree store
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for store in MCTS.TREE_STORES:
+        mcts = MCTS(iterations=iterations, max_sim_depth=5, tree_store=store)
+        random.seed(ENVIRONMENT_SEED)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        root = mcts._grow_tree(env.clone())
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        nodes = mcts._count_nodes(root)
+        results[f"{store}_nodes"] = nodes
+        results[f"{store}_bytes_per_node"] = (after - before) / nodes
+        results[f"{store}_iterations_per_second"] = iterations / elapsed
+        del root
+
+    results["memory_reduction"] = (
+        results["nodes_bytes_per_node"] / results["array_bytes_per_node"]
+    )
+    return results
+
+
+def bench_rollouts(batch_sizes=(16, 64, 256), rollouts: int = 2000) -> Dict[str, float]:
+    """Compare simulated plies per second of scalar and batched rollouts.
+
+    Args:
+        batch_sizes: Rollouts played in lockstep per BatchRollout.run() call
+        rollouts: Total rollouts per measurement
+
+    Returns:
+        Dict with plies per second for the scalar rollout and each batch size
+    """
+    env = create_midgame_env()
+    mcts = MCTS(max_sim_depth=20)
+    results = {}
+
+    random.seed(ENVIRONMENT_SEED)
+    plies = 0
+    start = time.perf_counter()
+    for _ in range(rollouts):
+        state = env.clone()
+        mcts._rollout(state)
+        plies += 2 * (state.turn_counter - env.turn_counter) + (
+            state.turn != env.turn
+        )
+    scalar_rate = plies / (time.perf_counter() - start)
+    results["scalar_plies_per_second"] = scalar_rate
+
+    engine = BatchRollout(env.static_map)
+    for size in batch_sizes:
+        engine.simulated_plies = 0
+        start = time.perf_counter()
+        for _ in range(rollouts // size):
+            engine.run(env, size, 20)
+        rate = engine.simulated_plies / (time.perf_counter() - start)
+        results[f"batch{size}_plies_per_second"] = rate
+        results[f"batch{size}_speedup"] = rate / scalar_rate
+
+    return results
+
+
+def bench_mcts_root_policy(
+    budgets=(50, 100, 200),
+    positions: int = 6,
+    seeds: int = 5,
+    reference_iterations: int = 1000,
+) -> Dict[str, float]:
+    """Compare the decision quality of UCB1 and Sequential Halving at the root.
+
+    Every root move of each position is first valued by a separate search of
+    reference_iterations from the state it leads to. A root policy's regret
+    is the reference value of the best move minus that of the move it picks.
+
+    Args:
+        budgets: Iterations per search to compare
+        positions: Midgame positions searched
+        seeds: Searches per position, budget and policy
+        reference_iterations: Iterations used to value each root move
+
+    Returns:
+        Dict with mean regret (in percent of reward) and mean search time
+        (ms) per policy and budget
+    """
+    states = [create_midgame_env(turns=2 * i) for i in range(positions)]
+    states = [state for state in states if not state.is_terminal()[0]]
+
+    references = []
+    for state in states:
+        values = {}
+        for action in state.get_valid_actions(unit="current"):
+            child = state.clone()
+            random.seed(ENVIRONMENT_SEED)
+            child.step(action, simulate=True)
+            reference = MCTS(iterations=reference_iterations, max_sim_depth=5)
+            root = reference._grow_tree(child)
+            if root.visits:
+                values[action] = root.total_wins / root.visits
+            else:
+                values[action] = MCTS._proven_reward(root.proven)
+        references.append(values)
+
+    results = {}
+    for budget in budgets:
+        for policy in MCTS.ROOT_POLICIES:
+            regret = elapsed = 0.0
+            searches = 0
+            for state, values in zip(states, references):
+                for seed in range(seeds):
+                    random.seed(seed)
+                    mcts = MCTS(
+                        iterations=budget,
+                        max_sim_depth=5,
+                        reuse_tree=False,
+                        root_policy=policy,
+                    )
+                    start = time.perf_counter()
+                    action, _ = mcts.search(state.clone())
+                    elapsed += time.perf_counter() - start
+                    regret += max(values.values()) - values[action]
+                    searches += 1
+            results[f"{policy}{budget}_regret_pct"] = 100.0 * regret / searches
+            results[f"{policy}{budget}_ms"] = elapsed * 1000.0 / searches
+
+    return results
+
+
+def bench_mcts_memory_cap(
+    iterations: int = 4000, caps=(None, 1000, 250)
+) -> Dict[str, float]:
+    """Measure peak memory and throughput of MCTS under a node budget.
+
+    Args:
+        iterations: MCTS iterations per search
+        caps: Node budgets to compare (None = unbounded)
+
+    Returns:
+        Dict with final nodes, pruned nodes, estimated and peak traced bytes
+        and iterations per second for each cap
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for cap in caps:
+        mcts = MCTS(
+            iterations=iterations, max_sim_depth=50, reuse_tree=False, max_nodes=cap
+        )
+        random.seed(ENVIRONMENT_SEED)
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        root = mcts._grow_tree(env.clone())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        label = f"cap{cap or 'none'}"
+        results[f"{label}_nodes"] = mcts._count_nodes(root)
+        results[f"{label}_pruned_nodes"] = mcts._run_stats["pruned_nodes"]
+        results[f"{label}_tree_bytes"] = mcts._run_stats["tree_bytes"]
+        results[f"{label}_peak_bytes"] = peak
+        results[f"{label}_iterations_per_second"] = iterations / elapsed
+        del root
+
+    return results
+
+
+def _play_episode(search, seed: int, max_moves: int = 300) -> str:
+    """Play one episode of search (as the player) against EnemyAgent.
+
+    Args:
+        search: Search object with search(state) -> (action, meta)
+        seed: Environment and random seed
+        max_moves: Single-side moves before the episode is a timeout
+
+    Returns:
+        str: "goal", "trap", "caught" or "timeout"
+    """
+    random.seed(seed)
+    env = TacticalEnvironment(
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        num_walls=NUM_WALLS,
+        num_traps=NUM_TRAPS,
+        seed=seed,
+    )
+    enemy_agent = EnemyAgent(env)
+
+    for _ in range(max_moves):
+        if env.turn == "player":
+            action, _ = search.search(env.clone())
+        else:
+            action = enemy_agent.action()
+        is_terminal, reason = env.step(action)
+        if is_terminal:
+            return reason
+    return "timeout"
+
+
+def bench_enemy_model(depths=(4, 6), episodes: int = 10) -> Dict[str, float]:
+    """Compare AlphaBeta with an adversarial enemy and with the A* enemy model.
+
+    Args:
+        depths: Search depths to compare
+        episodes: Seeded episodes played per depth and model
+
+    Returns:
+        Dict with mean nodes and milliseconds per search on the midgame
+        positions, and the episode win rate, per depth and enemy model
+    """
+    states = [create_midgame_env(turns=2 * i) for i in range(8)]
+    states = [state for state in states if not state.is_terminal()[0]]
+    results = {}
+
+    for depth in depths:
+        for model in AlphaBetaSearch.ENEMY_MODELS:
+            search = AlphaBetaSearch(max_depth=depth, in_place=True, enemy_model=model)
+            nodes = 0
+            start = time.perf_counter()
+            for state in states:
+                _, meta = search.search(state.clone())
+                nodes += meta["nodes_visited"]
+            elapsed = time.perf_counter() - start
+
+            wins = 0
+            for seed in range(1, episodes + 1):
+                search = AlphaBetaSearch(
+                    max_depth=depth, in_place=True, enemy_model=model
+                )
+                wins += _play_episode(search, seed) == "goal"
+
+            label = f"{model}_d{depth}"
+            results[f"{label}_nodes"] = nodes / len(states)
+            results[f"{label}_ms"] = elapsed * 1000.0 / len(states)
+            results[f"{label}_win_rate"] = wins / episodes
+
+    return results
+
+
+def bench_minimax_memo(depths=(3, 4, 5)) -> Dict[str, float]:
+    """Compare plain, memoized and alpha-beta Minimax on the midgame position.
+
+    The exhaustive search is skipped at depth 5, where it takes minutes.
+
+    Args:
+        depths: Search depths to compare
+
+    Returns:
+        Dict with nodes visited, milliseconds and memo hit rate per depth
+        and variant
+    """
+    env = create_midgame_env()
+    variants = (
+        ("plain", {"memo_size": 0}),
+        ("memo", {}),
+        ("alpha_beta", {"memo_size": 0, "alpha_beta": True}),
+        ("memo_alpha_beta", {"alpha_beta": True}),
+    )
+    results = {}
+
+    for depth in depths:
+        for label, options in variants:
+            if depth >= 5 and not options.get("alpha_beta"):
+                continue
+            search = MinimaxSearch(max_depth=depth, in_place=True, **options)
+            random.seed(ENVIRONMENT_SEED)
+            start = time.perf_counter()
+            _, meta = search.search(env.clone())
+            elapsed = time.perf_counter() - start
+
+            results[f"d{depth}_{label}_nodes"] = meta["nodes_visited"]
+            results[f"d{depth}_{label}_ms"] = elapsed * 1000.0
+            results[f"d{depth}_{label}_memo_hit_rate"] = meta["memo_hit_rate"]
+
+    return results
+
+
+def _percentile(samples, fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def bench_alphabeta_latency(
+    depth: int = 6, budget_ms: float = 200.0, positions: int = 12
+) -> Dict[str, float]:
+    """Compare per-move AlphaBeta latency at fixed depth vs a time budget.
+
+    Searches a series of positions along one game, first at a fixed depth
+    and then as iterative deepening capped at the same depth.
+
+    Args:
+        depth: Fixed search depth / deepening cap
+        budget_ms: Per-move budget for the iterative-deepening search
+        positions: Number of positions to search
+
+    Returns:
+        Dict with p50/p99/max latency in ms and mean completed depth
+    """
+    states = [create_midgame_env(turns=2 * i) for i in range(positions)]
+    results = {}
+
+    for label, budget in (("fixed", None), ("budget", budget_ms)):
+        search = AlphaBetaSearch(max_depth=depth, in_place=True, time_budget_ms=budget)
+        latencies = []
+        depths = []
+        for state in states:
+            if state.is_terminal()[0]:
+                continue
+            start = time.perf_counter()
+            _, meta = search.search(state.clone())
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            depths.append(meta["search_depth"])
+
+        results[f"{label}_p50_ms"] = _percentile(latencies, 0.50)
+        results[f"{label}_p99_ms"] = _percentile(latencies, 0.99)
+        results[f"{label}_max_ms"] = max(latencies)
+        results[f"{label}_mean_depth"] = sum(depths) / len(depths)
+
+    return results
+
+
+def bench_mcts_budget(budgets_ms=(50, 100, 200), moves: int = 10) -> Dict[str, float]:
+    """Measure anytime MCTS latency and throughput under a per-move budget.
+
+    Args:
+        budgets_ms: Per-move time budgets to measure
+        moves: Positions searched per budget
+
+    Returns:
+        Dict with p99 latency, mean iterations and the share of time spent
+        in each phase per budget
+    """
+    states = [create_midgame_env(turns=2 * i) for i in range(moves)]
+    results = {}
+
+    for budget in budgets_ms:
+        latencies = []
+        totals = dict.fromkeys(("iterations",) + MCTS.PHASES, 0.0)
+        for state in states:
+            if state.is_terminal()[0]:
+                continue
+            mcts = MCTS(max_sim_depth=5, time_budget_ms=budget, reuse_tree=False)
+            start = time.perf_counter()
+            result = mcts.search(state.clone())
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            if isinstance(result, tuple):
+                meta = result[1]
+                totals["iterations"] += meta["iterations"]
+                for phase in MCTS.PHASES:
+                    totals[phase] += meta[f"{phase}_time"]
+
+        busy = sum(totals[phase] for phase in MCTS.PHASES) or 1.0
+        results[f"{budget}ms_p99_ms"] = _percentile(latencies, 0.99)
+        results[f"{budget}ms_mean_iterations"] = totals["iterations"] / len(latencies)
+        for phase in MCTS.PHASES:
+            results[f"{budget}ms_{phase}_share"] = totals[phase] / busy
+
+    return results
+
+
+def bench_mcts_transpositions(
+    iterations: int = 2000, sizes=(0, 1 << 10, 1 << 16)
+) -> Dict[str, float]:
+    """Compare MCTS as a plain tree and as a DAG sharing transposed states.
+
+    Args:
+        iterations: MCTS iterations per search
+        sizes: Transposition table caps (0 = plain tree)
+
+    Returns:
+        Dict with node count, merged transpositions, iterations per second
+        and most-visited root child visits for each table size
+    """
+    env = create_midgame_env()
+    results = {}
+
+    for size in sizes:
+        mcts = MCTS(
+            iterations=iterations,
+            max_sim_depth=5,
+            reuse_tree=False,
+            transposition_size=size,
+        )
+        random.seed(ENVIRONMENT_SEED)
+        start = time.perf_counter()
+        root = mcts._grow_tree(env.clone())
+        elapsed = time.perf_counter() - start
+
+        label = f"tt{size}"
+        results[f"{label}_nodes"] = mcts._count_nodes(root)
+        results[f"{label}_transpositions"] = mcts._run_stats["transpositions"]
+        results[f"{label}_iterations_per_second"] = iterations / elapsed
+        results[f"{label}_best_child_visits"] = max(
+            child.visits for child in root.children
+        )
+
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, float]]] = {
+    "clone": bench_clone,
+    "memory": bench_memory,
+    "move_range": bench_move_range,
+    "distance_fields": bench_distance_fields,
+    "pursuit": bench_pursuit,
+    "astar": bench_astar,
+    "path_cache": bench_path_cache,
+    "incremental": bench_incremental,
+    "search": bench_search,
+    "alphabeta_tt": bench_alphabeta_tt,
+    "alphabeta_latency": bench_alphabeta_latency,
+    "alphabeta_ordering": bench_alphabeta_ordering,
+    "mcts_parallel": bench_mcts_parallel,
+    "mcts_reuse": bench_mcts_reuse,
+    "mcts_budget": bench_mcts_budget,
+    "mcts_tree": bench_mcts_tree,
+    "mcts_transpositions": bench_mcts_transpositions,
+    "mcts_root_policy": bench_mcts_root_policy,
+    "mcts_memory_cap": bench_mcts_memory_cap,
+    "enemy_model": bench_enemy_model,
+    "minimax_memo": bench_minimax_memo,
+    "rollouts": bench_rollouts,
+}
+
+
+# =============================================================================
+# MAIN ENTRY POINT
+# =============================================================================
+
+
+def main() -> None:
+    """Run the selected micro-benchmarks and print their results."""
+    Logger.set_benchmark_mode(True)
+
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+
+    print("\n" + "=" * 70)
+    print("TACTICAL AI MICRO-BENCHMARKS")
+    print(f"Map: {GRID_WIDTH}x{GRID_HEIGHT}, walls={NUM_WALLS}, traps={NUM_TRAPS}")
+    print("=" * 70)
+
+    for name in selected:
+        print(f"\n[{name}]")
+        for key, value in BENCHMARKS[name]().items():
+            print(f"  {key:<44} {value:>14,.2f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import sys
+
+sys.path.append("src")
+
+import time
+import unittest
+
+from algorithm.alphabeta.alphabeta import AlphaBetaSearch
+from environment.environment import TacticalEnvironment
+
+
+class TestIterativeDeepening(unittest.TestCase):
+
+    def test_budget_returns_move_within_time(self):
+        """
+        Test a tiny budget still returns a legal move from a completed depth
+        and stops well before a fixed-depth search would
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        search = AlphaBetaSearch(max_depth=12, in_place=True, time_budget_ms=30)
+
+        start = time.perf_counter()
+        action, meta = search.search(env)
+        elapsed = time.perf_counter() - start
+
+        self.assertIn(action, env.get_valid_actions())
+        self.assertGreaterEqual(meta["search_depth"], 1)
+        self.assertLess(meta["search_depth"], 12)
+        self.assertLess(elapsed, 1.0)
+
+    def test_unlimited_budget_matches_fixed_depth(self):
+        """
+        Test deepening to the cap gives the same value as a fixed-depth search
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+
+        _, fixed = AlphaBetaSearch(max_depth=3).search(env.clone())
+        _, deepened = AlphaBetaSearch(max_depth=3, time_budget_ms=1e9).search(
+            env.clone()
+        )
+
+        self.assertEqual(deepened["search_depth"], 3)
+        self.assertAlmostEqual(fixed["win_probability"], deepened["win_probability"])
+
+    def test_move_ordering_keeps_value_and_prunes_more(self):
+        """
+        Test move ordering leaves the search value unchanged while visiting
+        fewer nodes, and reports the first-move cutoff rate
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+
+        _, plain = AlphaBetaSearch(max_depth=4, move_ordering=False).search(
+            env.clone()
+        )
+        _, ordered = AlphaBetaSearch(max_depth=4).search(env.clone())
+
+        self.assertAlmostEqual(plain["win_probability"], ordered["win_probability"])
+        self.assertLessEqual(ordered["nodes_visited"], plain["nodes_visited"])
+        self.assertGreaterEqual(ordered["first_move_cutoff_rate"], 0.0)
+        self.assertLessEqual(ordered["first_move_cutoff_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
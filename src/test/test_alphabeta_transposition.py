@@ -0,0 +1,53 @@
+import sys
+
+sys.path.append("src")
+
+import unittest
+
+from algorithm.alphabeta.alphabeta import AlphaBetaSearch
+from algorithm.alphabeta.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    TranspositionTable,
+)
+from environment.environment import TacticalEnvironment
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_replacement_prefers_depth_then_age(self):
+        """
+        Test a shallower entry from the same search cannot evict a deeper
+        one, but any entry from a newer search can
+        """
+        tt = TranspositionTable(size=4)
+        tt.new_search()
+
+        tt.store(1, depth=3, value=0.5, bound=EXACT, best_move=(1, 1))
+        tt.store(5, depth=1, value=0.1, bound=EXACT, best_move=(2, 2))
+        self.assertEqual(tt.probe(1).best_move, (1, 1))
+        self.assertIsNone(tt.probe(5))
+
+        tt.new_search()
+        tt.store(5, depth=1, value=0.1, bound=LOWER_BOUND, best_move=(2, 2))
+        self.assertIsNone(tt.probe(1))
+        self.assertEqual(tt.probe(5).bound, LOWER_BOUND)
+        self.assertEqual(tt.hit_rate(), 0.5)
+
+    def test_search_value_unchanged_by_table(self):
+        """
+        Test the transposition table does not change the search result
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+
+        _, plain = AlphaBetaSearch(max_depth=3, tt_size=0).search(env.clone())
+        _, cached = AlphaBetaSearch(max_depth=3).search(env.clone())
+
+        self.assertAlmostEqual(plain["win_probability"], cached["win_probability"])
+        self.assertLessEqual(cached["nodes_visited"], plain["nodes_visited"])
+        self.assertIn("tt_hit_rate", cached)
+        self.assertNotIn("tt_hit_rate", plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from algorithm.astar.astar import AStar
+from environment.environment import TacticalEnvironment
+from environment.state import UNREACHABLE
+
+
+class TestAStar(unittest.TestCase):
+
+    def assertShortestPath(self, env, path, start, goal):
+        """Check path is a wall-free walk from start to goal of BFS length."""
+        distance = env.static_map.distance(start, goal)
+        if distance == UNREACHABLE:
+            self.assertIsNone(path)
+            return
+        self.assertEqual((path[0], path[-1]), (start, goal))
+        self.assertEqual(len(path), distance + 1)
+        for (x, y), (nx, ny) in zip(path, path[1:]):
+            self.assertEqual(abs(x - nx) + abs(y - ny), 1)
+            self.assertFalse(env.is_blocked(nx, ny))
+
+    def test_paths_are_shortest(self):
+        """
+        Test repeated searches on one AStar return shortest paths or None
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        a_star = AStar(env)
+        rng = random.Random(4)
+        tiles = [(x, y) for x in range(env.width) for y in range(env.height)]
+
+        for _ in range(200):
+            start = rng.choice([t for t in tiles if not env.is_blocked(*t)])
+            goal = rng.choice(tiles)
+            self.assertShortestPath(env, a_star.search(start, goal), start, goal)
+
+    def test_search_follows_map_changes(self):
+        """
+        Test the search arrays are rebuilt for a new map or map size
+        """
+        env = TacticalEnvironment(width=15, height=10, num_walls=30)
+        a_star = AStar(env)
+
+        for _ in range(3):
+            env.reset()
+            start, goal = tuple(env.player_pos), env.goal
+            self.assertShortestPath(env, a_star.search(start, goal), start, goal)
+
+        a_star.env = env = TacticalEnvironment(width=25, height=20, num_walls=60)
+        start, goal = tuple(env.player_pos), env.goal
+        self.assertShortestPath(env, a_star.search(start, goal), start, goal)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from agents.enemy import EnemyAgent
+from algorithm.alphabeta.alphabeta import AlphaBetaSearch
+from algorithm.astar.chase import ChaseModel
+from algorithm.minimax.minimax import MinimaxSearch
+from environment.environment import TacticalEnvironment
+
+
+class TestEnemyModel(unittest.TestCase):
+
+    def test_chase_model_matches_enemy_agent(self):
+        """
+        Test the model predicts exactly the move EnemyAgent plays
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        model = ChaseModel()
+        random.seed(1)
+        open_tiles = [
+            (x, y)
+            for x in range(env.width)
+            for y in range(env.height)
+            if not env.is_blocked(x, y)
+        ]
+
+        for _ in range(100):
+            state = env.clone()
+            state.player_pos, state.enemy_pos = map(list, random.sample(open_tiles, 2))
+            self.assertEqual(model.move(state), EnemyAgent(state).action())
+
+    def test_astar_model_searches_one_enemy_move(self):
+        """
+        Test the A* model shrinks the tree and is reported in the meta
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+
+        _, adversarial = AlphaBetaSearch(max_depth=4, tt_size=0).search(env.clone())
+        _, modelled = AlphaBetaSearch(
+            max_depth=4, tt_size=0, enemy_model="astar"
+        ).search(env.clone())
+
+        self.assertEqual(adversarial["enemy_model"], "adversarial")
+        self.assertEqual(modelled["enemy_model"], "astar")
+        self.assertLess(modelled["nodes_visited"], adversarial["nodes_visited"])
+        # The modelled enemy is one of the moves the adversary considers
+        self.assertGreaterEqual(
+            modelled["win_probability"], adversarial["win_probability"]
+        )
+
+    def test_falls_back_when_enemy_deviates(self):
+        """
+        Test a searcher turns adversarial once the enemy leaves the model
+        """
+        for search in (
+            AlphaBetaSearch(max_depth=2, enemy_model="astar"),
+            MinimaxSearch(max_depth=2, enemy_model="astar"),
+        ):
+            env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+            action, _ = search.search(env.clone())
+            env.step(action)
+
+            predicted = ChaseModel().move(env)
+            other = next(
+                move for move in env.get_valid_actions() if move != predicted
+            )
+            env.step(other)
+
+            _, meta = search.search(env.clone())
+            self.assertEqual(meta["enemy_model"], "adversarial")
+
+        with self.assertRaises(ValueError):
+            AlphaBetaSearch(enemy_model="oracle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import sys
+
+sys.path.append("src")
+
+import unittest
+from collections import deque
+
+from environment.environment import TacticalEnvironment
+from environment.state import UNREACHABLE
+
+
+def reference_move_range(env, pos, move_range):
+    """Plain BFS reachability, used as the oracle for the bitboard version."""
+    queue = deque([(tuple(pos), 0)])
+    visited = {tuple(pos)}
+    while queue:
+        (x, y), dist = queue.popleft()
+        if dist >= move_range:
+            continue
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < env.width and 0 <= ny < env.height):
+                continue
+            if (nx, ny) in visited or (nx, ny) in env.walls:
+                continue
+            visited.add((nx, ny))
+            queue.append(((nx, ny), dist + 1))
+    visited.discard(tuple(pos))
+    return visited
+
+
+class TestBitboard(unittest.TestCase):
+
+    def test_move_range_matches_bfs(self):
+        """
+        Test bitboard flood fill matches BFS from every open tile
+        """
+        for seed in (1, 2, 3):
+            env = TacticalEnvironment(
+                width=30, height=15, num_walls=125, num_traps=20, seed=seed
+            )
+            for x in range(env.width):
+                for y in range(env.height):
+                    if (x, y) in env.walls:
+                        continue
+                    for move_range in (2, 3):
+                        self.assertEqual(
+                            env.get_move_range([x, y], move_range),
+                            reference_move_range(env, [x, y], move_range),
+                        )
+
+    def test_distance_field_matches_bfs(self):
+        """
+        Test distance fields agree with BFS reachability and are symmetric
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        static_map = env.static_map
+        width = env.width
+
+        for source in [env.goal, tuple(env.player_pos), tuple(env.enemy_pos)]:
+            distances = static_map.distances_from(*source)
+            for steps in (1, 4, 9):
+                within = {
+                    (i % width, i // width)
+                    for i, d in enumerate(distances)
+                    if 0 < d <= steps
+                }
+                self.assertEqual(within, reference_move_range(env, source, steps))
+            for wall in env.walls:
+                self.assertEqual(static_map.distance(source, wall), UNREACHABLE)
+
+        player, enemy = tuple(env.player_pos), tuple(env.enemy_pos)
+        self.assertEqual(
+            static_map.distance(player, enemy), static_map.distance(enemy, player)
+        )
+        goal = static_map.distances_from(*env.goal)
+        self.assertEqual(static_map.goal_distances, goal)
+        self.assertEqual(static_map.goal_field.tolist(), list(goal))
+
+    def test_distance_cache_is_bounded(self):
+        """
+        Test the per-source distance cache keeps only the most recent fields
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        static_map = env.static_map
+        static_map.field_cache_size = 4
+        open_tiles = static_map.indices(static_map.open_mask)[:10]
+
+        player = static_map.distances_from(*env.player_pos)
+        for tile in open_tiles:
+            static_map.distances_from(tile % env.width, tile // env.width)
+            self.assertIs(static_map.distances_from(*env.player_pos), player)
+        self.assertEqual(len(static_map._distance_fields), 4)
+        self.assertIn(static_map.index(*env.player_pos), static_map._distance_fields)
+
+        field = static_map.distance_field(*env.player_pos)
+        self.assertFalse(field.flags.writeable)
+        self.assertEqual(field.tolist(), list(player))
+
+    def test_legal_mask_matches_valid_actions(self):
+        """
+        Test legal_mask encodes the same tiles as get_valid_actions
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+
+        for unit in ("player", "enemy"):
+            mask = env.legal_mask(unit)
+            self.assertEqual(
+                env.static_map.positions(mask), env.get_valid_actions(unit)
+            )
+
+    def test_move_table_shared_by_clones(self):
+        """
+        Test move-range lookups are cached on the map shared by clones
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+        clone = env.clone()
+
+        moves = env.get_valid_actions("player")
+
+        self.assertIs(clone.get_valid_actions("player"), moves)
+        self.assertEqual(
+            env.legal_mask("player"), env.static_map.flood_fill(0, 0, 3)
+        )
+
+    def test_is_blocked_out_of_bounds(self):
+        """
+        Test tiles outside the grid are never reported as walls or traps
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+
+        for x, y in [(-1, 0), (0, -1), (15, 0), (0, 10)]:
+            self.assertFalse(env.is_blocked(x, y))
+            self.assertFalse(env.is_trap(x, y))
+
+    def test_spawn_trap_avoids_occupied_tiles(self):
+        """
+        Test spawned traps never land on walls, units, goal or other traps
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+
+        for _ in range(20):
+            before = set(env.traps)
+            env.spawn_trap()
+            (new_trap,) = env.traps - before
+
+            self.assertNotIn(new_trap, env.walls)
+            self.assertNotEqual(new_trap, env.goal)
+            self.assertNotEqual(new_trap, tuple(env.player_pos))
+            self.assertNotEqual(new_trap, tuple(env.enemy_pos))
+            self.assertTrue(env.is_trap(*new_trap))
+
+    def test_external_trap_edit_is_seen(self):
+        """
+        Test traps added through the traps attribute affect is_terminal
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+        env.is_terminal()
+
+        env.traps.add(tuple(env.player_pos))
+
+        self.assertEqual(env.is_terminal(), (True, "trap"))
+
+
+if __name__ == "__main__":
+    unittest.main()
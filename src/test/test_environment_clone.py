@@ -2,7 +2,10 @@ import sys
 
 sys.path.append("src")
 
+import copy
 import unittest
+from unittest import mock
+
 from environment.environment import TacticalEnvironment
 
 
@@ -69,6 +72,81 @@ class TestClone(unittest.TestCase):
         self.assertEqual(clone.traps, original.traps)
         self.assertEqual(clone.turn, original.turn)
 
+    def test_clone_skips_map_generation(self):
+        """
+        Test clone does not regenerate a map it would throw away
+        """
+        original = TacticalEnvironment(width=15, height=10, seed=32)
+
+        with mock.patch("environment.environment.generate_environment") as gen:
+            clone = original.clone()
+
+        gen.assert_not_called()
+        self.assertEqual(clone.walls, original.walls)
+        self.assertEqual(clone.turn_counter, original.turn_counter)
+
+    def test_copy_module_uses_clone(self):
+        """
+        Test copy.copy returns an independent environment
+        """
+        original = TacticalEnvironment(width=15, height=10, seed=32)
+        clone = copy.copy(original)
+
+        clone.step(next(iter(clone.get_valid_actions())))
+
+        self.assertNotEqual(clone.turn, original.turn)
+        self.assertEqual(original.player_pos, [0, 0])
+
+    def test_clone_shares_static_map(self):
+        """
+        Test clones reference the same immutable static map
+        """
+        original = TacticalEnvironment(width=15, height=10, seed=32)
+        clone = original.clone()
+
+        self.assertIs(clone.static_map, original.static_map)
+        self.assertIsNot(clone.dynamic, original.dynamic)
+
+    def test_spawn_trap_copy_on_write(self):
+        """
+        Test spawning a trap in either copy leaves the other untouched
+        """
+        original = TacticalEnvironment(width=15, height=10, seed=32)
+        clone = original.clone()
+        before = set(original.dynamic.traps)
+
+        clone.spawn_trap()
+        self.assertEqual(original.dynamic.traps, before)
+        self.assertEqual(len(clone.dynamic.traps), len(before) + 1)
+
+        clone_traps = set(clone.dynamic.traps)
+        original.spawn_trap()
+        self.assertEqual(len(original.dynamic.traps), len(before) + 1)
+        self.assertEqual(clone.dynamic.traps, clone_traps)
+
+    def test_reading_traps_keeps_sharing_and_hash(self):
+        """
+        Test reading traps neither copies the shared set nor drops the
+        cached bitboard and hash, while editing them still does
+        """
+        original = TacticalEnvironment(width=15, height=10, seed=32)
+        key = original.zobrist_key
+        clone = original.clone()
+
+        traps = list(clone.traps)
+        self.assertEqual(set(traps), set(original.traps))
+        self.assertIn(traps[0], clone.traps)
+        self.assertEqual(len(clone.traps), len(traps))
+        self.assertIs(clone.dynamic.traps, original.dynamic.traps)
+        self.assertIsNotNone(clone.dynamic.trap_mask)
+        self.assertEqual(clone.dynamic.hash_key, key)
+
+        clone.traps.discard(traps[0])
+        self.assertIsNot(clone.dynamic.traps, original.dynamic.traps)
+        self.assertIn(traps[0], original.traps)
+        self.assertIsNone(clone.dynamic.hash_key)
+        self.assertNotEqual(clone.zobrist_key, key)
+
 
 if __name__ == "__main__":
     unittest.main()
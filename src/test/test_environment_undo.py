@@ -0,0 +1,91 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from algorithm.alphabeta.alphabeta import AlphaBetaSearch
+from algorithm.minimax.minimax import MinimaxSearch
+from environment.environment import TacticalEnvironment
+
+
+def snapshot(env):
+    return (
+        tuple(env.player_pos),
+        tuple(env.enemy_pos),
+        env.turn,
+        env.turn_counter,
+        frozenset(env.dynamic.traps),
+        env._trap_mask(),
+    )
+
+
+class TestApplyUndo(unittest.TestCase):
+
+    def test_undo_restores_state(self):
+        """
+        Test undoing a sequence of applied turns restores every field,
+        including traps spawned on the 3-turn schedule
+        """
+        rng = random.Random(7)
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        start = snapshot(env)
+
+        records = []
+        history = [start]
+        for _ in range(12):
+            actions = sorted(env.get_valid_actions())
+            record = env.apply(rng.choice(actions))
+            records.append(record)
+            history.append(snapshot(env))
+            if record.result[0]:
+                break
+
+        self.assertTrue(any(r.spawned_trap for r in records))
+
+        for record in reversed(records):
+            history.pop()
+            env.undo(record)
+            self.assertEqual(snapshot(env), history[-1])
+
+        self.assertEqual(snapshot(env), start)
+
+    def test_apply_matches_step(self):
+        """
+        Test apply() and step() produce the same transitions
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        clone = env.clone()
+
+        for _ in range(9):
+            action = min(env.get_valid_actions())
+            random.seed(11)
+            result = env.step(action)
+            random.seed(11)
+            record = clone.apply(action)
+
+            self.assertEqual(result, record.result)
+            self.assertEqual(snapshot(env), snapshot(clone))
+            if result[0]:
+                break
+
+    def test_in_place_search_matches_clone_search(self):
+        """
+        Test in-place AlphaBeta and Minimax agree with the cloning versions
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        start = snapshot(env)
+
+        for search_cls, depth in ((AlphaBetaSearch, 3), (MinimaxSearch, 2)):
+            random.seed(5)
+            expected = search_cls(max_depth=depth).search(env.clone())
+            random.seed(5)
+            actual = search_cls(max_depth=depth, in_place=True).search(env)
+
+            self.assertEqual(actual, expected)
+            self.assertEqual(snapshot(env), start)
+
+
+if __name__ == "__main__":
+    unittest.main()
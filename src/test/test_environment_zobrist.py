@@ -0,0 +1,70 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from environment.environment import TacticalEnvironment
+
+
+def full_hash(env):
+    """Recompute the Zobrist hash from scratch."""
+    env.dynamic.hash_key = None
+    return env.zobrist_key
+
+
+class TestZobrist(unittest.TestCase):
+
+    def test_incremental_hash_matches_full_recompute(self):
+        """
+        Test the hash maintained by step() equals a from-scratch hash,
+        including turns that spawn traps
+        """
+        rng = random.Random(3)
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=4)
+        env.zobrist_key
+
+        for _ in range(14):
+            env.step(rng.choice(sorted(env.get_valid_actions())))
+            incremental = env.zobrist_key
+            self.assertEqual(incremental, full_hash(env.clone()))
+            if env.is_terminal()[0]:
+                break
+
+    def test_clone_and_undo_keep_hash(self):
+        """
+        Test clones inherit the hash and undo() restores it
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+        key = env.zobrist_key
+
+        clone = env.clone()
+        self.assertEqual(clone.dynamic.hash_key, key)
+
+        record = clone.apply(min(clone.get_valid_actions()))
+        self.assertNotEqual(clone.zobrist_key, key)
+        clone.undo(record)
+        self.assertEqual(clone.zobrist_key, key)
+
+    def test_transpositions_hash_equal(self):
+        """
+        Test the same position reached by different moves hashes equally
+        """
+        env = TacticalEnvironment(width=15, height=10, seed=32)
+        env.zobrist_key
+        target = next(iter(env.get_valid_actions()))
+
+        direct = env.clone()
+        direct.apply(target)
+
+        detour = env.clone()
+        detour.player_pos = [target[0], target[1]]
+        detour.turn = "enemy"
+
+        self.assertEqual(direct.zobrist_key, detour.zobrist_key)
+        self.assertNotEqual(direct.zobrist_key, env.zobrist_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from agents.enemy import EnemyAgent
+from algorithm.astar.incremental import IncrementalPlanner
+from environment.environment import TacticalEnvironment
+from environment.state import UNREACHABLE
+
+
+class TestIncrementalPlanner(unittest.TestCase):
+
+    def chase(self, env, planner, turns, seed):
+        """Replan a chase against a random-walking player; yield each plan."""
+        static_map = env.static_map
+        rng = random.Random(seed)
+        enemy, player = tuple(env.enemy_pos), tuple(env.player_pos)
+        for _ in range(turns):
+            moves = sorted(static_map.move_set(player[0], player[1], 3))
+            if moves:
+                player = rng.choice(moves)
+            start = enemy
+            enemy, path = planner.chase_move(static_map, enemy, player)
+            yield start, player, path
+            if enemy == player:
+                enemy, player = tuple(env.enemy_pos), tuple(env.player_pos)
+
+    def test_replans_are_shortest_paths(self):
+        """
+        Test every reused or fresh plan is a shortest path, or None
+        """
+        for seed, num_walls in [(3, 125), (4, 40), (5, 0)]:
+            env = TacticalEnvironment(width=30, height=15, num_walls=num_walls, seed=seed)
+            planner = IncrementalPlanner(move_range=2)
+
+            for start, goal, path in self.chase(env, planner, 150, seed):
+                distance = env.static_map.distance(start, goal)
+                if distance == UNREACHABLE:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual((path[0], path[-1]), (start, goal))
+                self.assertEqual(len(path), distance + 1)
+                for (x, y), (nx, ny) in zip(path, path[1:]):
+                    self.assertEqual(abs(x - nx) + abs(y - ny), 1)
+                    self.assertFalse(env.is_blocked(nx, ny))
+
+            self.assertGreater(planner.reused, 0)
+
+    def test_reuse_expands_fewer_tiles(self):
+        """
+        Test the reused tree expands fewer tiles than searching from scratch
+        and is dropped for a new map
+        """
+        env = TacticalEnvironment(width=60, height=40, num_walls=700, seed=2)
+        planner = IncrementalPlanner(move_range=2)
+        fresh = IncrementalPlanner(move_range=2, reuse=False)
+
+        for start, goal, path in self.chase(env, planner, 60, 1):
+            fresh_path = fresh.plan(env.static_map, start, goal)
+            self.assertEqual(len(path or ()), len(fresh_path or ()))
+        self.assertEqual(fresh.reused, 0)
+        self.assertGreater(planner.reused, 30)
+        self.assertLess(planner.total_expanded * 2, fresh.total_expanded)
+
+        reused = planner.reused
+        env.reset()
+        planner.plan(env.static_map, tuple(env.enemy_pos), tuple(env.player_pos))
+        self.assertEqual(planner.reused, reused)
+
+    def test_enemy_agent_incremental_planner(self):
+        """
+        Test EnemyAgent's incremental planner ends every turn as close to the
+        player as the Pursuit move, and on the same tile when that is forced
+        """
+        with self.assertRaises(ValueError):
+            EnemyAgent(TacticalEnvironment(width=15, height=10, num_walls=30), "dstar")
+
+        for seed in (3, 4, 5):
+            env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=seed)
+            enemy = EnemyAgent(env, planner="incremental")
+            reference = EnemyAgent(env)
+            rng = random.Random(seed)
+
+            for _ in range(80):
+                if env.turn == "player":
+                    action = rng.choice(sorted(env.get_valid_actions()))
+                else:
+                    lookups = reference.pursuit.lookups
+                    expected = reference.action()
+                    action = enemy.action()
+                    player = tuple(env.player_pos)
+                    self.assertEqual(
+                        env.static_map.distance(action, player),
+                        env.static_map.distance(expected, player),
+                    )
+                    if reference.pursuit.lookups > lookups:
+                        self.assertEqual(action, expected)
+                if env.step(action)[0]:
+                    break
+
+            self.assertGreater(enemy.pursuit.reused, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
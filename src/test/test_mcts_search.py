@@ -0,0 +1,471 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import time
+import unittest
+from multiprocessing.pool import Pool
+
+import numpy as np
+
+from agents.player import PlayerAgent
+
+from algorithm.mcts.arraytree import ArrayTree
+from algorithm.mcts.mcts import MCTS
+from algorithm.mcts.mctsnode import (
+    PROVEN_LOSS,
+    PROVEN_WIN,
+    UNPROVEN,
+    MCTSNode,
+    solve_from_children,
+)
+from algorithm.mcts.rollout import BatchRollout
+from environment.environment import TacticalEnvironment
+import main
+
+
+def _parallel_mcts_in_worker(_):
+    """Try to set up root-parallel MCTS inside a (daemon) pool worker."""
+    try:
+        MCTS(workers=2)
+    except RuntimeError as error:
+        return str(error)
+    return None
+
+
+class TestMCTSSearch(unittest.TestCase):
+
+    def test_parallel_search_merges_worker_trees(self):
+        """
+        Test root-parallel MCTS returns a legal move and counts the nodes of
+        every worker tree
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=60, max_sim_depth=5, workers=2)
+        try:
+            random.seed(1)
+            result = mcts.search(env.clone())
+        finally:
+            mcts.close()
+
+        action, meta = result
+        self.assertIn(action, env.get_valid_actions())
+        # Each tree holds at least its root plus one node per iteration
+        # until the root runs out of untried actions
+        self.assertGreater(meta["nodes_visited"], 60)
+        self.assertGreaterEqual(meta["win_probability"], 0.0)
+        self.assertLessEqual(meta["win_probability"], 1.0)
+
+    def test_parallel_search_pool_ownership(self):
+        """
+        Test a caller's pool is used but left open, an agent shuts down the
+        pool its search started, and daemon workers refuse to fan out
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        with Pool(processes=2) as pool:
+            mcts = MCTS(iterations=20, max_sim_depth=5, workers=2, pool=pool)
+            action, _ = mcts.search(env.clone())
+            mcts.close()
+            self.assertIn(action, env.get_valid_actions())
+            self.assertEqual(pool.map(abs, [-1]), [1])
+
+            message = pool.map(_parallel_mcts_in_worker, [0])[0]
+            self.assertIn("daemon", message)
+
+        with PlayerAgent(
+            env,
+            algorithm="MCTS",
+            benchmark_mode=True,
+            mcts_iterations=20,
+            mcts_workers=2,
+        ) as agent:
+            self.assertIn(agent.action(), env.get_valid_actions())
+            self.assertIsNotNone(agent.mcts_search._pool)
+        self.assertIsNone(agent.mcts_search._pool)
+
+    def test_root_statistics_sum_to_root_visits(self):
+        """
+        Test the per-action statistics a worker reports cover every visit
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        random.seed(2)
+        root = MCTS(iterations=40, max_sim_depth=5)._grow_tree(env.clone())
+
+        stats = MCTS._root_statistics(root)
+
+        self.assertEqual(sum(visits for visits, _, _ in stats.values()), root.visits)
+        self.assertEqual(MCTS._count_nodes(root), 41)
+
+    def test_tree_reuse_reroots_on_grandchild(self):
+        """
+        Test a search from a state already in the kept tree continues from
+        that node's statistics
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=150, max_sim_depth=5)
+        random.seed(4)
+        mcts.search(env.clone())
+
+        child = max(mcts._root.children, key=lambda c: c.visits)
+        grandchild = max(child.children, key=lambda c: c.visits)
+        inherited = grandchild.visits
+        self.assertGreater(inherited, 0)
+
+        _, meta = mcts.search(grandchild.state.clone())
+
+        self.assertEqual(meta["reused_visits"], inherited)
+        self.assertIs(mcts._root, grandchild)
+        self.assertIsNone(grandchild.parent)
+        self.assertEqual(grandchild.visits, inherited + 150)
+
+    def test_tree_reuse_ignores_unrelated_state(self):
+        """
+        Test a state from a different map starts a fresh tree
+        """
+        mcts = MCTS(iterations=30, max_sim_depth=5)
+        random.seed(4)
+        mcts.search(TacticalEnvironment(width=30, height=15, num_walls=125, seed=3))
+
+        other = TacticalEnvironment(width=30, height=15, num_walls=125, seed=5)
+        _, meta = mcts.search(other)
+
+        self.assertEqual(meta["reused_visits"], 0)
+        self.assertEqual(mcts._root.visits, 30)
+
+    def test_time_budget_reports_iterations_and_phases(self):
+        """
+        Test a time-budgeted search stops near its deadline and reports the
+        iterations run and the time spent per phase
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=1, max_sim_depth=5, time_budget_ms=50)
+        random.seed(6)
+
+        start = time.perf_counter()
+        _, meta = mcts.search(env.clone())
+        elapsed = time.perf_counter() - start
+
+        self.assertGreater(meta["iterations"], 1)
+        self.assertLess(elapsed, 0.5)
+        self.assertGreater(meta["iterations_per_second"], 0.0)
+        phases = sum(
+            meta[f"{phase}_time"]
+            for phase in ("selection", "expansion", "simulation", "backprop")
+        )
+        self.assertLessEqual(phases, elapsed)
+
+    def test_array_tree_search(self):
+        """
+        Test the array-backed tree keeps consistent statistics and returns a
+        legal move
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=120, max_sim_depth=5, tree_store="array")
+        random.seed(8)
+
+        tree = mcts._grow_tree(env.clone())
+
+        self.assertIsInstance(tree, ArrayTree)
+        self.assertEqual(int(tree.visits[0]), 120)
+        stats = tree.root_statistics()
+        self.assertEqual(sum(visits for visits, _, _ in stats.values()), 120)
+        self.assertTrue(set(stats) <= env.get_valid_actions())
+        # One expansion per iteration plus the root
+        self.assertEqual(tree.node_count(), 121)
+
+        random.seed(8)
+        action, meta = mcts.search(env.clone())
+        self.assertIn(action, env.get_valid_actions())
+        self.assertEqual(meta["nodes_visited"], 121)
+
+    def test_array_tree_state_round_trip(self):
+        """
+        Test a node's compact state record rebuilds the environment it
+        was expanded from
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        tree = ArrayTree(env.clone(), capacity=1)
+
+        leaf = tree.expand(tree.select())
+        rebuilt = tree.state(leaf)
+
+        expected = env.clone()
+        expected.step(tuple(rebuilt.player_pos))
+        for field in ("player_pos", "enemy_pos", "turn", "turn_counter", "traps"):
+            self.assertEqual(getattr(rebuilt, field), getattr(expected, field))
+        self.assertEqual(rebuilt.zobrist_key, expected.zobrist_key)
+        self.assertGreater(tree.capacity, 1)
+
+    def test_batch_rollouts_match_scalar_rollouts(self):
+        """
+        Test lockstep NumPy rollouts give the same mean reward as the scalar
+        rollout policy
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(max_sim_depth=20)
+        random.seed(9)
+
+        scalar = [mcts._rollout(env.clone()) for _ in range(2000)]
+        batch = BatchRollout(env.static_map).run(env, 2000, 20)
+
+        self.assertEqual(len(batch), 2000)
+        self.assertTrue(((batch >= 0.0) & (batch <= 1.0)).all())
+        self.assertAlmostEqual(batch.mean(), sum(scalar) / len(scalar), delta=0.02)
+
+    def test_batch_rollout_field_rows_are_bounded(self):
+        """
+        Test the rollout engine keeps at most max_rows copied distance fields
+        however many player tiles it sees, and still reads exact distances
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        static_map = env.static_map
+        engine = BatchRollout(static_map)
+        engine.max_rows = 8
+        open_tiles = np.array(static_map.indices(static_map.open_mask))
+        probes = open_tiles[:5]
+
+        def expected(targets, tiles):
+            width = env.width
+            return [
+                static_map.distance((t % width, t // width), (p % width, p // width))
+                for t, p in zip(targets.tolist(), tiles.tolist())
+            ]
+
+        for target in open_tiles:
+            targets = np.full(len(probes), target)
+            distances = engine._distances_to(targets, probes)
+            self.assertEqual(distances.tolist(), expected(targets, probes))
+            self.assertLessEqual(engine.field_count, 8)
+
+        # More distinct targets than rows are read from the map directly
+        targets = open_tiles[:20]
+        tiles = open_tiles[-20:]
+        self.assertEqual(
+            engine._distances_to(targets, tiles).tolist(), expected(targets, tiles)
+        )
+        self.assertLessEqual(engine.field_count, 8)
+
+    def test_search_with_batched_leaf_rollouts(self):
+        """
+        Test MCTS evaluates leaves with several rollouts per simulation
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=40, max_sim_depth=5, rollouts_per_leaf=16)
+        random.seed(10)
+
+        action, meta = mcts.search(env.clone())
+
+        self.assertIn(action, env.get_valid_actions())
+        self.assertEqual(meta["iterations"], 40)
+        self.assertGreater(mcts._rollout_engine.simulated_plies, 40 * 16)
+
+    def test_solver_plays_proven_win(self):
+        """
+        Test a goal within reach is played without growing a tree
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        env.player_pos = [env.goal[0] - 1, env.goal[1]]
+        if env.is_blocked(*env.player_pos):
+            env.player_pos = [env.goal[0], env.goal[1] - 1]
+
+        action, meta = MCTS(iterations=50, max_sim_depth=5).search(env.clone())
+
+        self.assertEqual(action, env.goal)
+        self.assertEqual(meta["solver_result"], "win")
+        self.assertEqual(meta["win_probability"], 1.0)
+
+    def test_solver_never_selects_proven_losses(self):
+        """
+        Test moves the enemy can capture are proven lost on creation and are
+        neither revisited nor played
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        px, py = env.player_pos
+        env.enemy_pos = [px + 4, py] if not env.is_blocked(px + 4, py) else [px, py + 4]
+        mcts = MCTS(iterations=200, max_sim_depth=5)
+        random.seed(12)
+
+        action, meta = mcts.search(env.clone())
+        root = mcts._root
+
+        lost = [child for child in root.children if child.proven == PROVEN_LOSS]
+        self.assertTrue(lost)
+        for child in lost:
+            self.assertEqual(child.visits, 1)
+            self.assertNotEqual(child.action, action)
+        self.assertIsNone(meta["solver_result"])
+
+    def test_solve_from_children(self):
+        """
+        Test proofs combine by who is to move
+        """
+        self.assertEqual(
+            solve_from_children("player", [UNPROVEN, PROVEN_WIN], False), PROVEN_WIN
+        )
+        self.assertEqual(
+            solve_from_children("player", [PROVEN_LOSS, PROVEN_LOSS], False), UNPROVEN
+        )
+        self.assertEqual(
+            solve_from_children("player", [PROVEN_LOSS, PROVEN_LOSS], True),
+            PROVEN_LOSS,
+        )
+        self.assertEqual(
+            solve_from_children("enemy", [UNPROVEN, PROVEN_LOSS], False), PROVEN_LOSS
+        )
+        self.assertEqual(
+            solve_from_children("enemy", [PROVEN_WIN, UNPROVEN], True), UNPROVEN
+        )
+
+    def test_proofs_stop_at_trap_spawns(self):
+        """
+        Test proofs of children behind a random trap spawn do not prove
+        their parent, while deterministic enemy moves still do
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        env.step(sorted(env.get_valid_actions())[0])
+
+        for turn_counter, expected in [(2, UNPROVEN), (1, PROVEN_LOSS)]:
+            state = env.clone()
+            state.turn_counter = turn_counter
+            node = MCTSNode(state)
+            self.assertEqual(node.proven, UNPROVEN)
+            for action in list(node.untried_actions):
+                child_state = state.clone()
+                child_state.step(action, simulate=True)
+                child = MCTSNode(child_state, parent=node, action=action)
+                child.proven = PROVEN_LOSS
+                node.add_child(child)
+
+            node.update_proof()
+            self.assertEqual(node.proven, expected)
+
+    def test_transpositions_share_one_node(self):
+        """
+        Test states reached by different move orders share a node
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=500, max_sim_depth=5)
+        random.seed(6)
+
+        _, meta = mcts.search(env.clone())
+        root = mcts._root
+
+        self.assertGreater(meta["transpositions"], 0)
+        self.assertEqual(meta["nodes_visited"], 501 - meta["transpositions"])
+        stats = MCTS._root_statistics(root)
+        self.assertEqual(sum(visits for visits, _, _ in stats.values()), root.visits)
+
+        nodes, stack = {id(root): root}, [root]
+        while stack:
+            for child in stack.pop().children:
+                if id(child) not in nodes:
+                    nodes[id(child)] = child
+                    stack.append(child)
+        keys = {node.state.zobrist_key for node in nodes.values()}
+        self.assertEqual(len(keys), len(nodes))
+
+    def test_transposition_table_is_capped(self):
+        """
+        Test the table evicts entries beyond its size and a size of 0 grows
+        a plain tree
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+
+        capped = MCTS(iterations=300, max_sim_depth=5, transposition_size=32)
+        random.seed(6)
+        capped.search(env.clone())
+        self.assertEqual(len(capped._transpositions), 32)
+
+        plain = MCTS(iterations=300, max_sim_depth=5, transposition_size=0)
+        random.seed(6)
+        _, meta = plain.search(env.clone())
+        self.assertEqual(meta["transpositions"], 0)
+        self.assertEqual(meta["nodes_visited"], 301)
+
+    def test_sequential_halving_root_policy(self):
+        """
+        Test Sequential Halving spends the whole budget, plays its surviving
+        move and works with both tree stores
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        with self.assertRaises(ValueError):
+            MCTS(root_policy="thompson")
+
+        for store in MCTS.TREE_STORES:
+            mcts = MCTS(
+                iterations=200, max_sim_depth=5, tree_store=store, root_policy="halving"
+            )
+            random.seed(8)
+            root = mcts._grow_tree(env.clone())
+            stats = MCTS._root_statistics(root)
+            action, _ = MCTS._choose_root_action(stats, list(stats))
+
+            visits = sorted((entry[0] for entry in stats.values()), reverse=True)
+            self.assertEqual(sum(visits), 200)
+            # Later rounds give the survivors more descents than early ones
+            self.assertGreater(visits[0], 4 * visits[-1])
+            self.assertEqual(stats[action][0], visits[0])
+
+    def test_node_budget_prunes_and_recycles(self):
+        """
+        Test a capped tree stays within its node budget, keeps every root
+        child and recycles pruned nodes
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        mcts = MCTS(iterations=1500, max_sim_depth=5, max_nodes=200)
+        random.seed(9)
+
+        _, meta = mcts.search(env.clone())
+        root = mcts._root
+
+        self.assertGreater(meta["pruned_nodes"], 0)
+        self.assertLessEqual(meta["nodes_visited"], 200)
+        self.assertEqual(meta["nodes_visited"], mcts._node_count)
+        self.assertEqual(meta["tree_bytes"], meta["nodes_visited"] * MCTS.NODE_BYTES)
+        # Root children are never cut, so the root stays fully expanded
+        self.assertFalse(root.untried_actions)
+        self.assertEqual(root.visits, 1500)
+
+        recycled = mcts._free_nodes[-1]
+        self.assertIsNone(recycled.state)
+        child = mcts._new_node(env.clone())
+        self.assertIs(child, recycled)
+        self.assertEqual(child.visits, 0)
+
+
+    def test_game_worker_reuses_tree_across_turns(self):
+        """
+        Test the game's pool worker keeps the map and player agent between
+        jobs, so the next player turn reroots onto the kept MCTS tree
+        """
+        env = TacticalEnvironment(width=15, height=10, num_walls=20, seed=3)
+        action, meta = main.run_agent_action_worker(
+            ("player", "MCTS", main.make_env_snapshot(env))
+        )
+        self.assertEqual(meta["reused_visits"], 0)
+        static_map = main._WORKER_MAP
+        agent = main._WORKER_PLAYERS["MCTS"]
+
+        env.step(action)
+        action, _ = main.run_agent_action_worker(
+            ("enemy", "", main.make_env_snapshot(env))
+        )
+        env.step(action)
+        _, meta = main.run_agent_action_worker(
+            ("player", "MCTS", main.make_env_snapshot(env))
+        )
+        self.assertGreater(meta["reused_visits"], 0)
+        self.assertIs(main._WORKER_MAP, static_map)
+        self.assertIs(main._WORKER_PLAYERS["MCTS"], agent)
+
+        other = TacticalEnvironment(width=15, height=10, num_walls=20, seed=4)
+        _, meta = main.run_agent_action_worker(
+            ("player", "MCTS", main.make_env_snapshot(other))
+        )
+        self.assertEqual(meta["reused_visits"], 0)
+        self.assertIsNot(main._WORKER_MAP, static_map)
+        self.assertIsNot(main._WORKER_PLAYERS["MCTS"], agent)
+
+if __name__ == "__main__":
+    unittest.main()
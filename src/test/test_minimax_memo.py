@@ -0,0 +1,48 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from algorithm.minimax.minimax import MinimaxSearch
+from environment.environment import TacticalEnvironment
+
+
+class TestMinimaxMemo(unittest.TestCase):
+
+    def _search(self, **options):
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        random.seed(5)
+        return MinimaxSearch(max_depth=4, in_place=True, **options).search(env)
+
+    def test_memo_and_pruning_keep_the_score(self):
+        """
+        Test memoization and alpha-beta return the exhaustive minimax score
+        while visiting fewer nodes
+        """
+        _, plain = self._search(memo_size=0)
+        _, memo = self._search()
+        _, pruned = self._search(alpha_beta=True)
+
+        for meta in (memo, pruned):
+            self.assertAlmostEqual(meta["minimax_score"], plain["minimax_score"])
+            self.assertLess(meta["nodes_visited"], plain["nodes_visited"])
+        self.assertGreater(memo["memo_hit_rate"], 0.0)
+        self.assertEqual(plain["memo_probes"], 0)
+
+    def test_memo_is_lru_bounded(self):
+        """
+        Test the memo never holds more than memo_size positions
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        search = MinimaxSearch(max_depth=4, in_place=True, memo_size=50)
+
+        _, meta = search.search(env)
+
+        self.assertEqual(len(search._memo), 50)
+        self.assertGreater(meta["memo_probes"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
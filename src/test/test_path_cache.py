@@ -0,0 +1,66 @@
+import sys
+
+sys.path.append("src")
+
+import unittest
+
+from agents.enemy import EnemyAgent
+from agents.player import PlayerAgent
+from algorithm.astar.astar import AStar
+from algorithm.astar.pathcache import PathCache
+from environment.environment import TacticalEnvironment
+
+
+class TestPathCache(unittest.TestCase):
+
+    def test_hits_until_positions_or_map_change(self):
+        """
+        Test cached paths are reused only for the same endpoints and map
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        cache = PathCache()
+        start, goal = tuple(env.player_pos), env.goal
+
+        path = cache.path(env, start, goal)
+        self.assertEqual(path, AStar(env).search(start, goal))
+        path.clear()
+        self.assertEqual(cache.path(env, start, goal), AStar(env).search(start, goal))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        env.step(next(iter(env.get_valid_actions())))
+        cache.path(env, env.player_pos, goal)
+        env.reset()
+        cache.path(env, start, env.goal)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+        # No environment is held between lookups, and clear() drops the map
+        self.assertIsNone(cache._a_star.env)
+        cache.clear()
+        self.assertIsNone(cache._a_star)
+        self.assertEqual(
+            cache.path(env, start, env.goal), AStar(env).search(start, env.goal)
+        )
+
+    def test_shared_by_agents_and_bounded(self):
+        """
+        Test both agents' previews go through one LRU-bounded cache
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        enemy = EnemyAgent(env)
+        player = PlayerAgent(env, algorithm="ALPHABETA", benchmark_mode=True)
+        self.assertIs(enemy.path_cache, player.path_cache)
+
+        cache = enemy.path_cache = player.path_cache = PathCache(max_size=2)
+        for _ in range(30):
+            enemy.peek_path()
+            player.peek_path_to_goal()
+        self.assertEqual((cache.hits, cache.misses), (58, 2))
+
+        cache.path(env, env.goal, env.player_pos)
+        player.peek_path_to_goal()
+        enemy.peek_path()
+        self.assertEqual(cache.misses, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
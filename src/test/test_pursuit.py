@@ -0,0 +1,81 @@
+import sys
+
+sys.path.append("src")
+
+import random
+import unittest
+
+from agents.enemy import EnemyAgent
+from algorithm.astar.astar import AStar
+from algorithm.astar.pursuit import Pursuit
+from environment.environment import TacticalEnvironment
+
+
+class TestPursuit(unittest.TestCase):
+
+    def test_matches_astar_chase(self):
+        """
+        Test the field-based move equals the A* move, ties included
+        """
+        rng = random.Random(7)
+        for seed, num_walls in [(3, 125), (4, 40), (5, 0)]:
+            env = TacticalEnvironment(width=30, height=15, num_walls=num_walls, seed=seed)
+            open_tiles = [
+                (x, y)
+                for x in range(env.width)
+                for y in range(env.height)
+                if not env.is_blocked(x, y)
+            ]
+            pursuit = Pursuit(move_range=2)
+
+            for _ in range(300):
+                start, goal = rng.sample(open_tiles, 2)
+                expected, astar_path = AStar(env).chase_move(start, goal, 2)
+                replays = pursuit.replays
+
+                move, path = pursuit.chase_move(env.static_map, start, goal)
+
+                self.assertEqual(move, expected)
+                if astar_path is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual(len(path), len(astar_path))
+                self.assertEqual((path[0], path[-1]), (start, goal))
+                step = min(2, len(path) - 1)
+                self.assertEqual(path[step], astar_path[step])
+                if pursuit.replays > replays:
+                    self.assertEqual(path, astar_path)
+
+            self.assertGreater(pursuit.lookups, 0)
+            self.assertGreater(pursuit.replays, 0)
+
+    def test_enemy_agent_plays_astar_moves(self):
+        """
+        Test EnemyAgent still plays the A* move along a whole episode, and
+        its stored path and the HUD preview both pass through that move
+        """
+        env = TacticalEnvironment(width=30, height=15, num_walls=125, seed=3)
+        enemy = EnemyAgent(env)
+        random.seed(2)
+
+        for _ in range(40):
+            if env.turn == "player":
+                action = random.choice(list(env.get_valid_actions()))
+            else:
+                action = enemy.action()
+                expected, _ = AStar(env).chase_move(
+                    tuple(env.enemy_pos), tuple(env.player_pos), enemy.move_range
+                )
+                self.assertEqual(action, expected)
+                preview = enemy.peek_path()
+                self.assertEqual(len(enemy.last_path), len(preview))
+                if preview:
+                    step = min(enemy.move_range, len(preview) - 1)
+                    self.assertEqual(enemy.last_path[step], action)
+                    self.assertEqual(preview[step], action)
+            if env.step(action)[0]:
+                break
+
+
+if __name__ == "__main__":
+    unittest.main()